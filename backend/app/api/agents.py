@@ -3,8 +3,11 @@ from sqlalchemy.orm import Session
 from typing import Optional
 import json
 
+import openai
+
 from ..core.database import get_db
 from ..core.config import settings
+from ..core.http_client import OpenAIBusy, get_openai_client, openai_slot
 from ..models.agent import Agent
 from ..models.user import User
 from ..schemas.agent import (
@@ -231,8 +234,7 @@ async def ai_edit_prompt(
         )
 
     try:
-        import openai
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
 
         system_message = """You are an expert AI prompt engineer specializing in voice agent prompts for sales and customer service.
 Your task is to improve the given prompt to make it more effective, natural, and professional.
@@ -259,28 +261,30 @@ Current Prompt:
 
 Please provide the improved version:"""
 
-        response = client.chat.completions.create(
-            model="gpt-4-turbo",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message},
-            ],
-            temperature=0.7,
-            max_tokens=4096,
-        )
+        async with openai_slot():
+            response = await client.chat.completions.create(
+                model="gpt-4-turbo",
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": user_message},
+                ],
+                temperature=0.7,
+                max_tokens=4096,
+            )
 
         improved_prompt = response.choices[0].message.content.strip()
 
         # Generate a summary of changes
-        summary_response = client.chat.completions.create(
-            model="gpt-4-turbo",
-            messages=[
-                {"role": "system", "content": "Summarize the key changes made between the original and improved prompt in 2-3 bullet points. Be concise."},
-                {"role": "user", "content": f"Original:\n{data.prompt}\n\nImproved:\n{improved_prompt}"},
-            ],
-            temperature=0.3,
-            max_tokens=300,
-        )
+        async with openai_slot():
+            summary_response = await client.chat.completions.create(
+                model="gpt-4-turbo",
+                messages=[
+                    {"role": "system", "content": "Summarize the key changes made between the original and improved prompt in 2-3 bullet points. Be concise."},
+                    {"role": "user", "content": f"Original:\n{data.prompt}\n\nImproved:\n{improved_prompt}"},
+                ],
+                temperature=0.3,
+                max_tokens=300,
+            )
 
         changes_summary = summary_response.choices[0].message.content.strip()
 
@@ -294,6 +298,10 @@ Please provide the improved version:"""
         raise HTTPException(status_code=401, detail="Invalid OpenAI API key")
     except openai.RateLimitError:
         raise HTTPException(status_code=429, detail="OpenAI rate limit exceeded. Please try again later.")
+    except openai.APITimeoutError:
+        raise HTTPException(status_code=504, detail="OpenAI request timed out. Please try again.")
+    except OpenAIBusy:
+        raise HTTPException(status_code=503, detail="AI service is busy. Please try again shortly.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"LLM processing failed: {str(e)}")
 
@@ -316,8 +324,7 @@ async def chat_with_agent(
         )
 
     try:
-        import openai
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
 
         # Build the system prompt from agent configuration
         system_prompt = agent.agent_prompt or f"You are {agent.name}, a helpful voice agent."
@@ -347,12 +354,13 @@ async def chat_with_agent(
         temp = agent.temperature if agent.temperature is not None else 0.7
         max_tok = agent.max_tokens or 1024
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temp,
-            max_tokens=max_tok,
-        )
+        async with openai_slot():
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temp,
+                max_tokens=max_tok,
+            )
 
         return AIChatResponse(
             response=response.choices[0].message.content.strip(),
@@ -363,5 +371,9 @@ async def chat_with_agent(
         raise HTTPException(status_code=401, detail="Invalid OpenAI API key")
     except openai.RateLimitError:
         raise HTTPException(status_code=429, detail="OpenAI rate limit exceeded. Please try again later.")
+    except openai.APITimeoutError:
+        raise HTTPException(status_code=504, detail="OpenAI request timed out. Please try again.")
+    except OpenAIBusy:
+        raise HTTPException(status_code=503, detail="AI service is busy. Please try again shortly.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
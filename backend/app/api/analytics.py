@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, extract
+from sqlalchemy import func, case
 from typing import Optional
 from datetime import datetime, date, timedelta
+from ..core.cache import TTLCache
+from ..core.config import settings
 from ..core.database import get_db
-from ..models import CallLog, Lead, Campaign
+from ..core.date_ranges import local_today, on_days
+from ..models import CallLog, Lead, Campaign, CallDailyStat, CallHourlyStat
 from ..schemas.analytics import (
     DashboardMetrics, CallTrendData, ClassificationBreakdown,
     ObjectionData, HeatmapCell, AnalyticsResponse, CampaignAnalytics
@@ -13,62 +16,51 @@ from ..schemas.analytics import (
 router = APIRouter()
 
 
+_dashboard_cache = TTLCache(settings.DASHBOARD_CACHE_TTL)
+
+
 @router.get("/dashboard", response_model=DashboardMetrics)
 def get_dashboard_metrics(db: Session = Depends(get_db)):
-    """Get dashboard metrics for today"""
-    today = date.today()
+    """Get dashboard metrics for today (shared by all clients for DASHBOARD_CACHE_TTL seconds)"""
+    today = local_today()
+    return _dashboard_cache.get_or_compute(today, lambda: _compute_dashboard_metrics(db, today))
 
+
+def _compute_dashboard_metrics(db: Session, today: date) -> DashboardMetrics:
     # Live calls (initiated, ringing, or answered without end time)
     live_calls = db.query(func.count(CallLog.id)).filter(
         CallLog.status.in_(["initiated", "ringing", "answered"]),
         CallLog.ended_at.is_(None)
     ).scalar() or 0
 
-    # Completed calls today
-    completed_today = db.query(func.count(CallLog.id)).filter(
-        func.date(CallLog.created_at) == today,
-        CallLog.status == "completed"
-    ).scalar() or 0
-
-    # Total calls today
-    total_today = db.query(func.count(CallLog.id)).filter(
-        func.date(CallLog.created_at) == today
-    ).scalar() or 0
-
-    # Answered today
-    answered_today = db.query(func.count(CallLog.id)).filter(
-        func.date(CallLog.created_at) == today,
-        CallLog.status.in_(["answered", "completed"])
-    ).scalar() or 0
-
-    # Hot leads today
-    hot_leads_today = db.query(func.count(CallLog.id)).filter(
-        func.date(CallLog.created_at) == today,
-        CallLog.classification == "hot"
-    ).scalar() or 0
+    # Everything else for today in one pass over today's calls
+    stats = db.query(
+        func.count(CallLog.id).label('total'),
+        func.sum(case((CallLog.status == "completed", 1), else_=0)).label('completed'),
+        func.sum(case((CallLog.status.in_(["answered", "completed"]), 1), else_=0)).label('answered'),
+        func.sum(case((CallLog.classification == "hot", 1), else_=0)).label('hot'),
+        func.sum(case((CallLog.classification.in_(["warm", "hot"]), 1), else_=0)).label('qualified'),
+        func.avg(CallLog.duration).label('avg_duration')
+    ).filter(
+        on_days(CallLog.created_at, today)
+    ).one()
 
-    # Average duration today
-    avg_duration = db.query(func.avg(CallLog.duration)).filter(
-        func.date(CallLog.created_at) == today,
-        CallLog.duration.isnot(None)
-    ).scalar() or 0
+    total_today = stats.total or 0
+    answered_today = stats.answered or 0
 
     # Answer rate
     answer_rate = (answered_today / total_today * 100) if total_today > 0 else 0
 
-    # Qualification rate (warm + hot / total)
-    qualified_today = db.query(func.count(CallLog.id)).filter(
-        func.date(CallLog.created_at) == today,
-        CallLog.classification.in_(["warm", "hot"])
-    ).scalar() or 0
+    # Qualification rate (warm + hot / answered)
+    qualified_today = stats.qualified or 0
     qualification_rate = (qualified_today / answered_today * 100) if answered_today > 0 else 0
 
     return DashboardMetrics(
         live_calls=live_calls,
-        completed_today=completed_today,
-        hot_leads_today=hot_leads_today,
+        completed_today=stats.completed or 0,
+        hot_leads_today=stats.hot or 0,
         answer_rate=round(answer_rate, 1),
-        avg_duration=float(avg_duration),
+        avg_duration=float(stats.avg_duration or 0),
         qualification_rate=round(qualification_rate, 1)
     )
 
@@ -79,22 +71,22 @@ def get_call_trend(
     days: int = Query(7, ge=1, le=90)
 ):
     """Get call trend data for the last N days"""
-    end_date = date.today()
+    end_date = local_today()
     start_date = end_date - timedelta(days=days - 1)
 
-    # Get daily stats
+    # Get daily stats (from the daily rollup)
     daily_stats = db.query(
-        func.date(CallLog.created_at).label('call_date'),
-        func.count(CallLog.id).label('total'),
-        func.sum(case((CallLog.status.in_(["answered", "completed"]), 1), else_=0)).label('answered'),
-        func.sum(case((CallLog.classification == "hot", 1), else_=0)).label('hot'),
-        func.sum(case((CallLog.classification == "warm", 1), else_=0)).label('warm'),
-        func.sum(case((CallLog.classification == "cold", 1), else_=0)).label('cold')
+        CallDailyStat.day.label('call_date'),
+        func.sum(CallDailyStat.calls).label('total'),
+        func.sum(case((CallDailyStat.status.in_(["answered", "completed"]), CallDailyStat.calls), else_=0)).label('answered'),
+        func.sum(case((CallDailyStat.classification == "hot", CallDailyStat.calls), else_=0)).label('hot'),
+        func.sum(case((CallDailyStat.classification == "warm", CallDailyStat.calls), else_=0)).label('warm'),
+        func.sum(case((CallDailyStat.classification == "cold", CallDailyStat.calls), else_=0)).label('cold')
     ).filter(
-        func.date(CallLog.created_at) >= start_date,
-        func.date(CallLog.created_at) <= end_date
+        CallDailyStat.day >= start_date,
+        CallDailyStat.day <= end_date
     ).group_by(
-        func.date(CallLog.created_at)
+        CallDailyStat.day
     ).all()
 
     # Convert to dict for easy lookup
@@ -143,20 +135,20 @@ def get_classification_breakdown(
     campaign_id: Optional[int] = None
 ):
     """Get classification breakdown for the period"""
-    end_date = date.today()
+    end_date = local_today()
     start_date = end_date - timedelta(days=days)
 
     query = db.query(
-        func.sum(case((CallLog.classification == "hot", 1), else_=0)).label('hot'),
-        func.sum(case((CallLog.classification == "warm", 1), else_=0)).label('warm'),
-        func.sum(case((CallLog.classification == "cold", 1), else_=0)).label('cold')
+        func.sum(case((CallDailyStat.classification == "hot", CallDailyStat.calls), else_=0)).label('hot'),
+        func.sum(case((CallDailyStat.classification == "warm", CallDailyStat.calls), else_=0)).label('warm'),
+        func.sum(case((CallDailyStat.classification == "cold", CallDailyStat.calls), else_=0)).label('cold')
     ).filter(
-        func.date(CallLog.created_at) >= start_date,
-        CallLog.classification.isnot(None)
+        CallDailyStat.day >= start_date,
+        CallDailyStat.classification != ""
     )
 
     if campaign_id:
-        query = query.filter(CallLog.campaign_id == campaign_id)
+        query = query.filter(CallDailyStat.campaign_id == campaign_id)
 
     result = query.first()
 
@@ -199,21 +191,20 @@ def get_best_calling_times(
     days: int = Query(30, ge=1, le=90)
 ):
     """Get heatmap data for best calling times"""
-    end_date = date.today()
+    end_date = local_today()
     start_date = end_date - timedelta(days=days)
 
-    # Query by hour and day of week
+    # Query by hour and day of week (from the hourly rollup)
     stats = db.query(
-        extract('hour', CallLog.started_at).label('hour'),
-        extract('dow', CallLog.started_at).label('day_of_week'),
-        func.count(CallLog.id).label('total'),
-        func.sum(case((CallLog.classification.in_(["warm", "hot"]), 1), else_=0)).label('converted')
+        CallHourlyStat.hour,
+        CallHourlyStat.day_of_week,
+        func.sum(CallHourlyStat.calls).label('total'),
+        func.sum(CallHourlyStat.converted).label('converted')
     ).filter(
-        func.date(CallLog.created_at) >= start_date,
-        CallLog.started_at.isnot(None)
+        CallHourlyStat.day >= start_date
     ).group_by(
-        extract('hour', CallLog.started_at),
-        extract('dow', CallLog.started_at)
+        CallHourlyStat.hour,
+        CallHourlyStat.day_of_week
     ).all()
 
     days_map = {0: "Sun", 1: "Mon", 2: "Tue", 3: "Wed", 4: "Thu", 5: "Fri", 6: "Sat"}
@@ -240,13 +231,14 @@ def get_campaign_analytics(campaign_id: int, db: Session = Depends(get_db)):
         return None
 
     stats = db.query(
-        func.count(CallLog.id).label('total'),
-        func.sum(case((CallLog.status.in_(["answered", "completed"]), 1), else_=0)).label('answered'),
-        func.sum(case((CallLog.classification == "hot", 1), else_=0)).label('hot'),
-        func.sum(case((CallLog.classification == "warm", 1), else_=0)).label('warm'),
-        func.sum(case((CallLog.classification == "cold", 1), else_=0)).label('cold'),
-        func.avg(CallLog.duration).label('avg_duration')
-    ).filter(CallLog.campaign_id == campaign_id).first()
+        func.sum(CallDailyStat.calls).label('total'),
+        func.sum(case((CallDailyStat.status.in_(["answered", "completed"]), CallDailyStat.calls), else_=0)).label('answered'),
+        func.sum(case((CallDailyStat.classification == "hot", CallDailyStat.calls), else_=0)).label('hot'),
+        func.sum(case((CallDailyStat.classification == "warm", CallDailyStat.calls), else_=0)).label('warm'),
+        func.sum(case((CallDailyStat.classification == "cold", CallDailyStat.calls), else_=0)).label('cold'),
+        func.sum(CallDailyStat.duration_total).label('duration_total'),
+        func.sum(CallDailyStat.duration_calls).label('duration_calls')
+    ).filter(CallDailyStat.campaign_id == campaign_id).first()
 
     total = stats.total or 0
     answered = stats.answered or 0
@@ -260,7 +252,7 @@ def get_campaign_analytics(campaign_id: int, db: Session = Depends(get_db)):
         hot_leads=hot,
         warm_leads=stats.warm or 0,
         cold_leads=stats.cold or 0,
-        avg_duration=float(stats.avg_duration or 0),
+        avg_duration=float(stats.duration_total or 0) / stats.duration_calls if stats.duration_calls else 0.0,
         answer_rate=round(answered / total * 100, 1) if total > 0 else 0,
         qualification_rate=round((hot + (stats.warm or 0)) / answered * 100, 1) if answered > 0 else 0,
         cost_per_hot_lead=round(142.0 * total / hot, 2) if hot > 0 else 0  # Placeholder calculation
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
 from typing import Optional, List
 from datetime import datetime, date, timedelta
 from ..core.database import get_db
+from ..core.date_ranges import since_day, until_day
+from ..core.pagination import InvalidCursor, cached_count, keyset_page
 from ..models import CallLog, Lead, Campaign
 from ..schemas.call_log import (
     CallLogCreate, CallLogUpdate, CallLogResponse,
     CallLogListResponse, LiveCallResponse
 )
+from ..services.call_tracking import snapshot_call, track_call_write
 
 router = APIRouter()
 
@@ -49,9 +51,11 @@ def get_calls(
     status: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ):
-    """Get paginated list of call logs"""
+    """Get paginated list of call logs (newest first; see get_leads for `cursor`)"""
     query = db.query(CallLog).options(
         joinedload(CallLog.lead),
         joinedload(CallLog.campaign)
@@ -70,10 +74,10 @@ def get_calls(
         query = query.filter(CallLog.status == status)
 
     if date_from:
-        query = query.filter(func.date(CallLog.created_at) >= date_from)
+        query = query.filter(since_day(CallLog.created_at, date_from))
 
     if date_to:
-        query = query.filter(func.date(CallLog.created_at) <= date_to)
+        query = query.filter(until_day(CallLog.created_at, date_to))
 
     if search:
         query = query.join(Lead).filter(
@@ -81,17 +85,24 @@ def get_calls(
             (Lead.phone.ilike(f"%{search}%"))
         )
 
-    total = query.count()
+    total = cached_count(query) if include_total else None
 
     # Apply pagination
-    offset = (page - 1) * page_size
-    calls = query.order_by(CallLog.created_at.desc()).offset(offset).limit(page_size).all()
+    try:
+        calls, next_cursor = keyset_page(
+            query, CallLog.created_at, CallLog.id, page_size,
+            cursor=cursor,
+            offset=0 if cursor else (page - 1) * page_size
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return CallLogListResponse(
         calls=[get_call_response(c, db) for c in calls],
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor
     )
 
 
@@ -172,6 +183,7 @@ def create_call_log(call_data: CallLogCreate, db: Session = Depends(get_db)):
         started_at=datetime.now()
     )
     db.add(call)
+    track_call_write(db, call)
     db.commit()
     db.refresh(call)
 
@@ -189,10 +201,12 @@ def update_call_log(
     if not call:
         raise HTTPException(status_code=404, detail="Call not found")
 
+    before = snapshot_call(call)
     update_data = call_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(call, field, value)
 
+    track_call_write(db, call, before)
     db.commit()
     db.refresh(call)
 
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_
-from typing import Optional, List
-from datetime import datetime, date, timedelta
+from sqlalchemy import func, and_, case
+from typing import Optional, List, Dict
+from datetime import datetime, timedelta
 from ..core.database import get_db
-from ..models import Campaign, Lead, CallLog, User
+from ..core.date_ranges import local_today
+from ..models import Campaign, Lead, User, CallDailyStat
 from ..models.campaign import CampaignStatus
+from ..services.dialer import get_dialer, wake_dialer
 from ..schemas.campaign import (
     CampaignCreate, CampaignUpdate, CampaignResponse,
     CampaignListResponse, CampaignStats
@@ -14,64 +16,70 @@ from ..schemas.campaign import (
 router = APIRouter()
 
 
+def calculate_campaign_stats_batch(campaigns: List[Campaign], db: Session) -> Dict[int, CampaignStats]:
+    """Calculate statistics for many campaigns, keyed by campaign id.
+
+    One grouped query over the daily call rollup (call_daily_stats) serves
+    every campaign on the page, however many calls they have.
+    """
+    campaign_ids = [c.id for c in campaigns]
+    rows = {}
+    if campaign_ids:
+        today = local_today()
+        today_calls = case((CallDailyStat.day == today, CallDailyStat.calls), else_=0)
+        rows = {
+            row.campaign_id: row
+            for row in db.query(
+                CallDailyStat.campaign_id,
+                func.sum(today_calls).label('calls_today'),
+                func.sum(case((CallDailyStat.status == "answered", today_calls), else_=0)).label('answered_today'),
+                func.sum(case((CallDailyStat.classification == "hot", CallDailyStat.calls), else_=0)).label('hot'),
+                func.sum(case((CallDailyStat.classification == "warm", CallDailyStat.calls), else_=0)).label('warm'),
+                func.sum(case((CallDailyStat.classification == "cold", CallDailyStat.calls), else_=0)).label('cold'),
+                func.sum(CallDailyStat.duration_total).label('duration_total'),
+                func.sum(CallDailyStat.duration_calls).label('duration_calls')
+            ).filter(
+                CallDailyStat.campaign_id.in_(campaign_ids)
+            ).group_by(CallDailyStat.campaign_id)
+        }
+
+    stats = {}
+    for campaign in campaigns:
+        row = rows.get(campaign.id)
+        calls_today = (row.calls_today or 0) if row else 0
+        answered_today = (row.answered_today or 0) if row else 0
+        duration_calls = (row.duration_calls or 0) if row else 0
+
+        # Answer rate
+        answer_rate = (answered_today / calls_today * 100) if calls_today > 0 else 0
+
+        stats[campaign.id] = CampaignStats(
+            total_leads=campaign.total_leads or 0,
+            completed_leads=campaign.completed_leads or 0,
+            calls_today=calls_today,
+            answered_today=answered_today,
+            hot_leads=(row.hot or 0) if row else 0,
+            warm_leads=(row.warm or 0) if row else 0,
+            cold_leads=(row.cold or 0) if row else 0,
+            avg_duration=float(row.duration_total or 0) / duration_calls if duration_calls else 0.0,
+            answer_rate=answer_rate
+        )
+    return stats
+
+
 def calculate_campaign_stats(campaign: Campaign, db: Session) -> CampaignStats:
     """Calculate campaign statistics"""
-    today = date.today()
-
-    # Get call stats for today
-    calls_today = db.query(func.count(CallLog.id)).filter(
-        CallLog.campaign_id == campaign.id,
-        func.date(CallLog.created_at) == today
-    ).scalar() or 0
-
-    answered_today = db.query(func.count(CallLog.id)).filter(
-        CallLog.campaign_id == campaign.id,
-        func.date(CallLog.created_at) == today,
-        CallLog.status == "answered"
-    ).scalar() or 0
-
-    # Get classification stats
-    hot_leads = db.query(func.count(CallLog.id)).filter(
-        CallLog.campaign_id == campaign.id,
-        CallLog.classification == "hot"
-    ).scalar() or 0
-
-    warm_leads = db.query(func.count(CallLog.id)).filter(
-        CallLog.campaign_id == campaign.id,
-        CallLog.classification == "warm"
-    ).scalar() or 0
-
-    cold_leads = db.query(func.count(CallLog.id)).filter(
-        CallLog.campaign_id == campaign.id,
-        CallLog.classification == "cold"
-    ).scalar() or 0
-
-    # Average duration
-    avg_duration = db.query(func.avg(CallLog.duration)).filter(
-        CallLog.campaign_id == campaign.id,
-        CallLog.duration.isnot(None)
-    ).scalar() or 0
-
-    # Answer rate
-    total_calls = calls_today
-    answer_rate = (answered_today / total_calls * 100) if total_calls > 0 else 0
-
-    return CampaignStats(
-        total_leads=campaign.total_leads or 0,
-        completed_leads=campaign.completed_leads or 0,
-        calls_today=calls_today,
-        answered_today=answered_today,
-        hot_leads=hot_leads,
-        warm_leads=warm_leads,
-        cold_leads=cold_leads,
-        avg_duration=float(avg_duration),
-        answer_rate=answer_rate
-    )
+    return calculate_campaign_stats_batch([campaign], db)[campaign.id]
 
 
-def get_campaign_response(campaign: Campaign, db: Session) -> CampaignResponse:
-    """Convert Campaign model to response"""
-    stats = calculate_campaign_stats(campaign, db)
+def get_campaign_response(
+    campaign: Campaign,
+    db: Session,
+    stats: Optional[CampaignStats] = None
+) -> CampaignResponse:
+    """Convert Campaign model to response (pass `stats` from calculate_campaign_stats_batch for lists)"""
+    if stats is None:
+        stats = calculate_campaign_stats(campaign, db)
 
     return CampaignResponse(
         id=campaign.id,
@@ -117,14 +125,25 @@ def get_campaigns(
     offset = (page - 1) * page_size
     campaigns = query.order_by(Campaign.created_at.desc()).offset(offset).limit(page_size).all()
 
+    stats = calculate_campaign_stats_batch(campaigns, db)
+
     return CampaignListResponse(
-        campaigns=[get_campaign_response(c, db) for c in campaigns],
+        campaigns=[get_campaign_response(c, db, stats[c.id]) for c in campaigns],
         total=total,
         page=page,
         page_size=page_size
     )
 
 
+@router.get("/dialer/status")
+def get_dialer_status():
+    """Outbound dialer queues and calls in flight"""
+    dialer = get_dialer()
+    if dialer is None:
+        return {"enabled": False}
+    return {"enabled": True, **dialer.status()}
+
+
 @router.get("/{campaign_id}", response_model=CampaignResponse)
 def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
     """Get a single campaign"""
@@ -189,6 +208,7 @@ def update_campaign(
 
     db.commit()
     db.refresh(campaign)
+    wake_dialer()
 
     return get_campaign_response(campaign, db)
 
@@ -205,6 +225,7 @@ def start_campaign(campaign_id: int, db: Session = Depends(get_db)):
 
     campaign.status = CampaignStatus.ACTIVE
     db.commit()
+    wake_dialer()
 
     return {"message": "Campaign started", "status": "active"}
 
@@ -218,6 +239,7 @@ def pause_campaign(campaign_id: int, db: Session = Depends(get_db)):
 
     campaign.status = CampaignStatus.PAUSED
     db.commit()
+    wake_dialer()
 
     return {"message": "Campaign paused", "status": "paused"}
 
@@ -294,4 +316,7 @@ def build_lead_query_from_filters(filters: dict, db: Session):
     if filters.get('maxTracker'):
         query = query.filter(Lead.tracker < filters['maxTracker'])
 
+    if filters.get('classifications'):
+        query = query.filter(Lead.callClassification.in_(filters['classifications']))
+
     return query
@@ -4,6 +4,8 @@ from sqlalchemy import func
 from typing import Optional
 from datetime import datetime, date, timedelta
 from ..core.database import get_db
+from ..core.date_ranges import local_today, since_day, until_day
+from ..core.pagination import InvalidCursor, cached_count, keyset_page
 from ..models import ComplianceLog, Lead, CallLog
 from ..models.compliance_log import ComplianceEventType
 from ..schemas.compliance import (
@@ -17,19 +19,19 @@ router = APIRouter()
 @router.get("/status", response_model=ComplianceStatus)
 def get_compliance_status(db: Session = Depends(get_db)):
     """Get overall compliance status"""
-    today = date.today()
+    today = local_today()
     thirty_days_ago = today - timedelta(days=30)
 
     # Calling window violations
     violations = db.query(func.count(ComplianceLog.id)).filter(
         ComplianceLog.event_type == ComplianceEventType.TIME_WINDOW_VIOLATION,
-        func.date(ComplianceLog.created_at) >= thirty_days_ago
+        since_day(ComplianceLog.created_at, thirty_days_ago)
     ).scalar() or 0
 
     # Opt-out requests
     opt_outs = db.query(func.count(ComplianceLog.id)).filter(
         ComplianceLog.event_type == ComplianceEventType.OPT_OUT_REQUESTED,
-        func.date(ComplianceLog.created_at) >= thirty_days_ago
+        since_day(ComplianceLog.created_at, thirty_days_ago)
     ).scalar() or 0
 
     # Pending erasure requests
@@ -52,7 +54,7 @@ def get_compliance_status(db: Session = Depends(get_db)):
     one_year_ago = today - timedelta(days=365)
     recordings_count = db.query(func.count(CallLog.id)).filter(
         CallLog.recording_url.isnot(None),
-        func.date(CallLog.created_at) >= one_year_ago
+        since_day(CallLog.created_at, one_year_ago)
     ).scalar() or 0
 
     return ComplianceStatus(
@@ -77,24 +79,32 @@ def get_compliance_logs(
     page_size: int = Query(25, ge=1, le=100),
     event_type: Optional[str] = None,
     date_from: Optional[date] = None,
-    date_to: Optional[date] = None
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ):
-    """Get paginated compliance logs"""
+    """Get paginated compliance logs (newest first; see get_leads for `cursor`)"""
     query = db.query(ComplianceLog)
 
     if event_type:
         query = query.filter(ComplianceLog.event_type == event_type)
 
     if date_from:
-        query = query.filter(func.date(ComplianceLog.created_at) >= date_from)
+        query = query.filter(since_day(ComplianceLog.created_at, date_from))
 
     if date_to:
-        query = query.filter(func.date(ComplianceLog.created_at) <= date_to)
+        query = query.filter(until_day(ComplianceLog.created_at, date_to))
 
-    total = query.count()
+    total = cached_count(query) if include_total else None
 
-    offset = (page - 1) * page_size
-    logs = query.order_by(ComplianceLog.created_at.desc()).offset(offset).limit(page_size).all()
+    try:
+        logs, next_cursor = keyset_page(
+            query, ComplianceLog.created_at, ComplianceLog.id, page_size,
+            cursor=cursor,
+            offset=0 if cursor else (page - 1) * page_size
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Get lead names
     log_responses = []
@@ -118,7 +128,8 @@ def get_compliance_logs(
         logs=log_responses,
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor
     )
 
 
@@ -162,7 +173,7 @@ def request_erasure(request: ErasureRequest, db: Session = Depends(get_db)):
         details={
             "reason": request.reason,
             "requested_at": datetime.now().isoformat(),
-            "due_date": (date.today() + timedelta(days=30)).isoformat()
+            "due_date": (local_today() + timedelta(days=30)).isoformat()
         }
     )
     db.add(compliance_log)
@@ -171,7 +182,7 @@ def request_erasure(request: ErasureRequest, db: Session = Depends(get_db)):
     return {
         "message": "Erasure request logged",
         "lead_id": request.lead_id,
-        "due_date": (date.today() + timedelta(days=30)).isoformat()
+        "due_date": (local_today() + timedelta(days=30)).isoformat()
     }
 
 
@@ -5,13 +5,26 @@ Knowledge Base & Realtime AI Sales Agent API
 - Supports bilingual (English/Hindi) sales conversations
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
+import json
 
 from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.http_client import OpenAIBusy, get_openai_client, openai_slot
 from ..models.user import User
+from ..services.intent_matcher import Intent, IntentMatch, IntentMatcher
+from ..services.kb_retrieval import BM25Index
+from ..services.kb_store import (
+    InProcessKBChangeBus,
+    KBChangeBus,
+    KnowledgeBaseStore,
+    RedisKBChangeBus,
+)
+from ..services.text_segmenter import SentenceSegmenter
 from .auth import get_current_user
 
 router = APIRouter()
@@ -20,7 +33,7 @@ router = APIRouter()
 # In-memory Knowledge Base Store
 # ============================================================================
 
-_knowledge_base: Dict[str, Any] = {
+_DEFAULT_KNOWLEDGE_BASE: Dict[str, Any] = {
     "company_name": "RSC Group Dholera",
     "agent_name": "Chitti",
     "agent_identity": "I am Chitti from RSC Group Dholera. Our Founder and CEO is Ramrajsinh Chudasama - ex Indian Army officer who now leads RSC Group building Dholera Smart City.",
@@ -232,19 +245,50 @@ Every response must: Sound like a real Indian female sales professional, Be natu
             "id": "faq_9",
             "question": "What is the token money or booking amount?",
             "answer": "Token money sirf 10,000 rupees hai. Itne mein aap apna plot book kar sakte hain.",
-            "category": "Pricing"
+            "category": "Pricing",
+            "aliases": [
+                "token amount kitna hai",
+                "token money kitna hai",
+                "booking amount kitna hai",
+                "booking ke liye kitna dena hoga",
+                "plot book karne ke liye kitna paisa",
+                "how much is the token amount",
+            ]
         },
         {
             "id": "faq_10",
             "question": "What is the refund or cancellation policy?",
             "answer": "Agar aap 30 din ke andar cancel karte hain toh full refund milta hai. 30 din ke baad cancellation allowed nahi hai.",
-            "category": "Policy"
+            "category": "Policy",
+            "aliases": [
+                "refund milega",
+                "refund policy",
+                "cancel karne par refund",
+                "cancellation policy",
+                "paisa wapas milega",
+                "can i get a refund",
+            ]
         },
         {
             "id": "faq_11",
             "question": "Who is the founder, CEO, owner, malik, boss or head of RSC Group? Who started or runs RSC Group? Company leadership?",
             "answer": "Ramrajsinh Chudasama is the Founder and CEO of RSC Group. From proudly serving in the Indian Army to shaping the future of Dholera Smart City, his journey is rooted in discipline, service, and a deep love for the land. Today, he leads multiple ventures that help people invest wisely, grow confidently, and become part of India's next big growth story.",
-            "category": "Company"
+            "category": "Company",
+            "aliases": [
+                "ceo kaun hai",
+                "company ka ceo kaun hai",
+                "owner kaun hai",
+                "company ka owner kaun hai",
+                "company ka malik kaun hai",
+                "malik kaun hai",
+                "founder kaun hai",
+                "company kisne banaya",
+                "boss kaun hai",
+                "who is the ceo",
+                "who is the owner",
+                "who is the founder",
+                "who runs rsc group",
+            ]
         },
         {
             "id": "faq_12",
@@ -298,6 +342,7 @@ Every response must: Sound like a real Indian female sales professional, Be natu
         "optimize_streaming_latency": 2,       # Better quality audio (less compression artifacts)
         "output_format": "pcm_24000",          # Raw PCM 24kHz 16-bit mono (lowest latency)
         "use_speaker_boost": True,             # Richer, fuller voice presence
+        "tts_prefetch_depth": 2,               # ElevenLabs requests started ahead of the sentence playing
     },
 
     # OpenAI Realtime API VAD / session configuration
@@ -337,6 +382,7 @@ class FAQEntry(BaseModel):
     question: str
     answer: str
     category: str = "General"
+    aliases: List[str] = []  # Alternate phrasings for the no-LLM fast path
 
 
 class CustomDataEntry(BaseModel):
@@ -362,29 +408,108 @@ class SalesAgentChatResponse(BaseModel):
     agent_name: str
     language_detected: str
     is_on_topic: bool
+    matched_faq: Optional[str] = None  # set when answered by the FAQ fast path
 
 
 # ============================================================================
 # Knowledge Base CRUD Endpoints
 # ============================================================================
 
+def _create_kb_change_bus() -> KBChangeBus:
+    if settings.KB_PUBSUB_BACKEND == "redis":
+        return RedisKBChangeBus(settings.REDIS_URL, settings.KB_PUBSUB_CHANNEL)
+    return InProcessKBChangeBus()
+
+
+# Versioned snapshots in the database; seeded from _DEFAULT_KNOWLEDGE_BASE
+_kb_store = KnowledgeBaseStore(SessionLocal, _DEFAULT_KNOWLEDGE_BASE, _create_kb_change_bus())
+
+# Compiled prompts / indexes, valid for one KB version
+_compiled_artifacts: Dict[str, Any] = {}
+_compiled_version = 0
+
+
+async def start_knowledge_base_store():
+    """Load the live KB and start listening for edits from other workers."""
+    await _kb_store.start()
+
+
+async def close_knowledge_base_store():
+    await _kb_store.close()
+
+
+def get_knowledge_base_version() -> int:
+    """Current KB version. Prompts compiled for an older version are stale."""
+    return _kb_store.version
+
+
+def _compiled(kind: str) -> Any:
+    """Return the prompt text / retrieval index for `kind`, built once per KB version.
+
+    Reusing the exact same text for every request keeps the prompt prefix
+    byte-stable, so provider-side prompt caching applies across calls.
+    """
+    global _compiled_version
+    version, kb = _kb_store.snapshot()
+    if _compiled_version != version:
+        _compiled_artifacts.clear()
+        _compiled_version = version
+    artifact = _compiled_artifacts.get(kind)
+    if artifact is None:
+        artifact = _compiled_artifacts[kind] = _KB_COMPILERS[kind](kb)
+    return artifact
+
+
+def _schedule_tts_warmup(background_tasks: BackgroundTasks):
+    """Re-render the welcome message / canned answers into the TTS cache after responding."""
+    from .voice_agent import warm_tts_cache  # voice_agent imports this module
+
+    background_tasks.add_task(warm_tts_cache)
+
+
 @router.get("/config")
 def get_knowledge_base(current_user: User = Depends(get_current_user)):
     """Get the full knowledge base configuration."""
-    return _knowledge_base
+    version, kb = _kb_store.snapshot()
+    return {**kb, "version": version}
 
 
 @router.put("/config")
 def update_knowledge_base(
     data: KnowledgeBaseUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
 ):
     """Update knowledge base configuration."""
     update_dict = data.model_dump(exclude_unset=True)
-    for key, value in update_dict.items():
-        _knowledge_base[key] = value
-    _knowledge_base["updated_at"] = datetime.utcnow().isoformat()
-    return _knowledge_base
+    _kb_store.update(lambda kb: kb.update(update_dict), current_user.id)
+    if "welcome_message" in update_dict:
+        _schedule_tts_warmup(background_tasks)
+    version, kb = _kb_store.snapshot()
+    return {**kb, "version": version}
+
+
+@router.get("/versions")
+def list_knowledge_base_versions(
+    limit: int = 50,
+    current_user: User = Depends(get_current_user),
+):
+    """List saved knowledge base versions, newest first."""
+    return {"versions": _kb_store.history(limit), "current": _kb_store.version}
+
+
+@router.post("/versions/{version}/restore")
+def restore_knowledge_base_version(
+    version: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+):
+    """Make an earlier version live again (saved as a new version)."""
+    new_version = _kb_store.restore(version, current_user.id)
+    if new_version is None:
+        raise HTTPException(status_code=404, detail="Knowledge base version not found")
+    _schedule_tts_warmup(background_tasks)
+    return {"message": f"Restored version {version}", "version": new_version}
 
 
 # --- FAQs ---
@@ -392,12 +517,14 @@ def update_knowledge_base(
 @router.get("/faqs")
 def list_faqs(current_user: User = Depends(get_current_user)):
     """List all FAQ entries."""
-    return {"faqs": _knowledge_base.get("faqs", []), "total": len(_knowledge_base.get("faqs", []))}
+    faqs = _kb_store.data.get("faqs", [])
+    return {"faqs": faqs, "total": len(faqs)}
 
 
 @router.post("/faqs")
 def add_faq(
     data: FAQEntry,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
 ):
     """Add a new FAQ entry."""
@@ -407,9 +534,10 @@ def add_faq(
         "question": data.question,
         "answer": data.answer,
         "category": data.category,
+        "aliases": data.aliases,
     }
-    _knowledge_base["faqs"].append(faq)
-    _knowledge_base["updated_at"] = datetime.utcnow().isoformat()
+    _kb_store.update(lambda kb: kb.setdefault("faqs", []).append(faq), current_user.id)
+    _schedule_tts_warmup(background_tasks)
     return faq
 
 
@@ -419,9 +547,10 @@ def delete_faq(
     current_user: User = Depends(get_current_user),
 ):
     """Delete a FAQ entry."""
-    faqs = _knowledge_base.get("faqs", [])
-    _knowledge_base["faqs"] = [f for f in faqs if f["id"] != faq_id]
-    _knowledge_base["updated_at"] = datetime.utcnow().isoformat()
+    def remove(kb):
+        kb["faqs"] = [f for f in kb.get("faqs", []) if f["id"] != faq_id]
+
+    _kb_store.update(remove, current_user.id)
     return {"message": "FAQ deleted", "id": faq_id}
 
 
@@ -430,7 +559,8 @@ def delete_faq(
 @router.get("/custom-data")
 def list_custom_data(current_user: User = Depends(get_current_user)):
     """List all custom data entries."""
-    return {"data": _knowledge_base.get("custom_data", []), "total": len(_knowledge_base.get("custom_data", []))}
+    custom = _kb_store.data.get("custom_data", [])
+    return {"data": custom, "total": len(custom)}
 
 
 @router.post("/custom-data")
@@ -447,8 +577,7 @@ def add_custom_data(
         "category": data.category,
         "created_at": datetime.utcnow().isoformat(),
     }
-    _knowledge_base["custom_data"].append(entry)
-    _knowledge_base["updated_at"] = datetime.utcnow().isoformat()
+    _kb_store.update(lambda kb: kb.setdefault("custom_data", []).append(entry), current_user.id)
     return entry
 
 
@@ -458,9 +587,10 @@ def delete_custom_data(
     current_user: User = Depends(get_current_user),
 ):
     """Delete a custom data entry."""
-    custom = _knowledge_base.get("custom_data", [])
-    _knowledge_base["custom_data"] = [d for d in custom if d["id"] != entry_id]
-    _knowledge_base["updated_at"] = datetime.utcnow().isoformat()
+    def remove(kb):
+        kb["custom_data"] = [d for d in kb.get("custom_data", []) if d["id"] != entry_id]
+
+    _kb_store.update(remove, current_user.id)
     return {"message": "Custom data deleted", "id": entry_id}
 
 
@@ -469,6 +599,7 @@ def delete_custom_data(
 @router.post("/objections")
 def add_objection(
     data: ObjectionEntry,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
 ):
     """Add objection handling entry."""
@@ -479,8 +610,8 @@ def add_objection(
         "response_en": data.response_en,
         "response_hi": data.response_hi,
     }
-    _knowledge_base["objection_handling"].append(entry)
-    _knowledge_base["updated_at"] = datetime.utcnow().isoformat()
+    _kb_store.update(lambda kb: kb.setdefault("objection_handling", []).append(entry), current_user.id)
+    _schedule_tts_warmup(background_tasks)
     return entry
 
 
@@ -490,9 +621,10 @@ def delete_objection(
     current_user: User = Depends(get_current_user),
 ):
     """Delete an objection entry."""
-    objs = _knowledge_base.get("objection_handling", [])
-    _knowledge_base["objection_handling"] = [o for o in objs if o.get("id") != obj_id]
-    _knowledge_base["updated_at"] = datetime.utcnow().isoformat()
+    def remove(kb):
+        kb["objection_handling"] = [o for o in kb.get("objection_handling", []) if o.get("id") != obj_id]
+
+    _kb_store.update(remove, current_user.id)
     return {"message": "Objection deleted", "id": obj_id}
 
 
@@ -500,28 +632,41 @@ def delete_objection(
 # Reusable LLM Sales Response Generator
 # ============================================================================
 
-async def generate_sales_response(
-    message: str,
-    conversation_history: list = None,
-    language_preference: str = "hinglish",
-) -> dict:
-    """
-    Core LLM function that generates a sales agent response.
-    Used by both the REST /chat endpoint and the WebSocket voice agent.
-    Returns: {"response": str, "agent_name": str, "language_detected": str, "is_on_topic": bool}
-    """
-    if not settings.OPENAI_API_KEY:
-        raise Exception("OpenAI API key not configured. Set OPENAI_API_KEY in .env file.")
+_OFF_TOPIC_MARKERS = ["outside my area", "bahar hai", "mere area se bahar", "I can only help with"]
 
-    import openai
-    client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
 
-    if conversation_history is None:
-        conversation_history = []
+def detect_response_language(text: str) -> str:
+    """Rough script check: 'hinglish', 'hi' (Devanagari only) or 'en'."""
+    has_hindi = any(0x0900 < ord(c) < 0x097F for c in text)
+    has_english = any(c.isascii() and c.isalpha() for c in text)
+    if has_hindi and has_english:
+        return "hinglish"
+    if has_hindi:
+        return "hi"
+    return "en"
 
-    # Build knowledge context from all knowledge base data
-    kb = _knowledge_base
 
+def is_on_topic_response(text: str) -> bool:
+    """False when the agent declined the question as outside the knowledge base."""
+    return not any(marker in text for marker in _OFF_TOPIC_MARKERS)
+
+
+def _sales_response_result(agent_response: str) -> dict:
+    return {
+        "response": agent_response,
+        "agent_name": _kb_store.data.get("agent_name", "Chitti"),
+        "language_detected": detect_response_language(agent_response),
+        "is_on_topic": is_on_topic_response(agent_response),
+    }
+
+
+def _compile_sales_system_prompt(kb: dict) -> str:
+    """Stable system prompt for the REST / SSE sales agent chat.
+
+    FAQs, custom data and objections are not included here; the entries
+    relevant to each message are retrieved and sent separately (see
+    _sales_completion_request).
+    """
     # Compile Projects Data
     projects_text = "\n".join([
         f"- {p['name']}: {p['location']}, Plot: {p.get('min_plot', 'N/A')}-{p.get('max_plot', 'N/A')} sq yards, "
@@ -530,24 +675,6 @@ async def generate_sales_response(
         for p in kb.get("projects", [])
     ])
 
-    # Compile FAQs
-    faq_text = "\n".join([
-        f"Q: {f['question']}\nA: {f['answer']}"
-        for f in kb.get("faqs", [])
-    ])
-
-    # Compile custom data
-    custom_text = "\n".join([
-        f"## {d['title']}\n{d['content']}"
-        for d in kb.get("custom_data", [])
-    ])
-
-    # Compile objection handling
-    objection_text = "\n".join([
-        f"Objection: {o['objection']}\nResponse (EN): {o['response_en']}\nResponse (HI): {o.get('response_hi', '')}"
-        for o in kb.get("objection_handling", [])
-    ])
-
     # Build the system prompt
     system_prompt = f"""You are {kb.get('agent_name', 'Chitti')}, a professional AI sales agent for {kb.get('company_name', 'RSC Group Dholera')}.
 
@@ -565,17 +692,8 @@ async def generate_sales_response(
 === OUR PROJECTS (18+ Projects) ===
 {projects_text}
 
-=== KNOWLEDGE BASE (FAQs) ===
-{faq_text}
-
-=== ADDITIONAL KNOWLEDGE ===
-{custom_text}
-
-=== OBJECTION HANDLING ===
-{objection_text}
-
 === CRITICAL RULES ===
-1. You MUST ONLY answer from the knowledge base above. CEO/Founder/Owner questions ARE part of the knowledge base — always answer them.
+1. You MUST ONLY answer from the projects above and the RELEVANT KNOWLEDGE provided with each message. CEO/Founder/Owner questions ARE part of the knowledge base — always answer them.
 2. When asked about areas, recommend 2-3 projects with prices.
 3. If off-topic (NOT related to projects, pricing, company, CEO, investment), say: "Yeh mere area se bahar hai, lekin main projects ke baare mein help kar sakti hoon."
 4. NEVER mention WhatsApp, emails, or brochures. Focus on site visits or sales team.
@@ -589,9 +707,70 @@ async def generate_sales_response(
 
 Language: Hinglish (Roman script only)
 """
+    return system_prompt
+
+
+def _compile_sales_knowledge_index(kb: dict) -> BM25Index:
+    """BM25 index over FAQs, custom data and objections (rendered as in the prompt)."""
+    entries = []
+    for f in kb.get("faqs", []):
+        entries.append((
+            f"{f['question']} {f['answer']} {f.get('category', '')}",
+            f"Q: {f['question']}\nA: {f['answer']}",
+        ))
+    for d in kb.get("custom_data", []):
+        entries.append((
+            f"{d['title']} {d['content']} {d.get('category', '')}",
+            f"## {d['title']}\n{d['content']}",
+        ))
+    for o in kb.get("objection_handling", []):
+        entries.append((
+            f"{o['objection']} {o['response_en']} {o.get('response_hi', '')}",
+            f"Objection: {o['objection']}\nResponse (EN): {o['response_en']}\nResponse (HI): {o.get('response_hi', '')}",
+        ))
+    return BM25Index(entries)
+
+
+def _compile_faq_intents(kb: dict) -> IntentMatcher:
+    """One intent per FAQ: its question plus any aliases."""
+    return IntentMatcher([
+        Intent(f["id"], f["answer"], [f["question"], *f.get("aliases", [])])
+        for f in kb.get("faqs", [])
+        if f.get("answer")
+    ])
+
+
+def match_faq_intent(message: str) -> Optional[IntentMatch]:
+    """FAQ whose fixed answer can be returned for `message` without the LLM, if any."""
+    if not settings.INTENT_FAST_PATH_ENABLED:
+        return None
+    return _compiled("faq_intents").match(message, settings.INTENT_MATCH_THRESHOLD)
+
+
+def _relevant_knowledge(message: str, conversation_history: list) -> str:
+    """KB entries matching the message (and the previous user turn, for follow-ups)."""
+    previous = next(
+        (m.get("content", "") for m in reversed(conversation_history) if m.get("role", "user") == "user"),
+        "",
+    )
+    index: BM25Index = _compiled("sales_index")
+    selected = index.select(
+        f"{message} {previous}",
+        top_k=settings.KB_RETRIEVAL_TOP_K,
+        token_budget=settings.KB_RETRIEVAL_TOKEN_BUDGET,
+    )
+    return "\n\n".join(selected)
+
+
+def _sales_completion_request(message: str, conversation_history: list = None) -> dict:
+    """Build the chat.completions arguments (KB system prompt + history) for the sales agent."""
+    if conversation_history is None:
+        conversation_history = []
+
+    kb = _kb_store.data
 
-    # Build messages
-    messages = [{"role": "system", "content": system_prompt}]
+    # Build messages (system prompt first: identical for every request of a KB version)
+    messages = [{"role": "system", "content": _compiled("sales")}]
 
     for msg in conversation_history:
         messages.append({
@@ -599,56 +778,109 @@ Language: Hinglish (Roman script only)
             "content": msg.get("content", ""),
         })
 
+    # Retrieved knowledge goes after the history so the stable prefix stays cacheable
+    knowledge = _relevant_knowledge(message, conversation_history)
+    if knowledge:
+        messages.append({"role": "system", "content": f"=== RELEVANT KNOWLEDGE ===\n{knowledge}"})
+
     messages.append({"role": "user", "content": message})
 
-    # Call LLM
-    model = kb.get("llm_model", "gpt-4-turbo")
-    temp = kb.get("temperature", 0.7)
-    max_tok = kb.get("max_tokens", 1024)
+    return {
+        "model": kb.get("llm_model", "gpt-4-turbo"),
+        "messages": messages,
+        "temperature": kb.get("temperature", 0.7),
+        "max_tokens": kb.get("max_tokens", 1024),
+    }
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=temp,
-        max_tokens=max_tok,
-    )
 
-    agent_response = response.choices[0].message.content.strip()
+async def generate_sales_response(
+    message: str,
+    conversation_history: list = None,
+    language_preference: str = "hinglish",
+) -> dict:
+    """
+    Core LLM function that generates a sales agent response.
+    Used by both the REST /chat endpoint and the WebSocket voice agent.
+    Returns: {"response": str, "agent_name": str, "language_detected": str, "is_on_topic": bool}
+    """
+    match = match_faq_intent(message)
+    if match:
+        return {**_sales_response_result(match.intent.answer), "matched_faq": match.intent.id}
+
+    if not settings.OPENAI_API_KEY:
+        raise Exception("OpenAI API key not configured. Set OPENAI_API_KEY in .env file.")
+
+    client = get_openai_client()
+    request = _sales_completion_request(message, conversation_history)
 
-    # Detect language of response
-    has_hindi = any(ord(c) > 0x0900 and ord(c) < 0x097F for c in agent_response)
-    has_english = any(c.isascii() and c.isalpha() for c in agent_response)
+    async with openai_slot():
+        response = await client.chat.completions.create(**request)
 
-    if has_hindi and has_english:
-        lang = "hinglish"
-    elif has_hindi:
-        lang = "hi"
-    else:
-        lang = "en"
+    return _sales_response_result(response.choices[0].message.content.strip())
 
-    # Check if response indicates off-topic
-    off_topic_markers = ["outside my area", "bahar hai", "mere area se bahar", "I can only help with"]
-    is_on_topic = not any(marker in agent_response for marker in off_topic_markers)
 
-    return {
-        "response": agent_response,
-        "agent_name": kb.get("agent_name", "Chitti"),
-        "language_detected": lang,
-        "is_on_topic": is_on_topic,
-    }
+async def stream_sales_response(
+    message: str,
+    conversation_history: list = None,
+    language_preference: str = "hinglish",
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Streaming variant of generate_sales_response.
+    Yields ("token", {"text"}) per delta, ("sentence", {"text"}) as each
+    sentence completes (same segmentation as the voice agent's TTS), and a
+    final ("done", <generate_sales_response result>).
+    """
+    match = match_faq_intent(message)
+    if match:
+        segmenter = SentenceSegmenter()
+        for sentence in segmenter.feed(match.intent.answer) + segmenter.flush():
+            yield "sentence", {"text": sentence}
+        yield "done", {**_sales_response_result(match.intent.answer), "matched_faq": match.intent.id}
+        return
+
+    if not settings.OPENAI_API_KEY:
+        raise Exception("OpenAI API key not configured. Set OPENAI_API_KEY in .env file.")
+
+    client = get_openai_client()
+    request = _sales_completion_request(message, conversation_history)
+    segmenter = SentenceSegmenter()
+    parts: List[str] = []
+
+    async with openai_slot():
+        stream = await client.chat.completions.create(**request, stream=True)
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                yield "token", {"text": delta}
+                for sentence in segmenter.feed(delta):
+                    yield "sentence", {"text": sentence}
+
+    for sentence in segmenter.flush():
+        yield "sentence", {"text": sentence}
+    yield "done", _sales_response_result("".join(parts).strip())
 
 
 def get_knowledge_base_config() -> dict:
     """Get the knowledge base configuration. Used by voice agent."""
-    return _knowledge_base
+    return _kb_store.data
 
 
 def build_realtime_system_instructions(language_preference: str = "hinglish") -> str:
     """
-    Build CONCISE system instructions for GPT-4o Realtime API session.update.
+    CONCISE system instructions for GPT-4o Realtime API session.update.
     Kept short (~800 tokens) to minimize latency on every turn.
+    Compiled once per KB version and shared by all sessions.
     """
-    kb = _knowledge_base
+    return _compiled("realtime")
+
+
+def _compile_realtime_instructions(kb: dict) -> str:
+    """Compact Realtime instructions (top projects, FAQs, objections)."""
 
     # Compile Projects (compact format - top 6 most important)
     projects = kb.get("projects", [])
@@ -765,6 +997,14 @@ FINAL RULE: Every response must sound BEAUTIFUL when spoken aloud by an Indian f
     return system_prompt
 
 
+_KB_COMPILERS = {
+    "sales": _compile_sales_system_prompt,
+    "sales_index": _compile_sales_knowledge_index,
+    "faq_intents": _compile_faq_intents,
+    "realtime": _compile_realtime_instructions,
+}
+
+
 # ============================================================================
 # Realtime AI Sales Agent Chat (REST endpoint - uses shared LLM function)
 # ============================================================================
@@ -791,6 +1031,52 @@ async def sales_agent_chat(
             agent_name=result["agent_name"],
             language_detected=result["language_detected"],
             is_on_topic=result["is_on_topic"],
+            matched_faq=result.get("matched_faq"),
         )
+    except OpenAIBusy:
+        raise HTTPException(status_code=503, detail="AI service is busy. Please try again shortly.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/chat/stream")
+async def sales_agent_chat_stream(
+    data: SalesAgentChatRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Streaming AI Sales Agent Chat (Server-Sent Events).
+    Same knowledge-base agent as /chat, streamed as:
+    - `token`: {"text"} for every model delta
+    - `sentence`: {"text"} for each completed sentence
+    - `done`: the /chat response body (response, agent_name, language_detected, is_on_topic)
+    - `error`: {"message"} if generation fails mid-stream
+    """
+    if not settings.OPENAI_API_KEY:
+        raise HTTPException(
+            status_code=503,
+            detail="OpenAI API key not configured. Set OPENAI_API_KEY in .env file."
+        )
+
+    async def events():
+        try:
+            async for event, payload in stream_sales_response(
+                message=data.message,
+                conversation_history=data.conversation_history,
+                language_preference=data.language_preference,
+            ):
+                yield _sse(event, payload)
+        except OpenAIBusy:
+            yield _sse("error", {"message": "AI service is busy. Please try again shortly."})
+        except Exception as e:
+            yield _sse("error", {"message": f"Chat failed: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
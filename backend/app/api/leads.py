@@ -1,25 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
+from sqlalchemy import or_
 from typing import Optional, List
 from ..core.database import get_db
+from ..core.pagination import InvalidCursor, cached_count, keyset_page
 from ..models import Lead, CallLog, User, Plot, LeadStage, LeadStatus, Platform
 from ..schemas.lead import (
     LeadCreate, LeadUpdate, LeadResponse, LeadListResponse
 )
+from ..services.call_tracking import track_call_write
 
 router = APIRouter()
 
 
-def get_lead_response(lead: Lead, db: Session) -> LeadResponse:
-    """Convert Lead model to response with related data"""
-    # Get call count and last call
-    call_stats = db.query(
-        func.count(CallLog.id).label('count'),
-        func.max(CallLog.created_at).label('last_call'),
-        func.max(CallLog.classification).label('classification')
-    ).filter(CallLog.lead_id == lead.id).first()
+def _lead_load_options():
+    """Eager-load every relationship get_lead_response reads"""
+    return (
+        joinedload(Lead.platform),
+        joinedload(Lead.plot),
+        joinedload(Lead.assigned_user),
+        joinedload(Lead.lead_stage),
+        joinedload(Lead.lead_status)
+    )
+
 
+def get_lead_response(lead: Lead) -> LeadResponse:
+    """Convert Lead model to response with related data"""
     return LeadResponse(
         id=lead.id,
         name=lead.name,
@@ -42,9 +48,9 @@ def get_lead_response(lead: Lead, db: Session) -> LeadResponse:
         assigned_user_name=lead.assigned_user.full_name if lead.assigned_user else None,
         stage_name=lead.lead_stage.name if lead.lead_stage else None,
         status_name=lead.lead_status.name if lead.lead_status else None,
-        call_count=call_stats.count if call_stats else 0,
-        last_call_date=call_stats.last_call if call_stats else None,
-        classification=call_stats.classification if call_stats else None
+        call_count=lead.callCount or 0,
+        last_call_date=lead.lastCallAt,
+        classification=lead.callClassification
     )
 
 
@@ -62,16 +68,16 @@ def get_leads(
     assigned_to: Optional[int] = None,
     classification: Optional[str] = None,
     sort_by: str = "createdAt",
-    sort_order: str = "desc"
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ):
-    """Get paginated list of leads with filters"""
-    query = db.query(Lead).options(
-        joinedload(Lead.platform),
-        joinedload(Lead.plot),
-        joinedload(Lead.assigned_user),
-        joinedload(Lead.lead_stage),
-        joinedload(Lead.lead_status)
-    )
+    """Get paginated list of leads with filters.
+
+    Pass the previous response's `next_cursor` as `cursor` to fetch the next
+    page; `page` still works but gets slower on deep pages.
+    """
+    query = db.query(Lead).options(*_lead_load_options())
 
     # Apply filters
     if search:
@@ -101,47 +107,60 @@ def get_leads(
     if assigned_to:
         query = query.filter(Lead.assignedTo == assigned_to)
 
-    # Get total count
-    total = query.count()
+    if classification:
+        query = query.filter(Lead.callClassification == classification)
+
+    total = cached_count(query) if include_total else None
 
-    # Apply sorting
     sort_column = getattr(Lead, sort_by, Lead.createdAt)
-    if sort_order == "desc":
-        query = query.order_by(sort_column.desc())
+    descending = sort_order == "desc"
+    next_cursor = None
+
+    if sort_column is Lead.createdAt:
+        try:
+            leads, next_cursor = keyset_page(
+                query, Lead.createdAt, Lead.id, page_size,
+                cursor=cursor,
+                descending=descending,
+                offset=0 if cursor else (page - 1) * page_size
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    elif cursor:
+        raise HTTPException(status_code=400, detail="Cursor pagination requires sort_by=createdAt")
     else:
-        query = query.order_by(sort_column.asc())
+        # Apply sorting
+        if descending:
+            query = query.order_by(sort_column.desc(), Lead.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Lead.id.asc())
 
-    # Apply pagination
-    offset = (page - 1) * page_size
-    leads = query.offset(offset).limit(page_size).all()
+        # Apply pagination
+        offset = (page - 1) * page_size
+        leads = query.offset(offset).limit(page_size).all()
 
     # Convert to response
-    lead_responses = [get_lead_response(lead, db) for lead in leads]
+    lead_responses = [get_lead_response(lead) for lead in leads]
 
     return LeadListResponse(
         leads=lead_responses,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=(total + page_size - 1) // page_size
+        total_pages=(total + page_size - 1) // page_size if total is not None else None,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{lead_id}", response_model=LeadResponse)
 def get_lead(lead_id: int, db: Session = Depends(get_db)):
     """Get a single lead by ID"""
-    lead = db.query(Lead).options(
-        joinedload(Lead.platform),
-        joinedload(Lead.plot),
-        joinedload(Lead.assigned_user),
-        joinedload(Lead.lead_stage),
-        joinedload(Lead.lead_status)
-    ).filter(Lead.id == lead_id).first()
+    lead = db.query(Lead).options(*_lead_load_options()).filter(Lead.id == lead_id).first()
 
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
 
-    return get_lead_response(lead, db)
+    return get_lead_response(lead)
 
 
 @router.post("", response_model=LeadResponse)
@@ -157,7 +176,7 @@ def create_lead(lead_data: LeadCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(lead)
 
-    return get_lead_response(lead, db)
+    return get_lead_response(lead)
 
 
 @router.put("/{lead_id}", response_model=LeadResponse)
@@ -174,7 +193,7 @@ def update_lead(lead_id: int, lead_data: LeadUpdate, db: Session = Depends(get_d
     db.commit()
     db.refresh(lead)
 
-    return get_lead_response(lead, db)
+    return get_lead_response(lead)
 
 
 @router.delete("/{lead_id}")
@@ -206,6 +225,7 @@ def initiate_call(lead_id: int, db: Session = Depends(get_db)):
 
     # Increment tracker
     lead.tracker = (lead.tracker or 0) + 1
+    track_call_write(db, call_log)
     db.commit()
     db.refresh(call_log)
 
@@ -249,12 +269,8 @@ def get_hot_leads_queue(
     limit: int = Query(10, ge=1, le=50)
 ):
     """Get queue of hot leads requiring follow-up"""
-    # Get leads with recent hot classification
-    hot_leads = db.query(Lead).options(
-        joinedload(Lead.plot),
-        joinedload(Lead.assigned_user)
-    ).join(CallLog).filter(
-        CallLog.classification == "hot"
-    ).order_by(CallLog.created_at.desc()).limit(limit).all()
+    hot_leads = db.query(Lead).options(*_lead_load_options()).filter(
+        Lead.lastHotCallAt.isnot(None)
+    ).order_by(Lead.lastHotCallAt.desc()).limit(limit).all()
 
-    return [get_lead_response(lead, db) for lead in hot_leads]
+    return [get_lead_response(lead) for lead in hot_leads]
@@ -8,35 +8,74 @@ Notes:
 - Keeps numeric digits intact so numbers are spoken reliably.
 - Adds voice_settings nudges likely to produce an Indian accent (depends on ElevenLabs model/voice).
 - Streams raw PCM16 audio (24kHz, mono) per-sentence to browser for low-latency playback.
+- Resamples browser mic PCM16 (16kHz unless the start event says otherwise)
+  to the 24kHz the Realtime API expects for `pcm16` input.
 """
 
-import io
 import json
 import asyncio
-import base64
 import logging
 import re
+import time
 from uuid import uuid4
-from typing import Optional
+from typing import List, Optional
 
 import aiohttp
+import numpy as np
 from fastapi import WebSocket, WebSocketDisconnect
 
 from ..core.config import settings
+from ..core.http_client import get_http_session
+from ..core.logging_config import SampledSessionLogger
+from ..services.audio_coalescer import AudioCoalescer
+from ..services.intent_matcher import IntentMatch
+from ..services.realtime_pool import RealtimePool
+from ..services.resampler import PCM16Resampler
+from ..services.text_segmenter import SentenceSegmenter
+from ..services.voice_metrics import (
+    TurnTimer,
+    latency_snapshot,
+    record_latency,
+    summarize_turns,
+)
+from ..services.tts_cache import get_tts_cache, normalize_tts_text, tts_cache_key
 from .knowledge_base import (
     build_realtime_system_instructions,
+    detect_response_language,
     get_knowledge_base_config,
+    get_knowledge_base_version,
+    is_on_topic_response,
+    match_faq_intent,
 )
 
 logger = logging.getLogger(__name__)
 
-
-def safe_print(msg: str):
-    """Print that won't crash on Windows cp1252 with Hindi/Unicode text."""
-    try:
-        print(msg)
-    except UnicodeEncodeError:
-        print(msg.encode("ascii", errors="replace").decode("ascii"))
+# Realtime `pcm16` input is 24 kHz mono; browsers that don't say otherwise
+# in the start event capture the mic at 16 kHz (useVoiceAgent.ts)
+_REALTIME_INPUT_RATE = 24000
+_DEFAULT_MIC_RATE = 16000
+
+# PCM relay: read size per ElevenLabs chunk (4 KB ≈ 85 ms of 24 kHz PCM16)
+# and how long a single browser send may block before we give up on it
+_PCM_RELAY_CHUNK_BYTES = 4096
+_BROWSER_SEND_TIMEOUT = 5.0
+
+# TTS look-ahead: ElevenLabs requests started ahead of the chunk currently
+# playing (override per deployment with voice_config.tts_prefetch_depth),
+# and how much audio a prefetched chunk may buffer (32 x 4 KB ≈ 2.7 s) before
+# the rest is left in the socket until playback reaches it
+_DEFAULT_TTS_PREFETCH_DEPTH = 2
+_TTS_PREFETCH_BUFFER_CHUNKS = 32
+
+# Adaptive mic gate after the welcome: wait until the browser has played
+# everything relayed so far (estimated from PCM bytes sent), then until the
+# mic falls quiet relative to the echo measured during playback
+_PCM_BYTES_PER_SECOND = 48000   # 24 kHz, 16-bit, mono
+_CLIENT_PLAYBACK_LEAD = 0.17    # browser buffers ~170 ms before a segment starts
+_ECHO_QUIET_WINDOW = 0.3        # mic must stay below the echo threshold this long
+_ECHO_MAX_WAIT = 1.5            # give up waiting for quiet after this (old fixed delay)
+_ECHO_RMS_FLOOR = 300           # int16 RMS that always counts as quiet
+_ECHO_RMS_RATIO = 0.25          # quiet = below this fraction of the playback echo peak
 
 
 # ---------------------------
@@ -157,6 +196,186 @@ def _normalize_text(text: Optional[str]) -> str:
     return text
 
 
+def _welcome_speech_text(welcome_text_clean: str) -> str:
+    """The part of the (normalized) welcome message that is spoken: first line only."""
+    return welcome_text_clean.split("\n")[0] if "\n" in welcome_text_clean else welcome_text_clean
+
+
+# ---------------------------
+# OpenAI Realtime connection
+# ---------------------------
+
+def _realtime_session_config(language_preference: str) -> dict:
+    """Session config for session.update (KB prompt + VAD, text-only replies)."""
+    kb = get_knowledge_base_config()
+    rt_config = kb.get("realtime_voice_config", {})
+
+    # Server-side VAD: balanced threshold for reliable speech detection
+    turn_detection = rt_config.get("turn_detection", {
+        "type": "server_vad",
+        "threshold": 0.60,
+        "silence_duration_ms": 1000,
+        "prefix_padding_ms": 300,
+    })
+
+    instructions = build_realtime_system_instructions(
+        language_preference
+    )
+
+    return {
+        "modalities": ["text"],
+        "instructions": instructions,
+        "input_audio_format": "pcm16",
+        "input_audio_transcription": {
+            "model": "whisper-1",
+            "language": "en",
+        },
+        "turn_detection": turn_detection,
+        "temperature": rt_config.get("temperature", 0.7),
+        "max_response_output_tokens": rt_config.get(
+            "max_response_output_tokens", 300
+        ),
+    }
+
+
+async def _open_realtime_ws() -> aiohttp.ClientWebSocketResponse:
+    """Open a Realtime API WebSocket on the shared HTTP pool (15s timeout)."""
+    model = settings.OPENAI_REALTIME_MODEL
+    url = f"wss://api.openai.com/v1/realtime?model={model}"
+
+    headers = {
+        "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
+        "OpenAI-Beta": "realtime=v1",
+    }
+
+    return await asyncio.wait_for(
+        get_http_session().ws_connect(url, headers=headers),
+        timeout=15,
+    )
+
+
+_realtime_pool: Optional[RealtimePool] = None
+
+
+async def start_realtime_pool():
+    """Start pre-warming Realtime connections. Called at application startup."""
+    global _realtime_pool
+    if _realtime_pool is not None or settings.REALTIME_POOL_SIZE <= 0 or not settings.OPENAI_API_KEY:
+        return
+    _realtime_pool = RealtimePool(
+        connect=_open_realtime_ws,
+        session_config=_realtime_session_config,
+        size=settings.REALTIME_POOL_SIZE,
+        idle_ttl=settings.REALTIME_POOL_IDLE_TTL,
+        refresh_on_kb_change=settings.REALTIME_POOL_REFRESH_ON_KB_CHANGE,
+        languages=settings.REALTIME_POOL_LANGUAGES,
+    )
+    _realtime_pool.start()
+
+
+async def close_realtime_pool():
+    """Close idle pooled connections. Called at application shutdown."""
+    global _realtime_pool
+    if _realtime_pool is not None:
+        await _realtime_pool.close()
+        _realtime_pool = None
+
+
+# ---------------------------
+# ElevenLabs TTS request
+# ---------------------------
+
+def _elevenlabs_tts_request(text: str, voice_config: dict):
+    """Build (url, headers, payload) for an ElevenLabs streaming TTS call.
+
+    The URL + payload also form the TTS cache key, so everything that
+    changes the rendered audio must live in one of them.
+    """
+    voice_id = voice_config.get("voice_id", "NXsB2Ew7UyH5JDkfI3LF")
+    model_id = voice_config.get("model_id", "eleven_turbo_v2_5")
+
+    # PCM output: 24kHz 16-bit signed little-endian mono
+    output_format = voice_config.get("output_format", "pcm_24000")
+    optimize_latency = voice_config.get(
+        "optimize_streaming_latency", 4
+    )
+
+    url = (
+        f"https://api.elevenlabs.io/v1/text-to-speech/"
+        f"{voice_id}/stream"
+        f"?optimize_streaming_latency={optimize_latency}"
+        f"&output_format={output_format}"
+    )
+
+    headers = {
+        "xi-api-key": settings.ELEVENLABS_API_KEY,
+        "Content-Type": "application/json",
+        "Accept": "audio/pcm, */*",
+    }
+
+    # Speed: 0.95 = natural pace, not slow
+    speed = voice_config.get("speed", 0.95)
+
+    payload = {
+        "text": normalize_tts_text(text),
+        "model_id": model_id,
+        "voice_settings": {
+            "stability": voice_config.get("stability", 0.40),
+            "similarity_boost": voice_config.get("similarity_boost", 0.85),
+            "style": voice_config.get("style", 0.35),
+            "use_speaker_boost": voice_config.get("use_speaker_boost", True),
+            "speed": speed,
+        },
+    }
+    return url, headers, payload
+
+
+def _elevenlabs_tts_timeout() -> aiohttp.ClientTimeout:
+    return aiohttp.ClientTimeout(
+        total=None,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+        sock_read=settings.HTTP_READ_TIMEOUT,
+    )
+
+
+# ---------------------------
+# TTS prefetch
+# ---------------------------
+
+class _TTSPrefetch:
+    """An ElevenLabs request started ahead of playback.
+
+    PCM16 chunks arrive on `audio` (None-terminated) while earlier chunks
+    are still playing. `close()` cancels the request if it is still running
+    and frees its look-ahead slot.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        generation: int,
+        slots: Optional[asyncio.Semaphore] = None,
+        turn: Optional[TurnTimer] = None,
+    ):
+        self.text = text
+        self.generation = generation
+        self.turn = turn
+        self.audio: asyncio.Queue = asyncio.Queue(maxsize=_TTS_PREFETCH_BUFFER_CHUNKS)
+        self.task: Optional[asyncio.Task] = None
+        self._slots = slots
+
+    def close(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+            # Wake a consumer still waiting for audio that will never come
+            while not self.audio.empty():
+                self.audio.get_nowait()
+            self.audio.put_nowait(None)
+        if self._slots is not None:
+            self._slots.release()
+            self._slots = None
+
+
 # ---------------------------
 # Voice agent session class
 # ---------------------------
@@ -164,38 +383,94 @@ def _normalize_text(text: Optional[str]) -> str:
 class VoiceAgentSession:
     """Manages a single realtime voice call session using GPT-4o Realtime API."""
 
-    def __init__(self, websocket: WebSocket, language_preference: str = "hinglish"):
+    def __init__(
+        self,
+        websocket: WebSocket,
+        language_preference: str = "hinglish",
+        input_sample_rate: int = _DEFAULT_MIC_RATE,
+    ):
         self.websocket = websocket
         self.language_preference = language_preference
         self.session_id = str(uuid4())
+        # Tags records with session_id; per-event DEBUG only for sampled sessions
+        self.log = SampledSessionLogger(logger, self.session_id)
+        # KB version whose compiled prompt this call was configured with
+        self.kb_version = get_knowledge_base_version()
+
+        # Mic audio is resampled to the Realtime input rate (state kept across chunks)
+        self.input_sample_rate = input_sample_rate
+        self._resampler = (
+            PCM16Resampler(input_sample_rate, _REALTIME_INPUT_RATE)
+            if input_sample_rate != _REALTIME_INPUT_RATE else None
+        )
+        # ...and batched into fixed-duration appends
+        self._audio_coalescer = AudioCoalescer(
+            self._send_raw_to_openai,
+            sample_rate=_REALTIME_INPUT_RATE,
+            frame_ms=settings.REALTIME_AUDIO_FRAME_MS,
+        )
 
         # OpenAI Realtime API WebSocket
-        self.openai_ws = None          # aiohttp ClientWebSocketResponse
-        self._aiohttp_session = None   # aiohttp ClientSession
+        self.openai_ws = None          # aiohttp ClientWebSocketResponse (on the shared HTTP pool)
 
         # State
         self.is_active = True
         self.is_speaking = False       # True while TTS is streaming to browser
         self._interrupted = False      # True when user barges in during TTS
         self._openai_listener_task = None
+        self._connect_task = None      # connect_openai_realtime, started by start()
         self._tts_queue: asyncio.Queue = asyncio.Queue()  # TTS text queue
-        self._tts_worker_task = None   # Background TTS worker
+        self._tts_worker_task = None   # Background TTS worker (starts ElevenLabs requests)
+        self._tts_playback_queue: asyncio.Queue = asyncio.Queue()  # _TTSPrefetch jobs in play order
+        self._tts_playback_task = None  # Background TTS playback (relays audio to browser)
+        self._tts_generation = 0       # Bumped on barge-in; older prefetches are stale
+        self._tts_playing: Optional[_TTSPrefetch] = None  # Chunk currently relayed to browser
+        voice_config = get_knowledge_base_config().get("voice_config", {})
+        prefetch_depth = max(0, int(voice_config.get("tts_prefetch_depth", _DEFAULT_TTS_PREFETCH_DEPTH)))
+        self._tts_slots = asyncio.Semaphore(prefetch_depth + 1)  # playing chunk + look-ahead
         self._full_response_text = ""  # Full response accumulator
+        self._segmenter = SentenceSegmenter()  # Splits text deltas into TTS sentences
+        self._segmented_upto = 0       # Chars of _full_response_text already fed to segmenter
+        self._response_streaming = False  # True between response.created and response.text.done
+        self._discard_response = False    # True after barge-in: drop rest of current response
+        self._tts_response_open = False   # True while TTS worker is inside a response
         self._welcome_done = False     # Prevent duplicate welcome
         self._ready_for_audio = False  # Gate: don't forward mic audio until welcome is done
+        self._playback_until = 0.0     # Loop time when the browser finishes playing relayed audio
+        self._echo_peak_rms = 0.0      # Loudest gated mic frame while agent audio was playing
+        self._mic_loud_at = 0.0        # Last time a gated mic frame was above the echo threshold
+
+        # Latency instrumentation (services/voice_metrics.py)
+        self._turn: Optional[TurnTimer] = None           # Turn opened by the latest speech_stopped
+        self._response_turn: Optional[TurnTimer] = None  # Turn the streaming response belongs to
+        self._played_turn: Optional[TurnTimer] = None    # Turn of the last chunk played
+        self._turn_spans: List[dict] = []                # Finished turns (session summary)
+        self._barge_in_ms: List[float] = []              # speech_started -> agent_audio_stop
         self._got_first_user_speech = False  # Suppress auto-response before real user speech
         self._response_count = 0       # Count OpenAI-generated responses (first one is always noise-triggered)
+        # FAQ fast path (knowledge_base.match_faq_intent): turn answered without the model
+        self._faq_answered_turn: Optional[TurnTimer] = None
+        self._faq_reply_pending = False  # FAQ answered before the model's response.created
+        self._ignored_responses: set = set()  # Response ids cancelled for the FAQ path
+        self._faq_answers = 0
 
     # ------------------------------------------------------------------
     # Session Lifecycle
     # ------------------------------------------------------------------
 
-    async def start(self):
-        """Send welcome message with ElevenLabs TTS, then start TTS worker."""
+    async def start(self) -> bool:
+        """Connect to OpenAI Realtime and send the welcome message concurrently,
+        then open the mic gate and start the TTS worker.
+
+        Returns False if the Realtime connection failed.
+        """
         if self._welcome_done:
-            return
+            return True
         self._welcome_done = True
 
+        # Realtime connect/configure runs while the welcome plays
+        self._connect_task = asyncio.create_task(self.connect_openai_realtime())
+
         kb = get_knowledge_base_config()
         welcome_text = kb.get(
             "welcome_message",
@@ -217,11 +492,19 @@ class VoiceAgentSession:
         await self.send_json({"event": "agent_state", "state": "speaking"})
 
         # Generate and stream TTS for welcome (single line only)
-        welcome_speak = welcome_text_clean.split("\n")[0] if "\n" in welcome_text_clean else welcome_text_clean
+        welcome_speak = _welcome_speech_text(welcome_text_clean)
         await self.generate_and_send_tts(welcome_speak)
         await self.send_json({"event": "agent_audio_end"})
         self.is_speaking = False
 
+        try:
+            connected = await self._connect_task
+        except Exception as e:
+            self.log.error("OpenAI Realtime connect error: %s", e)
+            connected = False
+        if not connected:
+            return False
+
         # Inject welcome message into OpenAI conversation history so it
         # knows the greeting has already been spoken and does NOT generate
         # a duplicate greeting on first user turn.
@@ -238,86 +521,108 @@ class VoiceAgentSession:
                 ],
             },
         })
+        self.log.debug("Injected welcome into OpenAI history")
 
-        # Clear any audio that accumulated during welcome TTS playback
-        # so OpenAI VAD doesn't mistake ambient noise for user speech
-        await self._send_to_openai({
-            "type": "input_audio_buffer.clear",
-        })
-        safe_print("[VOICE] Injected welcome into OpenAI history + cleared audio buffer")
-
-        # Brief delay before opening mic gate — lets the echo from
-        # welcome TTS fade so OpenAI VAD doesn't false-trigger
-        await asyncio.sleep(1.5)
+        # Keep the mic gate closed until the browser has finished playing
+        # the welcome and its echo has died down, so OpenAI VAD doesn't
+        # false-trigger on it
+        await self._wait_for_playback_and_echo()
 
-        # Clear buffer again after the delay (catches any residual noise)
+        # Clear any audio that accumulated during welcome TTS playback
         await self._send_to_openai({
             "type": "input_audio_buffer.clear",
         })
 
         # Mark ready to receive mic audio (gate in main loop)
         self._ready_for_audio = True
-        safe_print("[VOICE] Mic gate OPEN — ready for user speech")
+        self.log.info("Mic gate open, listening")
 
         # Now listening for user
         await self.send_json({"event": "agent_state", "state": "listening"})
 
-        # Start the TTS worker for subsequent responses
+        # Start the TTS pipeline for subsequent responses
+        self._tts_playback_task = asyncio.create_task(
+            self._run_tts_playback_loop()
+        )
         self._tts_worker_task = asyncio.create_task(
             self._run_tts_worker_loop()
         )
+        return True
+
+    async def _wait_for_playback_and_echo(self):
+        """Adaptive mic gate: playback end (estimated) + echo tail."""
+        loop = asyncio.get_running_loop()
+
+        remaining = self._playback_until - loop.time()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+        # Wait for the mic to be quiet for a short window, capped at _ECHO_MAX_WAIT
+        deadline = loop.time() + _ECHO_MAX_WAIT
+        while loop.time() < deadline:
+            if loop.time() - self._mic_loud_at >= _ECHO_QUIET_WINDOW:
+                break
+            await asyncio.sleep(0.05)
+
+    def observe_gated_audio(self, audio_data: bytes):
+        """Measure mic energy while the gate is closed (feeds the echo check)."""
+        if len(audio_data) < 2:
+            return
+        samples = np.frombuffer(audio_data, dtype=np.int16, count=len(audio_data) // 2)
+        rms = float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))
+
+        now = asyncio.get_running_loop().time()
+        if now < self._playback_until:
+            self._echo_peak_rms = max(self._echo_peak_rms, rms)
+            self._mic_loud_at = now
+        elif rms > max(_ECHO_RMS_FLOOR, self._echo_peak_rms * _ECHO_RMS_RATIO):
+            self._mic_loud_at = now
 
     # ------------------------------------------------------------------
     # OpenAI Realtime API Connection
     # ------------------------------------------------------------------
 
     async def connect_openai_realtime(self) -> bool:
-        """Open WebSocket to OpenAI Realtime API. Retries up to 3 times."""
-        safe_print(
-            f"[VOICE] Attempting OpenAI Realtime connection... "
-            f"API key present: {bool(settings.OPENAI_API_KEY)}"
-        )
+        """Attach to OpenAI Realtime API.
 
+        Claims a pre-configured connection from the pool when one is idle;
+        otherwise opens a new WebSocket. Retries up to 3 times.
+        """
         if not settings.OPENAI_API_KEY:
-            safe_print("[VOICE] ERROR: No OpenAI API key!")
+            self.log.error("No OpenAI API key configured")
             await self.send_json({
                 "event": "error",
                 "message": "OpenAI API key not configured. Set OPENAI_API_KEY in .env",
             })
             return False
 
-        model = settings.OPENAI_REALTIME_MODEL
-        url = f"wss://api.openai.com/v1/realtime?model={model}"
-
-        headers = {
-            "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-            "OpenAI-Beta": "realtime=v1",
-        }
+        if _realtime_pool is not None:
+            try:
+                self.openai_ws = await _realtime_pool.claim(self.language_preference)
+            except Exception as e:
+                self.log.warning("Realtime pool claim failed: %s: %s", type(e).__name__, e)
+                self.openai_ws = None
+            if self.openai_ws is not None:
+                self._openai_listener_task = asyncio.create_task(
+                    self._listen_openai()
+                )
+                self.log.info("OpenAI Realtime connected (pooled)")
+                return True
 
         max_retries = 3
         last_error = None
 
         for attempt in range(1, max_retries + 1):
             try:
-                safe_print(
-                    f"[VOICE] Connecting to OpenAI Realtime "
-                    f"(attempt {attempt}/{max_retries})..."
-                )
-                self._aiohttp_session = aiohttp.ClientSession()
-                self.openai_ws = await asyncio.wait_for(
-                    self._aiohttp_session.ws_connect(url, headers=headers),
-                    timeout=15,
-                )
+                self.log.debug("Connecting to OpenAI Realtime (attempt %d/%d)", attempt, max_retries)
+                self.openai_ws = await _open_realtime_ws()
 
                 # Start listener for Realtime API server events
                 self._openai_listener_task = asyncio.create_task(
                     self._listen_openai()
                 )
 
-                safe_print(
-                    f"[VOICE] [OK] OpenAI Realtime connected on attempt {attempt}!"
-                )
-                logger.info(f"[{self.session_id}] OpenAI Realtime connected")
+                self.log.info("OpenAI Realtime connected on attempt %d", attempt)
 
                 # Configure session (modalities, VAD, system prompt)
                 await self._configure_session()
@@ -326,27 +631,19 @@ class VoiceAgentSession:
 
             except Exception as e:
                 last_error = e
-                safe_print(
-                    f"[VOICE] [FAIL] Attempt {attempt} failed: "
-                    f"{type(e).__name__}: {e}"
+                self.log.warning(
+                    "OpenAI Realtime attempt %d failed: %s: %s", attempt, type(e).__name__, e
                 )
-                if self._aiohttp_session:
-                    await self._aiohttp_session.close()
-                    self._aiohttp_session = None
+                if self.openai_ws and not self.openai_ws.closed:
+                    await self.openai_ws.close()
                 self.openai_ws = None
 
                 if attempt < max_retries:
                     wait_time = attempt * 1
-                    safe_print(f"[VOICE] Retrying in {wait_time}s...")
                     await asyncio.sleep(wait_time)
 
-        safe_print(
-            f"[VOICE] [FAIL] All {max_retries} attempts failed. "
-            f"Last error: {last_error}"
-        )
-        logger.error(
-            f"[{self.session_id}] OpenAI Realtime connection failed "
-            f"after {max_retries} retries: {last_error}"
+        self.log.error(
+            "OpenAI Realtime connection failed after %d retries: %s", max_retries, last_error
         )
         await self.send_json({
             "event": "error",
@@ -356,41 +653,11 @@ class VoiceAgentSession:
 
     async def _configure_session(self):
         """Send session.update to OpenAI Realtime API with KB prompt + VAD config."""
-        kb = get_knowledge_base_config()
-        rt_config = kb.get("realtime_voice_config", {})
-
-        # Server-side VAD: balanced threshold for reliable speech detection
-        turn_detection = rt_config.get("turn_detection", {
-            "type": "server_vad",
-            "threshold": 0.60,
-            "silence_duration_ms": 1000,
-            "prefix_padding_ms": 300,
-        })
-
-        instructions = build_realtime_system_instructions(
-            self.language_preference
-        )
-
-        session_update = {
+        await self._send_to_openai({
             "type": "session.update",
-            "session": {
-                "modalities": ["text"],
-                "instructions": instructions,
-                "input_audio_format": "pcm16",
-                "input_audio_transcription": {
-                    "model": "whisper-1",
-                    "language": "en",
-                },
-                "turn_detection": turn_detection,
-                "temperature": rt_config.get("temperature", 0.7),
-                "max_response_output_tokens": rt_config.get(
-                    "max_response_output_tokens", 300
-                ),
-            },
-        }
-
-        await self._send_to_openai(session_update)
-        safe_print("[VOICE] [OK] session.update sent (text-only mode, server_vad)")
+            "session": _realtime_session_config(self.language_preference),
+        })
+        self.log.debug("session.update sent (text-only mode, server_vad)")
 
     # ------------------------------------------------------------------
     # OpenAI Realtime API Listener
@@ -410,21 +677,17 @@ class VoiceAgentSession:
                     except json.JSONDecodeError:
                         pass
                     except Exception as e:
-                        logger.error(
-                            f"[{self.session_id}] OpenAI event error: {e}"
-                        )
+                        self.log.error("OpenAI event error: %s", e)
 
                 elif msg.type in (
                     aiohttp.WSMsgType.CLOSED,
                     aiohttp.WSMsgType.ERROR,
                 ):
-                    logger.info(
-                        f"[{self.session_id}] OpenAI WebSocket closed/error"
-                    )
+                    self.log.info("OpenAI WebSocket closed/error")
                     break
 
         except Exception as e:
-            logger.error(f"[{self.session_id}] OpenAI listener error: {e}")
+            self.log.error("OpenAI listener error: %s", e)
 
     async def _handle_openai_event(self, event: dict):
         """Process a single event from the OpenAI Realtime API."""
@@ -432,28 +695,31 @@ class VoiceAgentSession:
 
         # ---- Session Events ----
         if event_type == "session.created":
-            safe_print(f"[VOICE] OpenAI session created: {event.get('session', {}).get('id', '?')}")
+            self.log.debug("OpenAI session created: %s", event.get("session", {}).get("id", "?"))
 
         elif event_type == "session.updated":
-            safe_print("[VOICE] OpenAI session config updated OK")
+            self.log.debug("OpenAI session config updated")
 
         # ---- VAD Speech Events ----
         elif event_type == "input_audio_buffer.speech_started":
-            safe_print("[VOICE] User started speaking")
-            # BARGE-IN: If agent is currently speaking, interrupt TTS
-            if self.is_speaking:
-                safe_print("[VOICE] >> BARGE-IN: User interrupted agent, stopping TTS")
-                self._interrupted = True
-                self.is_speaking = False
-                # Drain the TTS queue so worker doesn't play stale text
-                while not self._tts_queue.empty():
-                    try:
-                        self._tts_queue.get_nowait()
-                    except asyncio.QueueEmpty:
-                        break
-                # Tell browser to stop playing audio immediately
-                await self.send_json({"event": "agent_audio_stop"})
-                await self.send_json({"event": "agent_audio_end"})
+            self.log.debug("VAD: speech started")
+            # A new utterance: the next response belongs to it
+            self._faq_reply_pending = False
+            # BARGE-IN: If agent is speaking (or a streamed reply is already
+            # queued for TTS), interrupt everything for the current response
+            if (
+                self.is_speaking
+                or self._tts_response_open
+                or self._response_streaming
+                or not self._tts_queue.empty()
+                or not self._tts_playback_queue.empty()
+            ):
+                self.log.info("Barge-in: user interrupted agent, stopping TTS")
+                barge_in_at = time.monotonic()
+                await self._interrupt_response()
+                reaction_ms = (time.monotonic() - barge_in_at) * 1000
+                record_latency("barge_in_reaction", reaction_ms)
+                self._barge_in_ms.append(reaction_ms)
 
             await self.send_json({
                 "event": "agent_state",
@@ -461,24 +727,26 @@ class VoiceAgentSession:
             })
 
         elif event_type == "input_audio_buffer.speech_stopped":
-            safe_print("[VOICE] User stopped speaking -> thinking")
+            self.log.debug("VAD: speech stopped")
+            self._turn = TurnTimer()
             await self.send_json({
                 "event": "agent_state",
                 "state": "thinking",
             })
 
         elif event_type == "input_audio_buffer.committed":
-            safe_print("[VOICE] Audio buffer committed to conversation")
+            self.log.debug("Input audio buffer committed")
 
         # ---- User Transcript (Whisper) ----
         elif event_type == "conversation.item.input_audio_transcription.completed":
             transcript = event.get("transcript", "").strip()
             if transcript:
+                if self._turn:
+                    self._turn.mark("transcript")
                 self._got_first_user_speech = True
-            if transcript:
                 # Clean out timecodes before sending to UI/transcript
                 transcript_clean = _remove_timecodes(transcript)
-                safe_print(f"[VOICE] User said: {transcript_clean}")
+                self.log.debug("User said: %s", transcript_clean)
                 await self.send_json({
                     "event": "transcript",
                     "text": transcript_clean,
@@ -486,21 +754,55 @@ class VoiceAgentSession:
                     "speech_final": True,
                 })
 
+                # Fixed FAQ answers replace the model's reply for this turn
+                match = match_faq_intent(transcript_clean)
+                if match and await self._answer_from_faq(match):
+                    return
+
+                # Whisper often completes after the reply has started streaming;
+                # release anything held back while speech was unconfirmed
+                await self._pump_segmenter()
+
         elif event_type == "conversation.item.input_audio_transcription.failed":
             error = event.get("error", {})
-            safe_print(f"[VOICE] Transcription failed: {error.get('message', '?')}")
+            self.log.warning("Transcription failed: %s", error.get("message", "?"))
 
         # ---- Response Text Streaming ----
+        elif event.get("response_id") in self._ignored_responses:
+            # Model reply to a turn the FAQ fast path already answered
+            return
+
         elif event_type == "response.text.delta":
+            if self._discard_response:
+                return
             delta = event.get("delta", "")
+            if self._response_turn:
+                self._response_turn.mark("first_delta")
             self._full_response_text += delta
+            # Stream completed sentences to TTS while the model keeps generating
+            await self._pump_segmenter()
 
         elif event_type == "response.text.done":
+            self._response_streaming = False
+            if self._response_turn:
+                self._response_turn.mark("text_done")
+            if self._discard_response:
+                # Reply was cut off by barge-in — nothing more to say or play
+                self.log.debug("Discarded interrupted response")
+                self._reset_response_text()
+                return
+
             # Get full response text
             full_text = (
                 event.get("text", "") or self._full_response_text
             ).strip()
-            self._full_response_text = ""
+
+            if full_text and self._got_first_user_speech:
+                # Queue the unspoken tail of the reply
+                if not self._full_response_text.strip():
+                    self._full_response_text = full_text
+                await self._pump_segmenter(final=True)
+            self._reset_response_text()
 
             if full_text:
                 self._response_count += 1
@@ -509,7 +811,10 @@ class VoiceAgentSession:
                 # Welcome greeting is already handled via ElevenLabs TTS in start().
                 # Noise-triggered auto-responses happen before Whisper confirms speech.
                 if not self._got_first_user_speech:
-                    safe_print(f"[VOICE] SUPPRESSED response #{self._response_count} (pre-speech): {full_text[:80]}")
+                    self.log.info(
+                        "Suppressed response #%d before user speech: %.80s",
+                        self._response_count, full_text,
+                    )
                     # Still consume the sentinel so TTS worker stays in sync
                     await self._tts_queue.put(None)
                     return
@@ -517,145 +822,340 @@ class VoiceAgentSession:
                 # Remove timecodes that may be prepended by model
                 full_text = _remove_timecodes(full_text)
 
-                safe_print(f"[VOICE] Agent response (preview): {full_text[:120]}")
+                self.log.debug("Agent response: %.120s", full_text)
 
-                # Detect language presence roughly (keeps behavior similar)
-                has_hindi = any(
-                    0x0900 < ord(c) < 0x097F for c in full_text
-                )
-                has_english = any(
-                    c.isascii() and c.isalpha() for c in full_text
-                )
-                if has_hindi and has_english:
-                    lang = "hinglish"
-                elif has_hindi:
-                    lang = "hi"
-                else:
-                    lang = "en"
-
-                is_on_topic = not any(
-                    m in full_text.lower()
-                    for m in ["outside my area", "bahar hai", "mere area se bahar", "i can only"]
-                )
-
-                # Send agent text to browser for transcript (cleaned)
+                # Send agent text to browser for transcript (cleaned).
+                # Audio for it has already been queued sentence by sentence.
                 await self.send_json({
                     "event": "agent_text",
                     "text": full_text.strip(),
-                    "language": lang,
-                    "is_on_topic": is_on_topic,
+                    "language": detect_response_language(full_text),
+                    "is_on_topic": is_on_topic_response(full_text),
                 })
 
-                # Queue TTS for the entire (cleaned) response
-                await self._tts_queue.put(full_text)
-
             # Signal end-of-text to TTS worker (sentinel)
             await self._tts_queue.put(None)
 
         # ---- Response lifecycle ----
         elif event_type == "response.created":
-            safe_print("[VOICE] OpenAI response generation started")
+            self.log.debug("OpenAI response started")
+            if self._faq_reply_pending:
+                # Turn already answered (maybe already played) by the FAQ fast path
+                self._faq_reply_pending = False
+                response_id = event.get("response", {}).get("id")
+                if response_id:
+                    self._ignored_responses.add(response_id)
+                await self._send_to_openai({"type": "response.cancel"})
+                return
+            self._reset_response_text()
+            self._discard_response = False
+            self._response_streaming = True
+            # Typed messages / auto-responses have no speech_stopped: time from here
+            if self._turn is None or self._turn.finished:
+                self._turn = TurnTimer("response_created")
+            self._response_turn = self._turn
+            if self._faq_answered_turn is self._turn:
+                # Turn already answered by the FAQ fast path
+                self._discard_response = True
+                await self._send_to_openai({"type": "response.cancel"})
 
         elif event_type == "response.done":
-            safe_print("[VOICE] OpenAI response done")
+            self.log.debug("OpenAI response done")
+            response_id = event.get("response", {}).get("id")
+            if response_id in self._ignored_responses:
+                self._ignored_responses.discard(response_id)
+                return
+            self._response_streaming = False
 
         # ---- Errors ----
         elif event_type == "error":
             error_data = event.get("error", {})
+            if error_data.get("code") == "response_cancel_not_active":
+                # Barge-in raced with the end of the response — harmless
+                return
             error_msg = error_data.get("message", "Unknown error")
-            safe_print(f"[VOICE] OpenAI Realtime error: {error_msg}")
-            logger.error(
-                f"[{self.session_id}] OpenAI Realtime error: {error_data}"
-            )
+            self.log.error("OpenAI Realtime error: %s", error_data)
             await self.send_json({
                 "event": "error",
                 "message": f"AI error: {error_msg}",
             })
 
+    async def _pump_segmenter(self, final: bool = False):
+        """Feed unsegmented response text to the segmenter and queue sentences.
+
+        Text stays held back until real user speech is confirmed, so
+        noise-triggered replies are never spoken (see response.text.done).
+        """
+        if not self._got_first_user_speech or self._discard_response:
+            return
+
+        pending = self._full_response_text[self._segmented_upto:]
+        self._segmented_upto = len(self._full_response_text)
+
+        sentences = self._segmenter.feed(pending)
+        if final:
+            sentences += self._segmenter.flush()
+
+        for sentence in sentences:
+            if self._response_turn:
+                self._response_turn.mark("first_sentence")
+            await self._tts_queue.put((sentence, self._response_turn))
+
+    def _reset_response_text(self):
+        """Forget the text of the current response (new response / barge-in)."""
+        self._full_response_text = ""
+        self._segmented_upto = 0
+        self._segmenter.reset()
+
+    async def _answer_from_faq(self, match: IntentMatch) -> bool:
+        """FAQ fast path: speak the canned answer instead of the model's reply.
+
+        Only taken while nothing of the model's reply is audible yet;
+        returns False (the model's reply stands) otherwise. The answer text
+        is the same string warm_tts_cache() renders, so its audio is cached.
+        """
+        if self.is_speaking or self._tts_response_open:
+            return False
+
+        turn = self._turn
+        self._faq_answered_turn = turn
+        self._faq_answers += 1
+        answer = match.intent.answer
+        self.log.info("FAQ fast path: %s (confidence %.2f)", match.intent.id, match.confidence)
+
+        # Drop the model's reply to this turn, wherever it has got to. If it
+        # hasn't started yet, response.created cancels it when it arrives.
+        if self._response_streaming:
+            self._discard_response = True
+            await self._send_to_openai({"type": "response.cancel"})
+        elif self._response_turn is not turn or turn is None:
+            self._faq_reply_pending = True
+        self._reset_response_text()
+        while not self._tts_queue.empty():
+            try:
+                self._tts_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        self._tts_generation += 1
+        self._discard_tts_prefetches()
+
+        if turn:
+            turn.mark("first_sentence")
+        self._response_turn = turn
+        await self._tts_queue.put((answer, turn))
+        await self._tts_queue.put(None)
+
+        # Keep the model's conversation history in step with what was said
+        await self._send_to_openai({
+            "type": "conversation.item.create",
+            "item": {
+                "type": "message",
+                "role": "assistant",
+                "content": [{"type": "text", "text": answer}],
+            },
+        })
+        await self.send_json({
+            "event": "agent_text",
+            "text": answer,
+            "language": detect_response_language(answer),
+            "is_on_topic": True,
+            "matched_faq": match.intent.id,
+        })
+        return True
+
+    async def _interrupt_response(self):
+        """Barge-in: stop TTS and drop everything left of the current response."""
+        self._interrupted = True
+        self.is_speaking = False
+        self._tts_response_open = False
+
+        for turn in (self._played_turn, self._response_turn):
+            if turn:
+                spans = turn.finish(interrupted=True)
+                if spans is not None:
+                    self._turn_spans.append({**spans, "interrupted": True})
+
+        # Deltas still arriving for this response must not reach TTS
+        if self._response_streaming:
+            self._discard_response = True
+            await self._send_to_openai({"type": "response.cancel"})
+        self._reset_response_text()
+
+        # Drain the TTS queue so worker doesn't play stale text
+        while not self._tts_queue.empty():
+            try:
+                self._tts_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+        # Drop ElevenLabs requests already running ahead of playback
+        self._tts_generation += 1
+        self._discard_tts_prefetches()
+        if self._tts_playing is not None:
+            self._tts_playing.close()
+
+        # Tell browser to stop playing audio immediately
+        await self.send_json({"event": "agent_audio_stop"})
+        await self.send_json({"event": "agent_audio_end"})
+
     # ------------------------------------------------------------------
     # TTS Worker
     # ------------------------------------------------------------------
 
     async def _run_tts_worker_loop(self):
         """
-        Continuously runs TTS for each GPT response.
-        Splits text into short sentence chunks for smooth TTS streaming.
+        Continuously turns GPT response text into ElevenLabs requests.
+        Queue items are sentences streamed from the segmenter while the
+        model is still generating; each is split further if too long.
+        Requests are started up to `voice_config.tts_prefetch_depth` chunks
+        ahead of the one playing, so the next sentence's audio is already
+        arriving when the current one ends. Playback order is the queue order.
+        None sentinel = end of response (forwarded to the playback loop).
+        """
+        try:
+            while self.is_active:
+                item = await self._tts_queue.get()
+                if item is None:
+                    await self._tts_playback_queue.put(None)
+                    continue
+                text, turn = item
+
+                generation = self._tts_generation
+
+                # Normalize text (strip Devanagari, fix punctuation, remove timecodes)
+                text = _normalize_text(text)
+
+                # Split into short sentence chunks for smooth TTS
+                chunks = _split_into_tts_chunks(text)
+                self.log.debug("TTS split into %d chunks", len(chunks))
+
+                for i, chunk in enumerate(chunks):
+                    # Wait for a look-ahead slot (freed as chunks finish playing)
+                    await self._tts_slots.acquire()
+                    if not self.is_active or generation != self._tts_generation:
+                        self._tts_slots.release()
+                        self.log.debug("TTS chunk %d skipped (interrupted)", i + 1)
+                        break
+                    self.log.debug("TTS chunk %d/%d: %.60s", i + 1, len(chunks), chunk)
+                    if turn:
+                        turn.mark("tts_request")
+                    await self._tts_playback_queue.put(
+                        self._start_tts_prefetch(chunk, generation, self._tts_slots, turn)
+                    )
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.log.error("TTS worker error: %s", e)
+            self.is_speaking = False
+
+    async def _run_tts_playback_loop(self):
+        """
+        Plays prefetched TTS chunks to the browser in order.
         None sentinel = end of response.
         Respects _interrupted flag for barge-in.
         """
         try:
             while self.is_active:
-                text = await self._tts_queue.get()
-                if text is None:
+                job = await self._tts_playback_queue.get()
+                if job is None:
                     # End of a response — signal browser
                     if not self._interrupted:
                         await self.send_json({"event": "agent_audio_end"})
+                        if self._played_turn:
+                            spans = self._played_turn.finish()
+                            if spans is not None:
+                                self._turn_spans.append(spans)
+                    self._played_turn = None
                     self.is_speaking = False
                     self._interrupted = False
+                    self._tts_response_open = False
                     await self.send_json({
                         "event": "agent_state",
                         "state": "listening",
                     })
                     continue  # Wait for next response
 
-                # Reset interrupt flag for new response
-                self._interrupted = False
-
-                # Human-like pause before responding (500ms — warm, unhurried feel)
-                await asyncio.sleep(0.5)
-
-                # Check if interrupted during the pause
-                if self._interrupted:
-                    safe_print("[VOICE] TTS skipped (interrupted during pause)")
-                    continue
-
-                # Set speaking state
-                await self.send_json({
-                    "event": "agent_state",
-                    "state": "speaking",
-                })
-
-                # Normalize text (strip Devanagari, fix punctuation, remove timecodes)
-                text = _normalize_text(text)
+                try:
+                    if job.generation != self._tts_generation:
+                        # Queued before a barge-in
+                        continue
+
+                    if not self._tts_response_open:
+                        # First chunk of a new response
+                        self._tts_response_open = True
+                        self._interrupted = False
+
+                        # Human-like pause before responding (500ms — warm, unhurried feel).
+                        # The first chunk's audio is already being fetched meanwhile.
+                        await asyncio.sleep(0.5)
+
+                        # Check if interrupted during the pause
+                        if self._interrupted:
+                            self.log.debug("TTS skipped (interrupted during pause)")
+                            continue
 
-                # Split into short sentence chunks for smooth TTS
-                chunks = _split_into_tts_chunks(text)
-                safe_print(f"[VOICE] TTS split into {len(chunks)} chunks")
+                        # Set speaking state
+                        await self.send_json({
+                            "event": "agent_state",
+                            "state": "speaking",
+                        })
+                    elif self._interrupted:
+                        continue
 
-                for i, chunk in enumerate(chunks):
-                    if not self.is_active or self._interrupted:
-                        safe_print(f"[VOICE] TTS chunk {i+1} skipped (interrupted)")
-                        break
-                    safe_print(f"[VOICE] TTS chunk {i+1}/{len(chunks)}: {chunk[:60]}...")
-                    await self.generate_and_send_tts(chunk)
+                    self._tts_playing = job
+                    self._played_turn = job.turn or self._played_turn
+                    await self._play_tts_prefetch(job)
+                finally:
+                    self._tts_playing = None
+                    job.close()
 
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            logger.error(f"[{self.session_id}] TTS worker error: {e}")
+            self.log.error("TTS playback error: %s", e)
             self.is_speaking = False
 
+    def _discard_tts_prefetches(self):
+        """Cancel every queued prefetch (barge-in / session end)."""
+        while not self._tts_playback_queue.empty():
+            try:
+                job = self._tts_playback_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if job is not None:
+                job.close()
+
     # ------------------------------------------------------------------
     # Send Audio to OpenAI Realtime
     # ------------------------------------------------------------------
 
     async def send_audio_to_openai(self, audio_data: bytes):
-        """Base64-encode PCM audio and ALWAYS send to OpenAI Realtime API.
+        """Resample PCM audio and ALWAYS send it to OpenAI Realtime API.
+
+        Audio goes through the session's AudioCoalescer, which sends one
+        input_audio_buffer.append per REALTIME_AUDIO_FRAME_MS of audio.
 
         We always forward audio so OpenAI VAD can detect user speech
         even while agent is speaking (enables barge-in).
         """
         if self.openai_ws and not self.openai_ws.closed:
             try:
-                audio_b64 = base64.b64encode(audio_data).decode("ascii")
-                await self._send_to_openai({
-                    "type": "input_audio_buffer.append",
-                    "audio": audio_b64,
-                })
+                if self._resampler is not None:
+                    audio_data = self._resampler.process(audio_data)
+                    if not audio_data:
+                        return
+                await self._audio_coalescer.push(audio_data)
             except Exception as e:
-                logger.error(
-                    f"[{self.session_id}] Send audio to OpenAI failed: {e}"
-                )
+                self.log.error("Send audio to OpenAI failed: %s", e)
+
+    async def _send_raw_to_openai(self, message: str):
+        """Send an already-serialized JSON event to the OpenAI Realtime WebSocket."""
+        if self.openai_ws and not self.openai_ws.closed:
+            try:
+                await self.openai_ws.send_str(message)
+            except Exception as e:
+                self.log.error("OpenAI WS send failed: %s", e)
 
     async def _send_to_openai(self, data: dict):
         """Send a JSON event to the OpenAI Realtime API WebSocket."""
@@ -663,9 +1163,7 @@ class VoiceAgentSession:
             try:
                 await self.openai_ws.send_json(data)
             except Exception as e:
-                logger.error(
-                    f"[{self.session_id}] OpenAI WS send failed: {e}"
-                )
+                self.log.error("OpenAI WS send failed: %s", e)
 
     # ------------------------------------------------------------------
     # ElevenLabs TTS — streams raw PCM16 audio to browser
@@ -675,137 +1173,228 @@ class VoiceAgentSession:
     async def generate_and_send_tts(self, text: str):
         """Generate TTS audio via ElevenLabs (PCM16 format) and stream to browser.
 
-        Called per sentence chunk. Does NOT send agent_audio_end
-        (the TTS worker sends that after all sentences are done).
+        Used for one-off speech (welcome message) outside the TTS pipeline.
+        Does NOT send agent_audio_end (the caller sends that when done).
 
         PCM FORMAT:
         - Output: pcm_24000 (24kHz, 16-bit signed LE, mono)
         - No codec overhead — raw samples streamed directly
         - Browser decodes via AudioContext at 24kHz
-        - Streams 16KB chunks for smooth low-latency playback
+        - Bytes are relayed as they arrive from ElevenLabs (see _relay_pcm_stream)
         """
         if not settings.ELEVENLABS_API_KEY or not text.strip():
             return
 
-        self.is_speaking = True
-        kb = get_knowledge_base_config()
-        voice_config = kb.get("voice_config", {})
-        voice_id = voice_config.get("voice_id", "NXsB2Ew7UyH5JDkfI3LF")
-        model_id = voice_config.get("model_id", "eleven_turbo_v2_5")
-
+        job = self._start_tts_prefetch(text, self._tts_generation)
         try:
-            # PCM output: 24kHz 16-bit signed little-endian mono
-            output_format = voice_config.get("output_format", "pcm_24000")
-            optimize_latency = voice_config.get(
-                "optimize_streaming_latency", 4
-            )
-
-            async with aiohttp.ClientSession() as session:
-                url = (
-                    f"https://api.elevenlabs.io/v1/text-to-speech/"
-                    f"{voice_id}/stream"
-                    f"?optimize_streaming_latency={optimize_latency}"
-                    f"&output_format={output_format}"
-                )
+            await self._play_tts_prefetch(job)
+        finally:
+            job.close()
+
+    def _start_tts_prefetch(
+        self,
+        text: str,
+        generation: int,
+        slots: Optional[asyncio.Semaphore] = None,
+        turn: Optional[TurnTimer] = None,
+    ) -> _TTSPrefetch:
+        """Start the ElevenLabs request for `text` in the background."""
+        job = _TTSPrefetch(text, generation, slots, turn)
+        job.task = asyncio.create_task(self._fetch_tts_audio(text, job.audio, turn))
+        return job
+
+    async def _fetch_tts_audio(
+        self,
+        text: str,
+        audio: asyncio.Queue,
+        turn: Optional[TurnTimer] = None,
+    ):
+        """Stream ElevenLabs PCM for `text` into `audio`, then a None terminator.
+
+        Cached audio (see services/tts_cache.py) is replayed without a network
+        call; fresh audio is cached in memory once fully received, and on disk
+        when the same phrase is rendered again.
+
+        Chunks are cut on 2-byte sample boundaries; an odd trailing byte is
+        carried over to the next chunk so samples are never split. When
+        `audio` is full (playback hasn't reached this chunk yet) reading
+        pauses and ElevenLabs is held back by TCP backpressure.
+        """
+        cancelled = False
+        try:
+            if not settings.ELEVENLABS_API_KEY or not text.strip():
+                return
+
+            kb = get_knowledge_base_config()
+            voice_config = kb.get("voice_config", {})
+            url, headers, payload = _elevenlabs_tts_request(text, voice_config)
+
+            cache = get_tts_cache()
+            cache_key = tts_cache_key(url, payload) if cache else None
+            cached = await cache.lookup(cache_key) if cache else None
+            if cached is not None:
+                self.log.debug("TTS cache hit: text_len=%d, bytes=%d", len(text), len(cached))
+                if turn:
+                    turn.mark("tts_first_byte")
+                try:
+                    for start in range(0, len(cached), _PCM_RELAY_CHUNK_BYTES):
+                        await audio.put(cached[start:start + _PCM_RELAY_CHUNK_BYTES])
+                finally:
+                    if not isinstance(cached, bytes):
+                        cached.close()
+                return
+
+            self.log.debug("ElevenLabs TTS request: model=%s, text_len=%d", payload["model_id"], len(text))
+
+            async with get_http_session().post(
+                url,
+                headers=headers,
+                json=payload,
+                timeout=_elevenlabs_tts_timeout(),
+            ) as resp:
+                if resp.status != 200:
+                    err_text = await resp.text()
+                    self.log.error("ElevenLabs TTS error: %s - %.300s", resp.status, err_text)
+                    return
 
-                headers = {
-                    "xi-api-key": settings.ELEVENLABS_API_KEY,
-                    "Content-Type": "application/json",
-                    "Accept": "audio/pcm, */*",
-                }
-
-                # Speed: 0.95 = natural pace, not slow
-                speed = voice_config.get("speed", 0.95)
-
-                payload = {
-                    "text": text,
-                    "model_id": model_id,
-                    "voice_settings": {
-                        "stability": voice_config.get("stability", 0.40),
-                        "similarity_boost": voice_config.get("similarity_boost", 0.85),
-                        "style": voice_config.get("style", 0.35),
-                        "use_speaker_boost": voice_config.get("use_speaker_boost", True),
-                        "speed": speed,
-                    },
-                }
-
-                safe_print(f"[VOICE] ElevenLabs TTS request: model={model_id}, voice={voice_id}, format={output_format}, text_len={len(text)}")
-
-                async with session.post(url, headers=headers, json=payload) as resp:
-                    if resp.status != 200:
-                        err_text = await resp.text()
-                        safe_print(f"[VOICE] [FAIL] ElevenLabs TTS error: {resp.status} - {err_text[:300]}")
-                        logger.error(
-                            f"[{self.session_id}] ElevenLabs TTS error: {resp.status} - {err_text}"
-                        )
-                        return
+                carry = b""
+                rendered = bytearray()
+                async for chunk in resp.content.iter_chunked(_PCM_RELAY_CHUNK_BYTES):
+                    data = carry + chunk if carry else chunk
+                    aligned = len(data) - (len(data) % 2)
+                    carry = data[aligned:]
+                    if aligned:
+                        if turn and not rendered:
+                            turn.mark("tts_first_byte")
+                        await audio.put(data[:aligned])
+                        rendered += data[:aligned]
+
+                if not rendered:
+                    self.log.error("ElevenLabs returned empty audio for text=%r", text)
+                elif cache:
+                    await cache.store(cache_key, bytes(rendered))
 
-                    # Read full PCM audio bytes in memory (one sentence only)
-                    audio_bytes = await resp.read()
-                    if not audio_bytes:
-                        logger.error(f"[{self.session_id}] ElevenLabs returned empty audio for text={text!r}")
-                        return
+        except asyncio.CancelledError:
+            # Discarded (barge-in / session end) — nobody is waiting for the audio
+            cancelled = True
+            raise
+        except Exception as e:
+            self.log.exception("TTS generation error: %s", e)
+        finally:
+            if not cancelled:
+                await audio.put(None)
 
-                    # Stream PCM in 16KB chunks (PCM has no frame boundaries, any split is safe)
-                    CHUNK_SIZE = 16384  # 16 KB — small for low latency
-                    buffer = io.BytesIO(audio_bytes)
+    async def _play_tts_prefetch(self, job: _TTSPrefetch):
+        """Relay one prefetched chunk to the browser, framed by chunk events."""
+        self.is_speaking = True
 
-                    await self.send_json({"event": "agent_audio_chunk_start", "text_preview": text[:80]})
+        first = await job.audio.get()
+        if first is None:
+            # Request failed or returned no audio (already logged)
+            return
 
-                    while True:
-                        chunk = buffer.read(CHUNK_SIZE)
-                        if not chunk or not self.is_active:
-                            break
-                        try:
-                            # Send raw PCM16 bytes to websocket
-                            await self.websocket.send_bytes(chunk)
-                        except Exception as e:
-                            logger.error(f"[{self.session_id}] Error sending PCM chunk to websocket: {e}")
-                            break
+        await self.send_json({"event": "agent_audio_chunk_start", "text_preview": job.text[:80]})
+        await self._relay_pcm_stream(first, job.audio, job.turn)
+        await self.send_json({"event": "agent_audio_chunk_end", "text_preview": job.text[:80]})
+        # No pause here: the browser queues chunks back to back, so the next
+        # sentence is sent while this one is still playing
+
+    async def _relay_pcm_stream(
+        self,
+        first: bytes,
+        audio: asyncio.Queue,
+        turn: Optional[TurnTimer] = None,
+    ) -> int:
+        """Forward PCM16 bytes to the browser as they arrive from ElevenLabs.
+
+        - `first` is the chunk already taken off `audio`; the rest follows
+          until the None terminator
+        - Each send is awaited, so a slow browser socket stops us draining
+          the prefetch buffer (and, behind it, ElevenLabs) instead of
+          buffering the sentence here
+        - A send that stalls longer than _BROWSER_SEND_TIMEOUT aborts the sentence
+        - Stops immediately on barge-in or session end
+
+        Returns the number of bytes sent.
+        """
+        sent = 0
+        chunk = first
 
-                        # Pacing: small delay between chunks
-                        await asyncio.sleep(0.01)
+        while chunk is not None:
+            if not self.is_active or self._interrupted:
+                break
 
-                    await self.send_json({"event": "agent_audio_chunk_end", "text_preview": text[:80]})
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_bytes(chunk),
+                    timeout=_BROWSER_SEND_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                self.log.error("Browser socket stalled, aborting TTS sentence")
+                break
+            except Exception as e:
+                self.log.error("Error sending PCM chunk to websocket: %s", e)
+                break
+            if turn and not sent:
+                turn.mark("first_audio_sent")
+            sent += len(chunk)
+
+            # Browser plays chunks back to back: advance its playback clock
+            now = asyncio.get_running_loop().time()
+            self._playback_until = (
+                max(self._playback_until, now + _CLIENT_PLAYBACK_LEAD)
+                + len(chunk) / _PCM_BYTES_PER_SECOND
+            )
 
-                    # Natural pause after each sentence (350ms — warm, breathing room)
-                    await asyncio.sleep(0.35)
+            chunk = await audio.get()
 
-        except Exception as e:
-            logger.exception(f"[{self.session_id}] TTS generation error: {e}")
-        finally:
-            pass
+        return sent
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    def session_summary(self) -> dict:
+        """Per-turn latency medians, barge-ins and mic audio stats for this call."""
+        summary = summarize_turns(self._turn_spans)
+        summary["kb_version"] = self.kb_version
+        summary["faq_fast_path_answers"] = self._faq_answers
+        summary["barge_ins"] = len(self._barge_in_ms)
+        if self._barge_in_ms:
+            summary["barge_in_reaction_max_ms"] = round(max(self._barge_in_ms), 1)
+        summary["mic_audio"] = self._audio_coalescer.stats()
+        return summary
+
     async def send_json(self, data: dict):
         """Send JSON message to browser WebSocket."""
         try:
             if self.is_active:
                 await self.websocket.send_json(data)
         except Exception as e:
-            logger.error(f"[{self.session_id}] Send to browser failed: {e}")
+            self.log.error("Send to browser failed: %s", e)
 
     async def cleanup(self):
         """Clean up resources when call ends."""
         self.is_active = False
 
-        # Close OpenAI Realtime WebSocket
-        if self.openai_ws and not self.openai_ws.closed:
+        self._audio_coalescer.discard()
+        summary = self.session_summary()
+        self.log.info("Session summary: %s", summary, extra={"summary": summary})
+
+        # A connect still in progress must not leave a socket behind
+        if self._connect_task and not self._connect_task.done():
+            self._connect_task.cancel()
             try:
-                await self.openai_ws.close()
-            except Exception:
+                await self._connect_task
+            except (asyncio.CancelledError, Exception):
                 pass
 
-        # Close aiohttp session
-        if self._aiohttp_session:
+        # Close OpenAI Realtime WebSocket
+        if self.openai_ws and not self.openai_ws.closed:
             try:
-                await self._aiohttp_session.close()
+                await self.openai_ws.close()
             except Exception:
                 pass
-            self._aiohttp_session = None
 
         # Cancel listener task
         if self._openai_listener_task:
@@ -815,15 +1404,17 @@ class VoiceAgentSession:
             except asyncio.CancelledError:
                 pass
 
-        # Cancel TTS worker
-        if self._tts_worker_task:
-            self._tts_worker_task.cancel()
-            try:
-                await self._tts_worker_task
-            except asyncio.CancelledError:
-                pass
+        # Cancel TTS worker and playback, then any requests still in flight
+        for task in (self._tts_worker_task, self._tts_playback_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._discard_tts_prefetches()
 
-        logger.info(f"[{self.session_id}] Voice agent session cleaned up")
+        self.log.info("Voice agent session cleaned up")
 
 
 # ========================================================================
@@ -840,18 +1431,18 @@ async def voice_agent_websocket_handler(
     Connection: ws://host:8000/ws/voice-agent?token=JWT
 
     Protocol:
-    - Browser sends binary audio chunks (Linear16 PCM, 16kHz, mono)
-    - Browser sends JSON control messages: {"event": "start"/"stop"}
+    - Browser sends binary audio chunks (Linear16 PCM, mono, at the
+      `sample_rate` given in the start event — default 16kHz); they are
+      resampled to 24kHz for the Realtime API
+    - Browser sends JSON control messages: {"event": "start", "language", "sample_rate"} / {"event": "stop"}
     - Server sends JSON events: transcript, agent_text, agent_state, error
     - Server sends binary audio chunks (PCM16 24kHz mono) for TTS playback
     """
     await websocket.accept()
 
     session = None
-    safe_print("[VOICE] =======================================")
-    safe_print("[VOICE] WebSocket CONNECTED - Voice Agent (GPT-4o Realtime)")
-    safe_print(f"[VOICE] Token present: {bool(token)}")
-    logger.info("Voice agent WebSocket connected")
+    start_task = None
+    logger.info("Voice agent WebSocket connected", extra={"token_present": bool(token)})
 
     try:
         # Wait for start event
@@ -865,43 +1456,28 @@ async def voice_agent_websocket_handler(
 
                     if event == "start":
                         language = msg.get("language", "hinglish")
-                        safe_print(
-                            f"[VOICE] Received 'start' event, language={language}"
+                        try:
+                            sample_rate = int(msg.get("sample_rate") or _DEFAULT_MIC_RATE)
+                        except (TypeError, ValueError):
+                            sample_rate = _DEFAULT_MIC_RATE
+                        if not 8000 <= sample_rate <= 48000:
+                            sample_rate = _DEFAULT_MIC_RATE
+                        session = VoiceAgentSession(websocket, language, sample_rate)
+                        session.log.info(
+                            "Session started: language=%s, sample_rate=%d", language, sample_rate
                         )
-                        session = VoiceAgentSession(websocket, language)
-
-                        # Connect to OpenAI Realtime API
-                        safe_print("[VOICE] Connecting to OpenAI Realtime API...")
-                        connected = await session.connect_openai_realtime()
-                        if not connected:
-                            safe_print(
-                                "[VOICE] [FAIL] OpenAI Realtime connection "
-                                "failed - sending error to client"
-                            )
-                            await websocket.send_json({
-                                "event": "error",
-                                "message": (
-                                    "Could not connect to voice AI service"
-                                ),
-                            })
-                            continue
 
                         # Send session info
-                        safe_print(
-                            f"[VOICE] [OK] Session started: "
-                            f"{session.session_id}"
-                        )
                         await websocket.send_json({
                             "event": "session_started",
                             "session_id": session.session_id,
                         })
 
-                        # Send welcome message with TTS
-                        safe_print("[VOICE] Sending welcome message + TTS...")
-                        await session.start()
-                        safe_print(
-                            "[VOICE] Welcome message sent. "
-                            "Entering main loop."
+                        # Connect to OpenAI Realtime + welcome TTS run in the
+                        # background so the main loop can measure mic echo
+                        # while the welcome plays (adaptive mic gate)
+                        start_task = asyncio.create_task(
+                            _start_session(session)
                         )
                         break
 
@@ -925,6 +1501,8 @@ async def voice_agent_websocket_handler(
                 # Only forward after welcome message is done to prevent
                 # ambient noise triggering a duplicate greeting
                 if not session._ready_for_audio:
+                    if raw["bytes"]:
+                        session.observe_gated_audio(raw["bytes"])
                     continue
                 audio_data = raw["bytes"]
                 if audio_data and len(audio_data) > 0:
@@ -973,7 +1551,125 @@ async def voice_agent_websocket_handler(
     except WebSocketDisconnect:
         logger.info("Voice agent WebSocket disconnected")
     except Exception as e:
-        logger.error(f"Voice agent WebSocket error: {e}")
+        logger.error("Voice agent WebSocket error: %s", e)
     finally:
+        if start_task and not start_task.done():
+            start_task.cancel()
+            try:
+                await start_task
+            except asyncio.CancelledError:
+                pass
         if session:
             await session.cleanup()
+
+
+async def _start_session(session: VoiceAgentSession):
+    """Run session.start(); on Realtime connect failure, report and end the call."""
+    try:
+        started = await session.start()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        session.log.error("Session start error: %s", e)
+        started = False
+
+    if started:
+        return
+
+    await session.send_json({
+        "event": "error",
+        "message": (
+            "Could not connect to voice AI service"
+        ),
+    })
+    session.is_active = False
+
+
+# ========================================================================
+# TTS cache warm-up
+# ========================================================================
+
+# Concurrent ElevenLabs renders during warm-up (keeps live calls unaffected)
+_TTS_WARMUP_CONCURRENCY = 3
+
+
+def _tts_warmup_texts(kb: dict) -> list[str]:
+    """Phrases spoken verbatim on many calls, split exactly as the TTS worker would."""
+    texts = []
+
+    welcome = _normalize_text(kb.get("welcome_message", ""))
+    if welcome:
+        texts.append(_welcome_speech_text(welcome))
+
+    canned = []
+    for o in kb.get("objection_handling", []):
+        canned += [o.get("response_en", ""), o.get("response_hi", "")]
+    for f in kb.get("faqs", []):
+        canned.append(f.get("answer", ""))
+
+    for answer in canned:
+        texts.extend(_split_into_tts_chunks(_normalize_text(answer)))
+
+    # Preserve order (welcome first), drop duplicates
+    return list(dict.fromkeys(t for t in texts if t.strip()))
+
+
+async def warm_tts_cache():
+    """Pre-render the welcome message and canned KB answers into the TTS cache.
+
+    Run at startup and after KB edits. Entries already on disk are only
+    promoted to memory, so this costs ElevenLabs characters once per
+    distinct phrase / voice configuration.
+    """
+    cache = get_tts_cache()
+    if cache is None or not settings.ELEVENLABS_API_KEY:
+        return
+
+    kb = get_knowledge_base_config()
+    voice_config = kb.get("voice_config", {})
+    semaphore = asyncio.Semaphore(_TTS_WARMUP_CONCURRENCY)
+    rendered = 0
+
+    async def render(text: str):
+        nonlocal rendered
+        url, headers, payload = _elevenlabs_tts_request(text, voice_config)
+        key = tts_cache_key(url, payload)
+        if await cache.promote(key):
+            return
+        async with semaphore:
+            try:
+                async with get_http_session().post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=_elevenlabs_tts_timeout(),
+                ) as resp:
+                    if resp.status != 200:
+                        logger.warning("TTS warm-up failed (%s) for text=%.60r", resp.status, text)
+                        return
+                    pcm = await resp.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning("TTS warm-up failed for text=%.60r: %s", text, e)
+                return
+        pcm = pcm[:len(pcm) - (len(pcm) % 2)]
+        if pcm:
+            await cache.store(key, pcm, persist=True)
+            rendered += 1
+
+    texts = _tts_warmup_texts(kb)
+    await asyncio.gather(*(render(t) for t in texts))
+    logger.info("TTS cache warm-up done: %d phrases, %d newly rendered", len(texts), rendered)
+
+
+# ========================================================================
+# Metrics
+# ========================================================================
+
+def voice_agent_metrics() -> dict:
+    """Process-wide voice pipeline metrics (latency histograms, pool, TTS cache)."""
+    cache = get_tts_cache()
+    return {
+        "latency": latency_snapshot(),
+        "realtime_pool": _realtime_pool.stats() if _realtime_pool else None,
+        "tts_cache": cache.stats() if cache else None,
+    }
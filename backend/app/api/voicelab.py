@@ -15,11 +15,13 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Q
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from pydantic import BaseModel
-import requests as http_requests
+import asyncio
+import aiohttp
 import json
 
 from ..core.database import get_db
 from ..core.config import settings
+from ..core.http_client import get_http_session
 from ..models.user import User
 from .auth import get_current_user
 
@@ -41,6 +43,34 @@ def _get_headers():
     }
 
 
+async def _elevenlabs_request(
+    method: str,
+    path: str,
+    error_prefix: str,
+    timeout: float = 15,
+    **kwargs,
+):
+    """Call the ElevenLabs REST API on the shared HTTP pool.
+
+    Returns (status, body): parsed JSON for 2xx responses, raw text otherwise.
+    Connection failures are raised as 502 with the given error prefix.
+    """
+    try:
+        async with get_http_session().request(
+            method,
+            f"{ELEVENLABS_BASE}{path}",
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            **kwargs,
+        ) as r:
+            if 200 <= r.status < 300:
+                body = await r.json(content_type=None) if r.status != 204 else None
+            else:
+                body = await r.text()
+            return r.status, body
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise HTTPException(status_code=502, detail=f"{error_prefix}: {e}")
+
+
 # ============================================================================
 # Pydantic models
 # ============================================================================
@@ -65,22 +95,19 @@ class TTSPreviewRequest(BaseModel):
 # ============================================================================
 
 @router.get("/voices")
-def list_voices(
+async def list_voices(
     search: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
 ):
     """List all available voices from ElevenLabs."""
     headers = _get_headers()
 
-    try:
-        r = http_requests.get(f"{ELEVENLABS_BASE}/voices", headers=headers, timeout=15)
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Failed to connect to ElevenLabs: {e}")
-
-    if r.status_code != 200:
-        raise HTTPException(status_code=r.status_code, detail=f"ElevenLabs error: {r.text}")
+    status, data = await _elevenlabs_request(
+        "GET", "/voices", "Failed to connect to ElevenLabs", headers=headers,
+    )
+    if status != 200:
+        raise HTTPException(status_code=status, detail=f"ElevenLabs error: {data}")
 
-    data = r.json()
     voices = data.get("voices", [])
 
     # Simplify the voice data
@@ -122,22 +149,19 @@ def list_voices(
 
 
 @router.get("/voices/{voice_id}")
-def get_voice(
+async def get_voice(
     voice_id: str,
     current_user: User = Depends(get_current_user),
 ):
     """Get detailed info about a specific voice."""
     headers = _get_headers()
 
-    try:
-        r = http_requests.get(f"{ELEVENLABS_BASE}/voices/{voice_id}", headers=headers, timeout=15)
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Failed to connect to ElevenLabs: {e}")
-
-    if r.status_code != 200:
-        raise HTTPException(status_code=r.status_code, detail=f"ElevenLabs error: {r.text}")
+    status, v = await _elevenlabs_request(
+        "GET", f"/voices/{voice_id}", "Failed to connect to ElevenLabs", headers=headers,
+    )
+    if status != 200:
+        raise HTTPException(status_code=status, detail=f"ElevenLabs error: {v}")
 
-    v = r.json()
     return {
         "voice_id": v.get("voice_id"),
         "name": v.get("name", ""),
@@ -173,30 +197,28 @@ async def clone_voice(
     # Read the uploaded file
     file_content = await file.read()
 
-    files = {
-        "files": (file.filename, file_content, file.content_type or "audio/mpeg"),
-    }
-    form_data = {
-        "name": name,
-        "description": description,
-        "labels": json.dumps({"language": language}),
-    }
+    form_data = aiohttp.FormData()
+    form_data.add_field("name", name)
+    form_data.add_field("description", description)
+    form_data.add_field("labels", json.dumps({"language": language}))
+    form_data.add_field(
+        "files",
+        file_content,
+        filename=file.filename,
+        content_type=file.content_type or "audio/mpeg",
+    )
+
+    status, data = await _elevenlabs_request(
+        "POST",
+        "/voices/add",
+        "Failed to clone voice",
+        timeout=60,
+        headers={"xi-api-key": settings.ELEVENLABS_API_KEY},
+        data=form_data,
+    )
+    if status not in (200, 201):
+        raise HTTPException(status_code=status, detail=f"ElevenLabs clone error: {data}")
 
-    try:
-        r = http_requests.post(
-            f"{ELEVENLABS_BASE}/voices/add",
-            headers={"xi-api-key": settings.ELEVENLABS_API_KEY},
-            data=form_data,
-            files=files,
-            timeout=60,
-        )
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Failed to clone voice: {e}")
-
-    if r.status_code not in (200, 201):
-        raise HTTPException(status_code=r.status_code, detail=f"ElevenLabs clone error: {r.text}")
-
-    data = r.json()
     return {
         "message": f"Voice '{name}' cloned successfully",
         "voice_id": data.get("voice_id"),
@@ -205,7 +227,7 @@ async def clone_voice(
 
 
 @router.post("/voices/import")
-def import_voice(
+async def import_voice(
     data: VoiceImportRequest,
     current_user: User = Depends(get_current_user),
 ):
@@ -213,21 +235,14 @@ def import_voice(
     headers = _get_headers()
 
     # Verify the voice exists
-    try:
-        r = http_requests.get(
-            f"{ELEVENLABS_BASE}/voices/{data.voice_id}",
-            headers=headers,
-            timeout=15,
-        )
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Failed to verify voice: {e}")
-
-    if r.status_code == 404:
+    status, v = await _elevenlabs_request(
+        "GET", f"/voices/{data.voice_id}", "Failed to verify voice", headers=headers,
+    )
+    if status == 404:
         raise HTTPException(status_code=404, detail=f"Voice ID '{data.voice_id}' not found on ElevenLabs")
-    if r.status_code != 200:
-        raise HTTPException(status_code=r.status_code, detail=f"ElevenLabs error: {r.text}")
+    if status != 200:
+        raise HTTPException(status_code=status, detail=f"ElevenLabs error: {v}")
 
-    v = r.json()
     return {
         "message": f"Voice '{v.get('name', '')}' imported successfully",
         "voice_id": v.get("voice_id"),
@@ -238,40 +253,35 @@ def import_voice(
 
 
 @router.delete("/voices/{voice_id}")
-def delete_voice(
+async def delete_voice(
     voice_id: str,
     current_user: User = Depends(get_current_user),
 ):
     """Delete a cloned voice from ElevenLabs."""
     headers = _get_headers()
 
-    try:
-        r = http_requests.delete(f"{ELEVENLABS_BASE}/voices/{voice_id}", headers=headers, timeout=15)
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Failed to delete voice: {e}")
-
-    if r.status_code not in (200, 204):
-        raise HTTPException(status_code=r.status_code, detail=f"ElevenLabs error: {r.text}")
+    status, body = await _elevenlabs_request(
+        "DELETE", f"/voices/{voice_id}", "Failed to delete voice", headers=headers,
+    )
+    if status not in (200, 204):
+        raise HTTPException(status_code=status, detail=f"ElevenLabs error: {body}")
 
     return {"message": "Voice deleted successfully", "voice_id": voice_id}
 
 
 @router.get("/models")
-def list_models(
+async def list_models(
     current_user: User = Depends(get_current_user),
 ):
     """List available ElevenLabs TTS models."""
     headers = _get_headers()
 
-    try:
-        r = http_requests.get(f"{ELEVENLABS_BASE}/models", headers=headers, timeout=15)
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Failed to fetch models: {e}")
-
-    if r.status_code != 200:
-        raise HTTPException(status_code=r.status_code, detail=f"ElevenLabs error: {r.text}")
+    status, models = await _elevenlabs_request(
+        "GET", "/models", "Failed to fetch models", headers=headers,
+    )
+    if status != 200:
+        raise HTTPException(status_code=status, detail=f"ElevenLabs error: {models}")
 
-    models = r.json()
     result = []
     for m in models:
         result.append({
@@ -290,21 +300,18 @@ def list_models(
 
 
 @router.get("/subscription")
-def get_subscription(
+async def get_subscription(
     current_user: User = Depends(get_current_user),
 ):
     """Get ElevenLabs subscription/usage info."""
     headers = _get_headers()
 
-    try:
-        r = http_requests.get(f"{ELEVENLABS_BASE}/user/subscription", headers=headers, timeout=15)
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Failed to fetch subscription: {e}")
-
-    if r.status_code != 200:
-        raise HTTPException(status_code=r.status_code, detail=f"ElevenLabs error: {r.text}")
+    status, data = await _elevenlabs_request(
+        "GET", "/user/subscription", "Failed to fetch subscription", headers=headers,
+    )
+    if status != 200:
+        raise HTTPException(status_code=status, detail=f"ElevenLabs error: {data}")
 
-    data = r.json()
     return {
         "tier": data.get("tier", ""),
         "character_count": data.get("character_count", 0),
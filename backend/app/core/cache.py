@@ -0,0 +1,58 @@
+"""
+Short-lived in-process result cache for hot read endpoints.
+
+Dashboards auto-refresh for every logged-in manager, so the same
+aggregate query used to run once per client every few seconds. A
+TTLCache entry is computed once and shared until it expires:
+
+- Concurrent callers asking for the same missing key wait for the first
+  caller's result instead of all querying at once (single flight)
+- Values are per worker process; they may be up to `ttl` seconds stale
+- Endpoints are sync (FastAPI runs them in its threadpool), so this uses
+  threading locks
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values: Dict[Hashable, Tuple[float, Any]] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key: Hashable):
+        entry = self._values.get(key)
+        if entry and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value for `key`, calling `compute` at most once per expiry across threads."""
+        with self._lock:
+            hit, value = self._fresh(key)
+            if hit:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have filled it while we waited
+            with self._lock:
+                hit, value = self._fresh(key)
+            if hit:
+                return value
+
+            value = compute()
+            with self._lock:
+                now = time.monotonic()
+                for stale in [k for k, (expires, _) in self._values.items() if expires <= now]:
+                    del self._values[stale]
+                self._values[key] = (now + self.ttl, value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
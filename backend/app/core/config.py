@@ -10,10 +10,28 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
 
+    # Logging (written by a background thread; see core/logging_config.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    # Fraction of voice sessions that log per-event DEBUG detail (0.0-1.0)
+    VOICE_LOG_SAMPLE_RATE: float = 0.1
+
     # Database - Default to SQLite for easy testing, can be overridden with MySQL
     DATABASE_URL: str = "sqlite:///./aria_crm.db"
     DB_POOL_SIZE: int = 10
     DB_MAX_OVERFLOW: int = 40
+    # Calendar days ("today", date filters) are days in TIMEZONE; DB_TIMEZONE
+    # is the zone naive DATETIME columns are written in (see core/date_ranges.py)
+    TIMEZONE: str = "Asia/Kolkata"
+    DB_TIMEZONE: str = "Asia/Kolkata"
+    # List endpoints reuse their total row count for this many seconds
+    PAGINATION_COUNT_TTL: float = 30.0
+    # Dashboard metrics are computed once and shared for this many seconds
+    DASHBOARD_CACHE_TTL: float = 5.0
+    # Analytics rollups: recompute the most recent days from call_logs every
+    # interval seconds (0 disables; see services/call_rollups.py)
+    ROLLUP_COMPACTION_INTERVAL: float = 900.0
+    ROLLUP_COMPACTION_DAYS: int = 2
 
     # MySQL settings (optional - set these in .env to use MySQL instead of SQLite)
     MYSQL_HOST: str = "localhost"
@@ -25,6 +43,10 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Knowledge base edits are announced to other workers over this pub/sub
+    KB_PUBSUB_BACKEND: str = "memory"  # "memory" (single worker) or "redis"
+    KB_PUBSUB_CHANNEL: str = "aria:kb_changes"
+
     # JWT
     SECRET_KEY: str = "your-super-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
@@ -49,6 +71,17 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str = ""
     OPENAI_REALTIME_MODEL: str = "gpt-4o-realtime-preview"
+    # Chat completions (KB chat, agent chat / AI edit) share one async client
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = 16
+    OPENAI_QUEUE_TIMEOUT: float = 10.0  # seconds to wait for a free slot before 503
+    OPENAI_REQUEST_TIMEOUT: float = 90.0
+    OPENAI_MAX_RETRIES: int = 2
+    # KB entries (FAQs / custom data / objections) sent with each chat message
+    KB_RETRIEVAL_TOP_K: int = 8
+    KB_RETRIEVAL_TOKEN_BUDGET: int = 1500  # estimated tokens
+    # FAQ fast path: answer close matches to an FAQ (question / aliases) without the LLM
+    INTENT_FAST_PATH_ENABLED: bool = True
+    INTENT_MATCH_THRESHOLD: float = 0.85  # 0-1 token overlap
 
     # ElevenLabs TTS
     ELEVENLABS_API_KEY: str = ""
@@ -65,6 +98,38 @@ class Settings(BaseSettings):
     DEFAULT_MAX_ATTEMPTS: int = 3
     DEFAULT_RETRY_INTERVAL_HOURS: int = 4
 
+    # Outbound dialer (services/dialer.py): "disabled", "fake" (simulated
+    # calls) or "smartflo". Enable it in one process only.
+    DIALER_BACKEND: str = "disabled"
+    DIALER_POLL_INTERVAL: float = 15.0  # seconds between campaign / lead refills
+    DIALER_QUEUE_DEPTH: int = 50  # leads queued per campaign
+    DIALER_MAX_CONCURRENT_PER_CAMPAIGN: int = 20
+    DIALER_CAMPAIGN_DIAL_INTERVAL: float = 0.5  # min seconds between call starts per campaign
+    DIALER_CALL_TIMEOUT: float = 1800.0  # give up waiting for call.ended
+    SMARTFLO_DIALER_AGENT_NUMBER: str = ""  # agent / AI endpoint bridged to the lead
+    SMARTFLO_DIALER_CALLER_ID: str = ""
+
+    # Shared outbound HTTP pool (ElevenLabs, OpenAI, Voice Lab)
+    HTTP_POOL_LIMIT_PER_HOST: int = 0  # 0 = 2x MAX_CONCURRENT_CALLS
+    HTTP_KEEPALIVE_TIMEOUT: int = 30
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP_READ_TIMEOUT: float = 30.0
+
+    # TTS audio cache (welcome message, canned answers, repeated phrases)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_DIR: str = "./tts_cache"
+    TTS_CACHE_MEMORY_MB: int = 64
+    TTS_CACHE_DISK_MB: int = 1024
+
+    # Pre-warmed OpenAI Realtime connections claimed by new voice calls
+    REALTIME_POOL_SIZE: int = 2  # per language; 0 disables the pool
+    REALTIME_POOL_IDLE_TTL: int = 300  # seconds before an unclaimed connection is recycled
+    REALTIME_POOL_REFRESH_ON_KB_CHANGE: bool = True
+    REALTIME_POOL_LANGUAGES: list = ["hinglish"]
+    # Mic audio is sent to Realtime in appends of this many ms (40-100)
+    REALTIME_AUDIO_FRAME_MS: int = 60
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,77 @@
+"""
+Index-friendly date filters.
+
+`func.date(CallLog.created_at) == today` wraps the column in a function,
+so the database can't use an index on created_at and scans the whole
+table. These helpers turn calendar days into half-open timestamp ranges
+instead:
+
+    created_at >= '2026-01-25 00:00:00' AND created_at < '2026-01-26 00:00:00'
+
+- Days are calendar days in settings.TIMEZONE (IST), whatever timezone
+  the server runs in
+- Bounds are naive datetimes in settings.DB_TIMEZONE, the timezone the
+  DATETIME columns are written in (NOW() / datetime.now())
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_
+
+from .config import settings
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def local_today() -> date:
+    """Today's date in the business timezone."""
+    return datetime.now(_zone(settings.TIMEZONE)).date()
+
+
+def local_now() -> datetime:
+    """Naive current time in the business timezone."""
+    return datetime.now(_zone(settings.TIMEZONE)).replace(tzinfo=None)
+
+
+def db_now() -> datetime:
+    """Naive current time in the timezone DATETIME columns are written in."""
+    return datetime.now(_zone(settings.DB_TIMEZONE)).replace(tzinfo=None)
+
+
+def to_local(ts: datetime) -> datetime:
+    """Naive DB-timezone timestamp as a naive business-timezone timestamp."""
+    aware = ts.replace(tzinfo=_zone(settings.DB_TIMEZONE))
+    return aware.astimezone(_zone(settings.TIMEZONE)).replace(tzinfo=None)
+
+
+def day_start(day: date) -> datetime:
+    """Naive DB-timezone timestamp of midnight at the start of `day` (business timezone)."""
+    local_midnight = datetime.combine(day, time.min, tzinfo=_zone(settings.TIMEZONE))
+    return local_midnight.astimezone(_zone(settings.DB_TIMEZONE)).replace(tzinfo=None)
+
+
+def day_bounds(start: date, end: Optional[date] = None) -> Tuple[datetime, datetime]:
+    """[start of `start`, start of the day after `end`) as DB timestamps. `end` defaults to `start`."""
+    return day_start(start), day_start((end or start) + timedelta(days=1))
+
+
+def on_days(column, start: date, end: Optional[date] = None):
+    """`column` falls on the days start..end (inclusive)."""
+    lower, upper = day_bounds(start, end)
+    return and_(column >= lower, column < upper)
+
+
+def since_day(column, start: date):
+    """`column` falls on or after day `start`."""
+    return column >= day_start(start)
+
+
+def until_day(column, end: date):
+    """`column` falls on or before day `end`."""
+    return column < day_start(end + timedelta(days=1))
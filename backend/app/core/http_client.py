@@ -0,0 +1,137 @@
+"""
+Shared outbound HTTP clients.
+
+One aiohttp ClientSession (ElevenLabs TTS, OpenAI Realtime WebSockets,
+Voice Lab) and one OpenAI SDK client live for the whole application, so
+every voice session reuses warm keep-alive connections instead of paying a
+TCP + TLS handshake per sentence. Both are created in the FastAPI lifespan
+(see main.py) and sized from MAX_CONCURRENT_CALLS.
+
+The OpenAI client is the async SDK client: chat completions run on the
+event loop without blocking live voice WebSockets, and openai_slot() caps
+how many run at once so a burst of dashboard chat tests can't exhaust the
+pool the voice agent depends on.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import aiohttp
+import httpx
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_http_session: Optional[aiohttp.ClientSession] = None
+_openai_client = None
+_openai_slots: Optional[asyncio.Semaphore] = None
+
+
+class OpenAIBusy(Exception):
+    """No OpenAI request slot freed up within OPENAI_QUEUE_TIMEOUT."""
+
+
+def _per_host_limit() -> int:
+    """Connections allowed per upstream host.
+
+    Each live call holds one OpenAI Realtime WebSocket and streams one
+    ElevenLabs request at a time, so 2x the call limit leaves headroom for
+    dashboard traffic on the same worker.
+    """
+    return settings.HTTP_POOL_LIMIT_PER_HOST or settings.MAX_CONCURRENT_CALLS * 2
+
+
+def _create_http_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=_per_host_limit() * 2,
+        limit_per_host=_per_host_limit(),
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        # No session-wide read timeout: the same pool carries long-lived
+        # Realtime WebSockets. Streaming requests pass their own sock_read.
+        timeout=aiohttp.ClientTimeout(
+            total=None,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+        ),
+    )
+
+
+async def init_http_clients():
+    """Create the shared clients. Called once at application startup."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = _create_http_session()
+        logger.info(
+            f"Shared HTTP pool ready (per-host limit={_per_host_limit()}, "
+            f"dns ttl={settings.HTTP_DNS_CACHE_TTL}s)"
+        )
+
+
+async def close_http_clients():
+    """Close the shared clients. Called once at application shutdown."""
+    global _http_session, _openai_client
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session (created lazily outside the app lifespan)."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = _create_http_session()
+    return _http_session
+
+
+def get_openai_client():
+    """Return the shared AsyncOpenAI client with a pooled HTTP transport."""
+    global _openai_client
+    if _openai_client is None:
+        import openai
+
+        _openai_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=_per_host_limit(),
+                    max_keepalive_connections=_per_host_limit(),
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_TIMEOUT,
+                ),
+                timeout=httpx.Timeout(
+                    settings.OPENAI_REQUEST_TIMEOUT,
+                    connect=settings.HTTP_CONNECT_TIMEOUT,
+                ),
+            ),
+        )
+    return _openai_client
+
+
+@asynccontextmanager
+async def openai_slot():
+    """Hold one of OPENAI_MAX_CONCURRENT_REQUESTS slots for a completion call.
+
+    Raises OpenAIBusy if no slot frees up within OPENAI_QUEUE_TIMEOUT.
+    """
+    global _openai_slots
+    if _openai_slots is None:
+        _openai_slots = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENT_REQUESTS)
+    try:
+        await asyncio.wait_for(_openai_slots.acquire(), timeout=settings.OPENAI_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise OpenAIBusy() from None
+    try:
+        yield
+    finally:
+        _openai_slots.release()
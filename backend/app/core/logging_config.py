@@ -0,0 +1,106 @@
+"""
+Non-blocking structured logging.
+
+Handlers on the root logger are replaced by a QueueHandler, so a log call
+on the event loop only formats the record and appends it to an in-memory
+queue. A QueueListener thread does the actual stdout writes, which keeps
+slow terminals / log collectors from stalling every voice session that
+shares the loop.
+
+- LOG_JSON emits one JSON object per line (python-json-logger); `extra`
+  fields such as session_id become top-level keys
+- LOG_LEVEL sets the root level; uvicorn's own loggers are left alone
+- VOICE_LOG_SAMPLE_RATE is read by the voice agent to decide which
+  sessions log their per-event DEBUG detail (see SampledSessionLogger)
+"""
+
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from typing import Optional
+
+from pythonjsonlogger import jsonlogger
+
+from .config import settings
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+_JSON_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+_TEXT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+class _Utf8StreamHandler(logging.StreamHandler):
+    """StreamHandler that won't crash on Windows cp1252 with Hindi/Unicode text."""
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            msg = self.format(record)
+            try:
+                self.stream.write(msg + self.terminator)
+            except UnicodeEncodeError:
+                self.stream.write(
+                    msg.encode("ascii", errors="replace").decode("ascii") + self.terminator
+                )
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+def setup_logging():
+    """Route all application logging through a background writer thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = _Utf8StreamHandler(sys.stdout)
+    if settings.LOG_JSON:
+        handler.setFormatter(jsonlogger.JsonFormatter(_JSON_FORMAT, json_ensure_ascii=False))
+    else:
+        handler.setFormatter(logging.Formatter(_TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class SampledSessionLogger(logging.LoggerAdapter):
+    """Per-session logger that tags records with session_id.
+
+    DEBUG records are only emitted for a VOICE_LOG_SAMPLE_RATE fraction of
+    sessions, so per-event detail (VAD, TTS chunks, transcripts) can stay
+    on in production without logging every call. INFO and above always pass.
+    """
+
+    def __init__(self, logger: logging.Logger, session_id: str, sample_rate: Optional[float] = None):
+        super().__init__(logger, {"session_id": session_id})
+        rate = settings.VOICE_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.sampled = random.random() < rate
+
+    def process(self, msg, kwargs):
+        kwargs["extra"] = {**self.extra, **kwargs.get("extra", {})}
+        if settings.LOG_JSON:
+            return msg, kwargs  # session_id is already a JSON field
+        return f"[{self.extra['session_id']}] {msg}", kwargs
+
+    def isEnabledFor(self, level: int) -> bool:
+        if level < logging.INFO and not self.sampled:
+            return False
+        return self.logger.isEnabledFor(level)
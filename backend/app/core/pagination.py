@@ -0,0 +1,127 @@
+"""
+Keyset (cursor) pagination and cached list totals.
+
+OFFSET pagination makes the database walk and discard every row before
+the page, so deep pages in the lead / call / compliance lists get slower
+the further reps scroll, and each request also ran a full COUNT(*).
+
+- Lists are ordered by (created_at, id) and a page is "rows after the
+  last row of the previous page", which the (created_at) indexes serve
+  directly (InnoDB secondary indexes already end with the primary key)
+- Cursors are opaque URL-safe strings; clients pass back `next_cursor`
+- `page` / `page_size` keep working for existing clients
+- Totals are cached for PAGINATION_COUNT_TTL seconds per distinct query,
+  so they may lag new rows slightly; callers can skip them entirely
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from .config import settings
+
+_COUNT_CACHE_MAX_ENTRIES = 1024
+
+_count_cache: Dict[str, Tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: int, descending: bool = True) -> str:
+    payload = json.dumps(
+        {"t": created_at.isoformat(), "id": row_id, "d": "desc" if descending else "asc"},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, descending: bool = True) -> Tuple[datetime, int]:
+    """(created_at, id) of the last row of the previous page."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload["t"])
+        row_id = int(payload["id"])
+        direction = payload["d"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if direction != ("desc" if descending else "asc"):
+        raise InvalidCursor("Cursor was issued for the opposite sort order")
+    return created_at, row_id
+
+
+def keyset_page(
+    query: Query,
+    created_column,
+    id_column,
+    page_size: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    offset: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """One page of `query` after `cursor`, plus the cursor for the next page.
+
+    `offset` only serves legacy page-number requests (use it without a
+    cursor). The next cursor is None on the last page.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, descending)
+        if descending:
+            query = query.filter(or_(
+                created_column < created_at,
+                and_(created_column == created_at, id_column < row_id),
+            ))
+        else:
+            query = query.filter(or_(
+                created_column > created_at,
+                and_(created_column == created_at, id_column > row_id),
+            ))
+
+    if descending:
+        query = query.order_by(created_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(created_column.asc(), id_column.asc())
+
+    # One extra row tells us whether there is a next page without a COUNT
+    rows = query.offset(offset).limit(page_size + 1).all()
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    next_cursor = encode_cursor(
+        getattr(last, created_column.key), getattr(last, id_column.key), descending
+    )
+    return rows, next_cursor
+
+
+def cached_count(query: Query) -> int:
+    """query.count(), reused for PAGINATION_COUNT_TTL seconds per distinct SQL + params."""
+    statement = query.statement.compile()
+    key = f"{statement}|{sorted(statement.params.items())!r}"
+
+    now = time.monotonic()
+    with _count_cache_lock:
+        entry = _count_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    total = query.count()
+
+    with _count_cache_lock:
+        if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+            for stale in [k for k, (expires, _) in _count_cache.items() if expires <= now]:
+                del _count_cache[stale]
+            if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+                _count_cache.clear()
+        _count_cache[key] = (now + settings.PAGINATION_COUNT_TTL, total)
+    return total
@@ -1,10 +1,21 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from .core.config import settings
 from .core.database import engine, Base, SessionLocal
+from .core.http_client import init_http_clients, close_http_clients
+from .core.logging_config import setup_logging, shutdown_logging
 from .api import api_router
+from .api.auth import get_current_user
+from .api.knowledge_base import start_knowledge_base_store, close_knowledge_base_store
+from .services.call_rollups import start_rollup_compaction, stop_rollup_compaction
+from .services.call_tracking import record_call_ended
+from .services.dialer import dialer_call_ended, start_dialer, stop_dialer
+
+logger = logging.getLogger(__name__)
 
 
 def hash_password(password: str) -> str:
@@ -91,12 +102,33 @@ def seed_initial_data():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create database tables
+    # Startup: Move log writes off the event loop
+    setup_logging()
+    # Create database tables
     Base.metadata.create_all(bind=engine)
     # Seed initial data
     seed_initial_data()
+    # Load the live knowledge base and follow edits from other workers
+    await start_knowledge_base_store()
+    # Shared outbound HTTP pool for ElevenLabs / OpenAI / Voice Lab
+    await init_http_clients()
+    # Pre-render welcome message / canned answers into the TTS cache (background)
+    tts_warmup = asyncio.create_task(warm_tts_cache())
+    # Keep pre-configured OpenAI Realtime connections ready for new calls
+    await start_realtime_pool()
+    # Keep the last days of analytics rollups in sync with call_logs
+    await start_rollup_compaction()
+    # Outbound dialer for active campaigns (DIALER_BACKEND, disabled by default)
+    await start_dialer()
     yield
-    # Shutdown: Cleanup if needed
+    # Shutdown: Close pooled connections
+    await stop_dialer()
+    tts_warmup.cancel()
+    await stop_rollup_compaction()
+    await close_realtime_pool()
+    await close_knowledge_base_store()
+    await close_http_clients()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -281,6 +313,19 @@ async def smartflo_websocket(
                 pass
 
 
+def _record_smartflo_call_ended(call_sid: str, duration: int, disposition: str):
+    """Close the matching call log and refresh its lead's call summary"""
+    db = SessionLocal()
+    try:
+        if record_call_ended(db, call_sid, duration, disposition) is None:
+            logger.info(f"Smartflo call.ended for unknown call {call_sid}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to record Smartflo call.ended for {call_sid}: {e}")
+    finally:
+        db.close()
+
+
 async def process_smartflo_event(message: Dict[str, Any], session_id: str, agent_id: str) -> Dict[str, Any]:
     """Process incoming Smartflo events and generate appropriate responses"""
 
@@ -316,6 +361,12 @@ async def process_smartflo_event(message: Dict[str, Any], session_id: str, agent
         # Call ended - log and cleanup
         duration = call_data.get("duration", 0)
         disposition = call_data.get("disposition", "completed")
+        call_sid = call_data.get("call_id")
+        if call_sid:
+            await asyncio.to_thread(_record_smartflo_call_ended, call_sid, duration, disposition)
+        # Let the dialer know if it placed this call
+        for dialer_id in {call_sid, call_data.get("custom_identifier")} - {None}:
+            dialer_call_ended(str(dialer_id), duration, disposition)
 
         return {
             "event": "call.summary",
@@ -502,7 +553,13 @@ async def smartflo_sessions():
 # Browser Mic -> WebSocket -> Deepgram STT -> GPT-4 KB Chat -> ElevenLabs TTS -> Audio Playback
 # Connection: ws://YOUR_SERVER_IP:8000/ws/voice-agent?token=JWT_TOKEN
 
-from .api.voice_agent import voice_agent_websocket_handler
+from .api.voice_agent import (
+    voice_agent_websocket_handler,
+    warm_tts_cache,
+    start_realtime_pool,
+    close_realtime_pool,
+    voice_agent_metrics,
+)
 
 @app.websocket("/ws/voice-agent")
 async def voice_agent_ws(websocket: WebSocket):
@@ -522,6 +579,16 @@ async def voice_agent_ws(websocket: WebSocket):
     await voice_agent_websocket_handler(websocket, token)
 
 
+# REST endpoint for voice pipeline latency metrics
+@app.get("/api/v1/voice-agent/metrics", dependencies=[Depends(get_current_user)])
+async def voice_agent_metrics_endpoint():
+    """Per-stage latency histograms (ms), Realtime pool and TTS cache stats"""
+    return {
+        **voice_agent_metrics(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
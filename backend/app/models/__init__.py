@@ -8,6 +8,8 @@ from .lead_stage import LeadStage
 from .lead_status import LeadStatus
 from .platform import Platform
 from .agent import Agent
+from .knowledge_base import KnowledgeBaseSnapshot
+from .call_rollup import CallDailyStat, CallHourlyStat
 
 __all__ = [
     "Lead",
@@ -20,4 +22,7 @@ __all__ = [
     "LeadStatus",
     "Platform",
     "Agent",
+    "KnowledgeBaseSnapshot",
+    "CallDailyStat",
+    "CallHourlyStat",
 ]
@@ -50,6 +50,8 @@ class CallLog(Base):
     __table_args__ = (
         Index("idx_lead_history", "lead_id", "created_at"),
         Index("idx_campaign_stats", "campaign_id", "classification"),
+        Index("idx_call_created", "created_at", "id"),
+        Index("idx_campaign_created", "campaign_id", "created_at"),
     )
 
     def __repr__(self):
@@ -0,0 +1,54 @@
+from sqlalchemy import Column, Integer, String, Date, BigInteger, Index, UniqueConstraint
+from ..core.database import Base
+
+
+class CallDailyStat(Base):
+    """Call counts per business day x campaign x status x classification.
+
+    Maintained from call writes by services/call_rollups.py. Key columns are
+    NOT NULL so the unique key works: campaign_id 0 means "no campaign",
+    "" means no status / classification.
+    """
+    __tablename__ = "call_daily_stats"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    campaign_id = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="")
+    classification = Column(String(10), nullable=False, default="")
+
+    calls = Column(Integer, nullable=False, default=0)
+    duration_total = Column(BigInteger, nullable=False, default=0)  # seconds
+    duration_calls = Column(Integer, nullable=False, default=0)  # calls with a duration
+
+    __table_args__ = (
+        UniqueConstraint("day", "campaign_id", "status", "classification", name="uq_call_daily_bucket"),
+        Index("idx_daily_campaign", "campaign_id", "day"),
+    )
+
+    def __repr__(self):
+        return f"<CallDailyStat(day={self.day}, campaign_id={self.campaign_id}, calls={self.calls})>"
+
+
+class CallHourlyStat(Base):
+    """Calls per business day x start hour / weekday, for the best-calling-times heatmap.
+
+    `day` is the day the call was logged (created_at), so date filters match
+    the daily table; `day_of_week` (0 = Sunday) and `hour` come from started_at.
+    """
+    __tablename__ = "call_hourly_stats"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    day_of_week = Column(Integer, nullable=False)
+    hour = Column(Integer, nullable=False)
+
+    calls = Column(Integer, nullable=False, default=0)
+    converted = Column(Integer, nullable=False, default=0)  # warm or hot
+
+    __table_args__ = (
+        UniqueConstraint("day", "day_of_week", "hour", name="uq_call_hourly_bucket"),
+    )
+
+    def __repr__(self):
+        return f"<CallHourlyStat(day={self.day}, hour={self.hour}, calls={self.calls})>"
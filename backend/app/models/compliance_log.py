@@ -30,6 +30,7 @@ class ComplianceLog(Base):
     __table_args__ = (
         Index("idx_event_type", "event_type", "created_at"),
         Index("idx_lead_compliance", "lead_id"),
+        Index("idx_compliance_created", "created_at", "id"),
     )
 
     def __repr__(self):
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, DateTime, JSON, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class KnowledgeBaseSnapshot(Base):
+    """One immutable version of the sales agent knowledge base.
+
+    Every edit inserts a new row; the highest version is the live KB.
+    """
+    __tablename__ = "knowledge_base_snapshots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    version = Column(Integer, nullable=False, unique=True)
+    data = Column(JSON, nullable=False)
+
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+    # Relationships
+    creator = relationship("User", foreign_keys=[created_by])
+
+    def __repr__(self):
+        return f"<KnowledgeBaseSnapshot(version={self.version})>"
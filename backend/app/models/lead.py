@@ -5,6 +5,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from ..core.database import Base
+from .call_log import Classification
 
 
 class InterestStatus(str, enum.Enum):
@@ -39,6 +40,12 @@ class Lead(Base):
     )
     other = Column(JSON, nullable=True, default={})
 
+    # Call summary, denormalized from call_logs (services/call_tracking.py)
+    callCount = Column(Integer, nullable=False, default=0, server_default="0")
+    lastCallAt = Column(DateTime, nullable=True)
+    callClassification = Column(Enum(Classification), nullable=True)
+    lastHotCallAt = Column(DateTime, nullable=True)
+
     # Relationships
     platform = relationship("Platform", back_populates="leads")
     assigned_user = relationship("User", back_populates="assigned_leads")
@@ -52,6 +59,9 @@ class Lead(Base):
         Index("idx_campaign_query", "leadStageId", "city", "interestStatus", "tracker"),
         Index("idx_assignment", "assignedTo", "leadStatusId"),
         Index("idx_platform", "platformId", "createdAt"),
+        Index("idx_call_classification", "callClassification", "lastCallAt"),
+        Index("idx_hot_queue", "lastHotCallAt"),
+        Index("idx_lead_created", "createdAt", "id"),
     )
 
     def __repr__(self):
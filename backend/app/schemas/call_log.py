@@ -69,9 +69,10 @@ class CallLogResponse(BaseModel):
 
 class CallLogListResponse(BaseModel):
     calls: List[CallLogResponse]
-    total: int
+    total: Optional[int] = None  # omitted when include_total=false
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class LiveCallResponse(BaseModel):
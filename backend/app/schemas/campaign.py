@@ -19,6 +19,7 @@ class CampaignFilters(BaseModel):
     interestStatus: Optional[str] = None
     maxTracker: Optional[int] = 3
     plotIds: Optional[List[int]] = None
+    classifications: Optional[List[str]] = None  # lead's call classification
 
 
 class CampaignBase(BaseModel):
@@ -35,9 +35,10 @@ class ComplianceLogResponse(BaseModel):
 
 class ComplianceLogListResponse(BaseModel):
     logs: List[ComplianceLogResponse]
-    total: int
+    total: Optional[int] = None  # omitted when include_total=false
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class ComplianceStatus(BaseModel):
@@ -70,7 +70,8 @@ class LeadResponse(LeadBase):
 
 class LeadListResponse(BaseModel):
     leads: List[LeadResponse]
-    total: int
+    total: Optional[int] = None  # omitted when include_total=false
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Coalesces mic PCM into fixed-duration `input_audio_buffer.append` messages.
+
+Every append costs a base64 encode, a JSON message and a WebSocket frame
+on the event loop. Clients that send small frames (20 ms telephony
+frames, small ScriptProcessor buffers) would otherwise produce one append
+per frame, which at 100 concurrent calls dominates event-loop CPU. Large
+client chunks (the browser's 4096-sample ScriptProcessor, ~256 ms) are
+cut down to the same frame size, so OpenAI's VAD sees audio at a steady
+cadence whatever the client sends.
+
+- Incoming PCM is copied into a preallocated per-session bytearray
+- Every complete `frame_ms` frame goes out as its own append; a partial
+  frame is flushed by a timer after `frame_ms` so latency stays bounded
+  when the mic goes quiet
+- The append message is built as a string around the base64 payload
+  (no json.dumps scan over the audio)
+- frames_in / messages_out counters give the coalescing ratio and rates
+"""
+
+import asyncio
+import base64
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_APPEND_SUFFIX = '"}'
+
+
+class AudioCoalescer:
+    """Per-session PCM16 buffer that sends `frame_ms` appends."""
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        sample_rate: int = 24000,
+        frame_ms: int = 60,
+    ):
+        self._send = send
+        self.frame_ms = frame_ms
+        self.frame_bytes = max(2, sample_rate * 2 * frame_ms // 1000)
+        # Room for a few frames; grows if a client sends larger chunks
+        self._buf = bytearray(self.frame_bytes * 4)
+        self._len = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_flush: Optional[asyncio.Task] = None
+
+        self.frames_in = 0
+        self.messages_out = 0
+        self.bytes_out = 0
+        self._started = time.monotonic()
+
+    async def push(self, pcm: bytes):
+        """Buffer one chunk and send every complete frame."""
+        if not pcm:
+            return
+        self.frames_in += 1
+
+        end = self._len + len(pcm)
+        if end > len(self._buf):
+            self._buf.extend(bytes(max(len(self._buf), end - len(self._buf))))
+        self._buf[self._len:end] = pcm
+        self._len = end
+
+        if self._len >= self.frame_bytes:
+            await self._send_frames()
+        if self._len and self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.frame_ms / 1000, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        if self._len and self._timer_flush is None:
+            self._timer_flush = asyncio.create_task(self.flush())
+            self._timer_flush.add_done_callback(self._timer_flush_done)
+
+    def _timer_flush_done(self, task: asyncio.Task):
+        self._timer_flush = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Mic audio flush failed: {task.exception()}")
+
+    async def _send_frames(self):
+        """Send each complete frame as one append; keep the partial remainder."""
+        frames = self._len // self.frame_bytes
+        view = memoryview(self._buf)
+        messages = [
+            _APPEND_PREFIX
+            + base64.b64encode(view[i * self.frame_bytes:(i + 1) * self.frame_bytes]).decode("ascii")
+            + _APPEND_SUFFIX
+            for i in range(frames)
+        ]
+        sent = frames * self.frame_bytes
+        # Move the remainder to the front before awaiting the sends
+        view.release()
+        self._buf[:self._len - sent] = self._buf[sent:self._len]
+        self._len -= sent
+        self.bytes_out += sent
+        for message in messages:
+            self.messages_out += 1
+            await self._send(message)
+
+    async def flush(self):
+        """Send everything buffered (a partial frame included) as one append."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._len:
+            return
+
+        # Encode straight from the buffer, then release it before awaiting the send
+        audio_b64 = base64.b64encode(memoryview(self._buf)[:self._len]).decode("ascii")
+        self.bytes_out += self._len
+        self._len = 0
+        self.messages_out += 1
+        await self._send(_APPEND_PREFIX + audio_b64 + _APPEND_SUFFIX)
+
+    def discard(self):
+        """Drop buffered audio (input buffer cleared / session ending)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._timer_flush is not None:
+            self._timer_flush.cancel()
+            self._timer_flush = None
+        self._len = 0
+
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        return {
+            "frames_in": self.frames_in,
+            "messages_out": self.messages_out,
+            "frames_in_per_sec": round(self.frames_in / elapsed, 2),
+            "messages_out_per_sec": round(self.messages_out / elapsed, 2),
+            "bytes_out": self.bytes_out,
+        }
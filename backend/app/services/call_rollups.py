@@ -0,0 +1,218 @@
+"""
+Pre-aggregated call rollups for analytics.
+
+Trend, breakdown, heatmap and campaign analytics used to scan raw
+call_logs for up to 90 days. They now read two small tables instead
+(models/call_rollup.py), so a 90-day trend reads ~90 x buckets rows no
+matter how many calls were made:
+
+- call_daily_stats: per business day x campaign x status x classification
+- call_hourly_stats: per business day x start weekday x start hour
+
+Rollups are maintained incrementally: callers take snapshot_call() before
+changing an existing call, then apply_call_change() moves the call's
+contribution from its old buckets to its new ones in the caller's
+transaction (call_tracking.track_call_write does both).
+
+rebuild_call_rollups() recomputes whole days from call_logs. The
+compaction loop runs it over the last ROLLUP_COMPACTION_DAYS days every
+ROLLUP_COMPACTION_INTERVAL seconds, which repairs drift from direct SQL
+edits and drops emptied buckets; rebuild_call_rollups.py backfills history.
+A rebuild locks the day's bucket rows (SELECT ... FOR UPDATE) before it
+counts, so an incremental write either commits before the count or waits
+and lands on top of the rebuilt rows; writers lock buckets in the same
+order (daily before hourly) so the two can't deadlock.
+"""
+
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.date_ranges import local_today, on_days, to_local
+from ..models import CallLog
+from ..models.call_rollup import CallDailyStat, CallHourlyStat
+
+logger = logging.getLogger(__name__)
+
+_TRACKED_FIELDS = ("lead_id", "created_at", "started_at", "campaign_id", "status", "classification", "duration")
+_CONVERTED = ("warm", "hot")
+
+# (model, key columns) -> counter deltas
+_Buckets = Dict[Tuple[Any, Tuple[Tuple[str, Any], ...]], Counter]
+
+_compaction_task: Optional[asyncio.Task] = None
+
+
+def _plain(value) -> Any:
+    """Enum members as their value ("hot"), so buckets compare with strings."""
+    return getattr(value, "value", value)
+
+
+def snapshot_call(call: CallLog) -> Dict[str, Any]:
+    """The fields rollups depend on, as they are now. Take it before editing a call."""
+    return {name: _plain(getattr(call, name)) for name in _TRACKED_FIELDS}
+
+
+def _buckets(snapshot: Optional[Dict[str, Any]]) -> _Buckets:
+    """The rollup rows one call counts towards, with its contribution to each."""
+    buckets: _Buckets = {}
+    if not snapshot or snapshot["created_at"] is None:
+        return buckets
+
+    day = to_local(snapshot["created_at"]).date()
+    classification = snapshot["classification"] or ""
+    duration = snapshot["duration"]
+
+    daily_key = (
+        ("day", day),
+        ("campaign_id", snapshot["campaign_id"] or 0),
+        ("status", snapshot["status"] or ""),
+        ("classification", classification),
+    )
+    buckets[(CallDailyStat, daily_key)] = Counter(
+        calls=1,
+        duration_total=duration or 0,
+        duration_calls=1 if duration is not None else 0,
+    )
+
+    if snapshot["started_at"] is not None:
+        started = to_local(snapshot["started_at"])
+        hourly_key = (
+            ("day", day),
+            ("day_of_week", started.isoweekday() % 7),  # 0 = Sunday
+            ("hour", started.hour),
+        )
+        buckets[(CallHourlyStat, hourly_key)] = Counter(
+            calls=1,
+            converted=1 if classification in _CONVERTED else 0,
+        )
+    return buckets
+
+
+def _add_to_bucket(db: Session, model, key: Dict[str, Any], delta: Dict[str, int]):
+    query = db.query(model).filter_by(**key)
+    increment = {getattr(model, column): getattr(model, column) + amount for column, amount in delta.items()}
+    if query.update(increment, synchronize_session=False):
+        return
+    if all(amount <= 0 for amount in delta.values()):
+        # Removing from a bucket that was never backfilled; compaction fixes it
+        return
+    try:
+        with db.begin_nested():
+            db.add(model(**key, **delta))
+    except IntegrityError:
+        # Another writer created the bucket first
+        query.update(increment, synchronize_session=False)
+
+
+def apply_call_change(db: Session, before: Optional[Dict[str, Any]], call: Optional[CallLog]):
+    """Move a call's rollup contribution from `before` to its current state.
+
+    `before` is None for a new call; `call` is None for a deleted one.
+    Pending changes are flushed first; the caller commits.
+    """
+    db.flush()
+    old = _buckets(before)
+    new = _buckets(snapshot_call(call) if call is not None else None)
+
+    # Fixed lock order (daily before hourly, then by key), matching rebuild_call_rollups
+    for bucket in sorted(old.keys() | new.keys(), key=lambda b: (b[0].__tablename__, b[1])):
+        delta = Counter(new.get(bucket, Counter()))
+        delta.subtract(old.get(bucket, Counter()))
+        delta = {column: amount for column, amount in delta.items() if amount}
+        if delta:
+            model, key = bucket
+            _add_to_bucket(db, model, dict(key), delta)
+
+
+# ---------------------------------------------------------------------------
+# Rebuild / compaction
+# ---------------------------------------------------------------------------
+
+def rebuild_call_rollups(db: Session, start: date, end: date) -> int:
+    """Recompute the rollups of days start..end (inclusive) from call_logs. Returns calls counted."""
+    counted = 0
+    day = start
+    while day <= end:
+        try:
+            # Hold off incremental writes to this day until the rebuild commits
+            db.query(CallDailyStat.id).filter(CallDailyStat.day == day).with_for_update().all()
+            db.query(CallHourlyStat.id).filter(CallHourlyStat.day == day).with_for_update().all()
+
+            totals: Dict[Tuple[Any, Tuple], Counter] = defaultdict(Counter)
+            calls = db.query(*(getattr(CallLog, name) for name in _TRACKED_FIELDS)).filter(
+                on_days(CallLog.created_at, day)
+            )
+            for row in calls:
+                snapshot = {name: _plain(value) for name, value in zip(_TRACKED_FIELDS, row)}
+                for bucket, contribution in _buckets(snapshot).items():
+                    totals[bucket].update(contribution)
+                counted += 1
+
+            db.query(CallDailyStat).filter(CallDailyStat.day == day).delete(synchronize_session=False)
+            db.query(CallHourlyStat).filter(CallHourlyStat.day == day).delete(synchronize_session=False)
+            for (model, key), values in totals.items():
+                db.add(model(**dict(key), **values))
+            db.commit()
+        except IntegrityError:
+            # Another worker rebuilt the same day concurrently; its result stands
+            db.rollback()
+            logger.warning(f"Skipped rollup rebuild for {day}: rebuilt concurrently")
+        except OperationalError as e:
+            # Lock wait timeout / deadlock victim; the next compaction retries
+            db.rollback()
+            logger.warning(f"Skipped rollup rebuild for {day}: {e.orig}")
+
+        day += timedelta(days=1)
+    return counted
+
+
+def rebuild_all_call_rollups(db: Session) -> int:
+    """Backfill rollups for every day that has calls."""
+    first = db.query(func.min(CallLog.created_at)).scalar()
+    if first is None:
+        return 0
+    return rebuild_call_rollups(db, to_local(first).date(), local_today())
+
+
+def _compact_recent_rollups():
+    today = local_today()
+    db = SessionLocal()
+    try:
+        rebuild_call_rollups(db, today - timedelta(days=settings.ROLLUP_COMPACTION_DAYS - 1), today)
+    finally:
+        db.close()
+
+
+async def _compaction_loop():
+    while True:
+        try:
+            await asyncio.to_thread(_compact_recent_rollups)
+        except Exception as e:
+            logger.error(f"Call rollup compaction failed: {e}")
+        await asyncio.sleep(settings.ROLLUP_COMPACTION_INTERVAL)
+
+
+async def start_rollup_compaction():
+    global _compaction_task
+    if _compaction_task is None and settings.ROLLUP_COMPACTION_INTERVAL > 0:
+        _compaction_task = asyncio.create_task(_compaction_loop())
+
+
+async def stop_rollup_compaction():
+    global _compaction_task
+    if _compaction_task is not None:
+        _compaction_task.cancel()
+        try:
+            await _compaction_task
+        except asyncio.CancelledError:
+            pass
+        _compaction_task = None
@@ -0,0 +1,165 @@
+"""
+Denormalized per-lead call summary.
+
+Lead views used to aggregate call_logs for every lead they showed. The
+summary now lives on the lead row itself (Lead.callCount, lastCallAt,
+callClassification, lastHotCallAt), so lead lists, the hot-lead queue and
+campaign filters on call history are plain indexed lookups.
+
+- Every code path that writes a CallLog calls track_call_write() before
+  it commits, so the summary (and the analytics rollups, see
+  call_rollups.py) change in the same transaction as the call. The
+  summary re-aggregates just that lead's calls (idx_lead_history), which
+  also covers updates that change a call's classification or lead
+- rebuild_lead_call_summaries() recomputes every lead from call_logs;
+  run it after bulk imports or direct SQL edits (rebuild_lead_call_stats.py)
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from ..models import CallLog, Lead
+from ..models.call_log import CallStatus, Classification
+from .call_rollups import apply_call_change, snapshot_call
+
+logger = logging.getLogger(__name__)
+
+_REBUILD_BATCH_SIZE = 1000
+
+
+def _summary_columns():
+    # callClassification keeps the aggregate the lead views always showed
+    return (
+        CallLog.lead_id,
+        func.count(CallLog.id).label('count'),
+        func.max(CallLog.created_at).label('last_call'),
+        func.max(CallLog.classification).label('classification'),
+        func.max(
+            case((CallLog.classification == Classification.HOT, CallLog.created_at))
+        ).label('last_hot_call'),
+    )
+
+
+def _summary_values(row) -> Dict[Any, Any]:
+    return {
+        Lead.callCount: row.count if row else 0,
+        Lead.lastCallAt: row.last_call if row else None,
+        Lead.callClassification: row.classification if row else None,
+        Lead.lastHotCallAt: row.last_hot_call if row else None,
+    }
+
+
+def _write_summary(db: Session, lead_id: int, summary: Dict[Any, Any], synchronize_session):
+    # updatedAt is kept: call activity isn't an edit of the lead, and
+    # "recently updated" lists shouldn't reorder on every call
+    db.query(Lead).filter(Lead.id == lead_id).update(
+        {**summary, Lead.updatedAt: Lead.updatedAt},
+        synchronize_session=synchronize_session
+    )
+
+
+def refresh_lead_call_summary(db: Session, lead_ids: Iterable[int]):
+    """Recompute the call summary of the given leads inside the caller's transaction.
+
+    Pending CallLog changes are flushed first; the caller commits. Lead
+    objects loaded in `db` see the new values; updatedAt is left unchanged.
+    """
+    lead_ids = {lead_id for lead_id in lead_ids if lead_id is not None}
+    if not lead_ids:
+        return
+
+    db.flush()
+    rows = {
+        row.lead_id: row
+        for row in db.query(*_summary_columns())
+        .filter(CallLog.lead_id.in_(lead_ids))
+        .group_by(CallLog.lead_id)
+    }
+    for lead_id in lead_ids:
+        _write_summary(db, lead_id, _summary_values(rows.get(lead_id)), "fetch")
+
+
+def track_call_write(db: Session, call: CallLog, before: Optional[Dict[str, Any]] = None):
+    """Update everything derived from call_logs after `call` was added or changed.
+
+    For an existing call pass `before=snapshot_call(call)` taken before the
+    edit. Runs in the caller's transaction; the caller commits.
+    """
+    apply_call_change(db, before, call)
+    refresh_lead_call_summary(db, [call.lead_id, before["lead_id"] if before else None])
+
+
+def record_call_ended(
+    db: Session,
+    call_sid: str,
+    duration: Optional[int],
+    disposition: Optional[str] = None
+) -> Optional[CallLog]:
+    """Mark the CallLog with provider call id `call_sid` as ended and commit.
+
+    Returns None when no call with that id was logged.
+    """
+    call = db.query(CallLog).filter(CallLog.call_id == call_sid).first()
+    if not call:
+        return None
+
+    before = snapshot_call(call)
+    try:
+        call.status = CallStatus(disposition or CallStatus.COMPLETED.value)
+    except ValueError:
+        call.status = CallStatus.COMPLETED
+    if duration is not None:
+        call.duration = duration
+    call.ended_at = call.ended_at or datetime.now()
+
+    track_call_write(db, call, before)
+    db.commit()
+    return call
+
+
+def rebuild_lead_call_summaries(db: Session, batch_size: int = _REBUILD_BATCH_SIZE) -> int:
+    """Recompute the call summary of every lead from call_logs. Returns leads changed.
+
+    Leads whose summary is already correct are not written, and updatedAt
+    is preserved, so the rebuild doesn't reorder "recently updated" lists.
+    """
+    last_id = 0
+    changed = 0
+    while True:
+        leads = (
+            db.query(
+                Lead.id, Lead.callCount, Lead.lastCallAt,
+                Lead.callClassification, Lead.lastHotCallAt
+            )
+            .filter(Lead.id > last_id)
+            .order_by(Lead.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not leads:
+            break
+
+        lead_ids = [lead.id for lead in leads]
+        rows = {
+            row.lead_id: row
+            for row in db.query(*_summary_columns())
+            .filter(CallLog.lead_id.in_(lead_ids))
+            .group_by(CallLog.lead_id)
+        }
+        for lead in leads:
+            summary = _summary_values(rows.get(lead.id))
+            current = (lead.callCount, lead.lastCallAt, lead.callClassification, lead.lastHotCallAt)
+            if current == tuple(summary.values()):
+                continue
+            _write_summary(db, lead.id, summary, False)
+            changed += 1
+        db.commit()
+
+        last_id = lead_ids[-1]
+        logger.info(f"Rebuilt call summaries up to lead {last_id} ({changed} changed)")
+
+    return changed
@@ -0,0 +1,667 @@
+"""
+Outbound dialer: places the calls of active campaigns.
+
+Starting a campaign used to only flip its status. The dialer now works
+through every ACTIVE campaign's leads on the event loop:
+
+- Every DIALER_POLL_INTERVAL seconds (and right after a campaign is
+  started / paused) each active campaign's queue is topped up with
+  eligible leads: the campaign's filters (build_lead_query_from_filters),
+  fewer than max_attempts_per_lead calls in this campaign and none of
+  them connected, and no call in the last retry_interval_hours
+- Campaigns are picked from a priority queue ordered by campaign
+  priority (high > medium > low), then by who dialed least recently
+- Limits: MAX_CONCURRENT_CALLS calls overall,
+  DIALER_MAX_CONCURRENT_PER_CAMPAIGN and one call start per
+  DIALER_CAMPAIGN_DIAL_INTERVAL seconds per campaign, the campaign's
+  daily_call_limit, and its calling hours intersected with the global
+  CALLING_HOURS_START / END (business timezone)
+- Each attempt is a CallLog row (via call_tracking, so lead summaries
+  and rollups stay in sync). The lead is claimed with a conditional
+  UPDATE first, so a lead called in the meantime is skipped
+
+Telephony is pluggable (DIALER_BACKEND): FakeTelephony simulates calls
+locally for development and tests, SmartfloTelephony places real calls
+through Smartflo click-to-call. Run the dialer in one process only.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, time as dtime, timedelta
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, func, or_
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.date_ranges import db_now, local_now, local_today, on_days
+from ..models import Campaign, CallLog, Lead
+from ..models.call_log import CallStatus
+from ..models.campaign import CampaignStatus
+from .call_tracking import record_call_ended, track_call_write
+
+logger = logging.getLogger(__name__)
+
+_PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+_CONNECTED = (CallStatus.ANSWERED, CallStatus.COMPLETED)
+
+
+class DialRequest(NamedTuple):
+    call_id: str  # CallLog.call_id of this attempt
+    lead_id: int
+    campaign_id: int
+    phone: str
+
+
+class DialResult(NamedTuple):
+    status: str  # final CallStatus value: completed / no_answer / busy / failed
+    duration: Optional[int] = None  # seconds
+
+
+# ---------------------------------------------------------------------------
+# Telephony backends
+# ---------------------------------------------------------------------------
+
+class TelephonyBackend(ABC):
+    """Places one call and returns once it has ended."""
+
+    @abstractmethod
+    async def dial(self, request: DialRequest) -> DialResult:
+        ...
+
+    def call_ended(self, call_id: str, duration: Optional[int], disposition: Optional[str]):
+        """End-of-call notification from the provider's webhook / WebSocket."""
+
+    async def close(self):
+        pass
+
+
+class FakeTelephony(TelephonyBackend):
+    """Local stand-in for a carrier: rings, then answers or not at random.
+
+    `time_scale` shrinks the simulated ring / talk time (tests use ~0.001).
+    Placed requests are kept in `dialed`.
+    """
+
+    def __init__(
+        self,
+        answer_rate: float = 0.6,
+        busy_rate: float = 0.1,
+        time_scale: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        self.answer_rate = answer_rate
+        self.busy_rate = busy_rate
+        self.time_scale = time_scale
+        self.dialed: List[DialRequest] = []
+        self._random = random.Random(seed)
+
+    async def dial(self, request: DialRequest) -> DialResult:
+        self.dialed.append(request)
+        ring = self._random.uniform(2, 20)
+        roll = self._random.random()
+        if roll < self.answer_rate:
+            talk = self._random.randint(20, 300)
+            await asyncio.sleep((ring + talk) * self.time_scale)
+            return DialResult(CallStatus.COMPLETED.value, talk)
+        await asyncio.sleep(ring * self.time_scale)
+        if roll < self.answer_rate + self.busy_rate:
+            return DialResult(CallStatus.BUSY.value, 0)
+        return DialResult(CallStatus.NO_ANSWER.value, 0)
+
+
+class SmartfloTelephony(TelephonyBackend):
+    """Smartflo click-to-call; the call ends when Smartflo sends call.ended.
+
+    The attempt's call_id is sent as custom_identifier, and call.ended is
+    matched on either that or the id Smartflo returns.
+    """
+
+    def __init__(self, agent_number: str, caller_id: str, call_timeout: float):
+        self.agent_number = agent_number
+        self.caller_id = caller_id
+        self.call_timeout = call_timeout
+        self._waiting: Dict[str, asyncio.Future] = {}
+
+    async def dial(self, request: DialRequest) -> DialResult:
+        from ..api.smartflo import _get_smartflo_token
+        from ..core.http_client import get_http_session
+
+        token = await asyncio.to_thread(_get_smartflo_token)
+        payload = {
+            "agent_number": self.agent_number,
+            "destination_number": request.phone,
+            "caller_id": self.caller_id,
+            "async": 1,
+            "custom_identifier": request.call_id,
+        }
+        headers = {"Authorization": f"Bearer {token}", "accept": "application/json"}
+
+        ended = asyncio.get_running_loop().create_future()
+        keys = [request.call_id]
+        self._waiting[request.call_id] = ended
+        try:
+            async with get_http_session().post(
+                f"{settings.SMARTFLO_API_URL}/click_to_call", json=payload, headers=headers
+            ) as response:
+                if response.status >= 400:
+                    logger.warning(f"Smartflo click-to-call failed ({response.status}): {await response.text()}")
+                    return DialResult(CallStatus.FAILED.value)
+                data = await response.json(content_type=None) or {}
+
+            provider_id = data.get("call_id") or data.get("ref_id")
+            if provider_id:
+                keys.append(str(provider_id))
+                self._waiting[str(provider_id)] = ended
+
+            try:
+                return await asyncio.wait_for(asyncio.shield(ended), self.call_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"No call.ended for {request.call_id} after {self.call_timeout}s")
+                return DialResult(CallStatus.FAILED.value)
+        finally:
+            for key in keys:
+                self._waiting.pop(key, None)
+
+    def call_ended(self, call_id: str, duration: Optional[int], disposition: Optional[str]):
+        ended = self._waiting.get(call_id)
+        if ended is None or ended.done():
+            return
+        try:
+            status = CallStatus(disposition or CallStatus.COMPLETED.value).value
+        except ValueError:
+            status = CallStatus.COMPLETED.value
+        ended.set_result(DialResult(status, duration))
+
+
+def create_telephony_backend(name: str) -> Optional[TelephonyBackend]:
+    if name == "fake":
+        return FakeTelephony()
+    if name == "smartflo":
+        return SmartfloTelephony(
+            settings.SMARTFLO_DIALER_AGENT_NUMBER,
+            settings.SMARTFLO_DIALER_CALLER_ID,
+            settings.DIALER_CALL_TIMEOUT,
+        )
+    if name != "disabled":
+        logger.error(f"Unknown DIALER_BACKEND {name!r}; dialer disabled")
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+class _Job(NamedTuple):
+    lead_id: int
+    phone: str
+
+
+@dataclass
+class _CampaignState:
+    id: int
+    rank: int
+    windows: Tuple[Tuple[dtime, dtime], ...]  # all must be open
+    max_attempts: int
+    retry_hours: int
+    remaining_today: int = 0
+    in_flight: int = 0
+    opening: int = 0  # dispatched, attempt not committed to call_logs yet
+    next_dial_at: float = 0.0
+    pending: Deque[_Job] = field(default_factory=deque)
+
+
+class _Opened(NamedTuple):
+    call_id: Optional[str]  # None: no attempt was logged
+    limit_reached: bool = False
+
+
+class _CampaignRefill(NamedTuple):
+    id: int
+    rank: int
+    windows: Tuple[Tuple[dtime, dtime], ...]  # all must be open
+    max_attempts: int
+    retry_hours: int
+    remaining_today: int
+    leads: List[_Job]
+
+
+def _parse_time(value, default: str) -> dtime:
+    if isinstance(value, dtime):
+        return value
+    text = str(value or default)
+    return datetime.strptime(text[:5], "%H:%M").time()
+
+
+def _in_window(window: Tuple[dtime, dtime], now: dtime) -> bool:
+    """`now` falls in [start, end); a window with start > end runs past midnight."""
+    start, end = window
+    if start <= end:
+        return start <= now < end
+    return now >= start or now < end
+
+
+def _in_windows(windows: Tuple[Tuple[dtime, dtime], ...], now: dtime) -> bool:
+    return all(_in_window(window, now) for window in windows)
+
+
+class Dialer:
+    def __init__(
+        self,
+        backend: TelephonyBackend,
+        session_factory: Callable = SessionLocal,
+        max_concurrent: Optional[int] = None,
+        max_per_campaign: Optional[int] = None,
+        dial_interval: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        queue_depth: Optional[int] = None,
+    ):
+        self.backend = backend
+        self._session_factory = session_factory
+        self.max_concurrent = max_concurrent or settings.MAX_CONCURRENT_CALLS
+        self.max_per_campaign = max_per_campaign or settings.DIALER_MAX_CONCURRENT_PER_CAMPAIGN
+        self.dial_interval = settings.DIALER_CAMPAIGN_DIAL_INTERVAL if dial_interval is None else dial_interval
+        self.poll_interval = poll_interval or settings.DIALER_POLL_INTERVAL
+        self.queue_depth = queue_depth or settings.DIALER_QUEUE_DEPTH
+
+        self._campaigns: Dict[int, _CampaignState] = {}
+        self._busy_leads: Set[int] = set()  # queued or being dialed
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._wakeup = asyncio.Event()
+        self._refill_requested = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._calls: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        if not self._tasks:
+            self._loop = asyncio.get_running_loop()
+            self._tasks = [
+                asyncio.create_task(self._refill_loop()),
+                asyncio.create_task(self._dispatch_loop()),
+            ]
+            logger.info(f"Dialer started ({type(self.backend).__name__}, {self.max_concurrent} concurrent calls)")
+
+    async def close(self):
+        for task in self._tasks + list(self._calls):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._calls, return_exceptions=True)
+        self._tasks = []
+        await self.backend.close()
+
+    def wake(self):
+        """Re-read campaigns now (e.g. one was started or paused). Safe from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._refill_requested.set)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "max_concurrent_calls": self.max_concurrent,
+            "calls_in_flight": len(self._calls),
+            "campaigns": [
+                {
+                    "campaign_id": state.id,
+                    "queued": len(state.pending),
+                    "in_flight": state.in_flight,
+                    "remaining_today": state.remaining_today,
+                }
+                for state in self._campaigns.values()
+            ],
+        }
+
+    # ------------------------------------------------------------------
+    # Refill: active campaigns and their eligible leads
+    # ------------------------------------------------------------------
+
+    async def _refill_loop(self):
+        while True:
+            try:
+                await self.refill()
+            except Exception as e:
+                logger.error(f"Dialer refill failed: {e}")
+            try:
+                await asyncio.wait_for(self._refill_requested.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._refill_requested.clear()
+
+    async def refill(self):
+        wanted = {
+            state.id: max(0, self.queue_depth - len(state.pending))
+            for state in self._campaigns.values()
+        }
+        refills = await asyncio.to_thread(self._load_campaigns, wanted, set(self._busy_leads))
+        active_ids = {refill.id for refill in refills}
+
+        for campaign_id in list(self._campaigns):
+            if campaign_id not in active_ids:
+                self._drop_pending(self._campaigns.pop(campaign_id))
+
+        for refill in refills:
+            state = self._campaigns.get(refill.id)
+            if state is None:
+                state = self._campaigns[refill.id] = _CampaignState(
+                    refill.id, refill.rank, refill.windows, refill.max_attempts, refill.retry_hours
+                )
+            state.rank = refill.rank
+            state.windows = refill.windows
+            state.max_attempts = refill.max_attempts
+            state.retry_hours = refill.retry_hours
+            # The database count doesn't include attempts still being opened
+            state.remaining_today = max(0, refill.remaining_today - state.opening)
+            for job in refill.leads:
+                if job.lead_id not in self._busy_leads:
+                    self._busy_leads.add(job.lead_id)
+                    state.pending.append(job)
+        self._wakeup.set()
+
+    def _drop_pending(self, state: _CampaignState):
+        for job in state.pending:
+            self._busy_leads.discard(job.lead_id)
+        state.pending.clear()
+
+    def _load_campaigns(self, wanted: Dict[int, int], busy_leads: Set[int]) -> List[_CampaignRefill]:
+        from ..api.campaigns import build_lead_query_from_filters
+
+        db = self._session_factory()
+        try:
+            campaigns = db.query(Campaign).filter(Campaign.status == CampaignStatus.ACTIVE).all()
+            if not campaigns:
+                return []
+
+            today = local_today()
+            calls_today = dict(
+                db.query(CallLog.campaign_id, func.count(CallLog.id)).filter(
+                    CallLog.campaign_id.in_([c.id for c in campaigns]),
+                    on_days(CallLog.created_at, today)
+                ).group_by(CallLog.campaign_id).all()
+            )
+            global_window = (
+                _parse_time(settings.CALLING_HOURS_START, "09:00"),
+                _parse_time(settings.CALLING_HOURS_END, "21:00"),
+            )
+            now = local_now().time()
+
+            refills = []
+            for campaign in campaigns:
+                # Checked separately rather than intersected, so either may cross midnight
+                windows = (
+                    (
+                        _parse_time(campaign.calling_hours_start, "09:00"),
+                        _parse_time(campaign.calling_hours_end, "21:00"),
+                    ),
+                    global_window,
+                )
+                max_attempts = campaign.max_attempts_per_lead
+                if max_attempts is None:
+                    max_attempts = settings.DEFAULT_MAX_ATTEMPTS
+                retry_hours = campaign.retry_interval_hours
+                if retry_hours is None:
+                    retry_hours = settings.DEFAULT_RETRY_INTERVAL_HOURS
+                remaining = max(0, (campaign.daily_call_limit or 0) - calls_today.get(campaign.id, 0))
+
+                leads: List[_Job] = []
+                limit = min(wanted.get(campaign.id, self.queue_depth), remaining)
+                if limit > 0 and _in_windows(windows, now):
+                    leads = self._eligible_leads(
+                        db, build_lead_query_from_filters(campaign.filters or {}, db),
+                        campaign.id, max_attempts, retry_hours, busy_leads, limit
+                    )
+                    busy_leads.update(job.lead_id for job in leads)
+
+                refills.append(_CampaignRefill(
+                    campaign.id,
+                    _PRIORITY_RANK.get((campaign.priority or "medium").lower(), 1),
+                    windows, max_attempts, retry_hours, remaining, leads
+                ))
+            return refills
+        finally:
+            db.close()
+
+    def _eligible_leads(
+        self, db, lead_query, campaign_id: int, max_attempts: int, retry_hours: int,
+        busy_leads: Set[int], limit: int
+    ) -> List[_Job]:
+        attempts = db.query(
+            CallLog.lead_id.label('lead_id'),
+            func.count(CallLog.id).label('attempts'),
+            func.max(case((CallLog.status.in_(_CONNECTED), 1), else_=0)).label('connected')
+        ).filter(
+            CallLog.campaign_id == campaign_id
+        ).group_by(CallLog.lead_id).subquery()
+
+        retry_cutoff = db_now() - timedelta(hours=retry_hours)
+        query = lead_query.outerjoin(attempts, attempts.c.lead_id == Lead.id).filter(
+            Lead.phone.isnot(None),
+            or_(
+                attempts.c.lead_id.is_(None),
+                and_(attempts.c.attempts < max_attempts, attempts.c.connected == 0)
+            ),
+            or_(Lead.lastCallAt.is_(None), Lead.lastCallAt <= retry_cutoff)
+        )
+        if busy_leads:
+            query = query.filter(Lead.id.notin_(busy_leads))
+
+        # Never-called leads first, then the longest-waiting retries
+        rows = query.with_entities(Lead.id, Lead.phone).order_by(
+            func.coalesce(attempts.c.attempts, 0), Lead.lastCallAt, Lead.id
+        ).limit(limit).all()
+        return [_Job(lead_id, phone) for lead_id, phone in rows]
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _next_job(self) -> Tuple[Optional[Tuple[_CampaignState, _Job]], float]:
+        """Best campaign ready to dial now, or (None, seconds to wait)."""
+        now = time.monotonic()
+        clock = local_now().time()
+        ready: List[Tuple[int, float, int]] = []
+        wait = self.poll_interval
+        for state in self._campaigns.values():
+            if (
+                not state.pending
+                or state.in_flight >= self.max_per_campaign
+                or state.remaining_today <= 0
+                or not _in_windows(state.windows, clock)
+            ):
+                continue
+            if state.next_dial_at > now:
+                wait = min(wait, state.next_dial_at - now)
+                continue
+            heapq.heappush(ready, (state.rank, state.next_dial_at, state.id))
+
+        if not ready:
+            return None, wait
+        _, _, campaign_id = heapq.heappop(ready)
+        state = self._campaigns[campaign_id]
+        state.next_dial_at = now + self.dial_interval
+        state.in_flight += 1
+        state.opening += 1
+        state.remaining_today -= 1
+        return (state, state.pending.popleft()), 0.0
+
+    async def _dispatch_loop(self):
+        while True:
+            await self._slots.acquire()
+            try:
+                picked = None
+                while picked is None:
+                    picked, wait = self._next_job()
+                    if picked is None:
+                        self._wakeup.clear()
+                        try:
+                            await asyncio.wait_for(self._wakeup.wait(), wait)
+                        except asyncio.TimeoutError:
+                            pass
+            except BaseException:
+                self._slots.release()
+                raise
+
+            state, job = picked
+            task = asyncio.create_task(self._run_call(state, job))
+            self._calls.add(task)
+            task.add_done_callback(self._calls.discard)
+
+    async def _run_call(self, state: _CampaignState, job: _Job):
+        call_id = None
+        try:
+            opening = asyncio.ensure_future(
+                asyncio.to_thread(self._open_call, state.id, state.retry_hours, job)
+            )
+            opened = _Opened(None)
+            try:
+                opened = await asyncio.shield(opening)
+            except asyncio.CancelledError:
+                # The claim finishes in its thread anyway; wait for it so the
+                # attempt it logs is closed below instead of left "initiated"
+                finished, = await asyncio.gather(opening, return_exceptions=True)
+                if isinstance(finished, _Opened):
+                    opened = finished
+                raise
+            finally:
+                state.opening -= 1
+                call_id = opened.call_id
+                if opened.limit_reached:
+                    state.remaining_today = 0
+                elif call_id is None:
+                    # No attempt was logged: give the daily slot back
+                    state.remaining_today += 1
+            if call_id is None:
+                return
+            try:
+                result = await self.backend.dial(DialRequest(call_id, job.lead_id, state.id, job.phone))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Dial failed for lead {job.lead_id}: {e}")
+                result = DialResult(CallStatus.FAILED.value)
+            await asyncio.to_thread(self._close_call, call_id, result)
+            call_id = None
+        except asyncio.CancelledError:
+            if call_id is not None:
+                # Shutting down mid-call: don't leave the attempt "initiated" forever
+                await asyncio.shield(
+                    asyncio.to_thread(self._close_call, call_id, DialResult(CallStatus.FAILED.value))
+                )
+            raise
+        except Exception as e:
+            logger.error(f"Dialer call for lead {job.lead_id} failed: {e}")
+        finally:
+            state.in_flight -= 1
+            self._busy_leads.discard(job.lead_id)
+            self._slots.release()
+            self._wakeup.set()
+
+    def _open_call(self, campaign_id: int, retry_hours: int, job: _Job) -> _Opened:
+        """Claim the lead and log the attempt, unless the lead was called
+        meanwhile or the campaign is paused / out of calls for today.
+
+        The campaign row is locked first, so concurrent opens for one
+        campaign count today's calls one at a time and daily_call_limit
+        holds even when the dispatcher's estimate is off. Runs in a worker
+        thread, so it must not touch dialer state.
+        """
+        db = self._session_factory()
+        try:
+            campaign = db.query(Campaign).filter(Campaign.id == campaign_id).with_for_update().first()
+            if campaign is None or campaign.status != CampaignStatus.ACTIVE:
+                db.rollback()
+                return _Opened(None)
+            calls_today = db.query(func.count(CallLog.id)).filter(
+                CallLog.campaign_id == campaign_id,
+                on_days(CallLog.created_at, local_today())
+            ).scalar()
+            if calls_today >= (campaign.daily_call_limit or 0):
+                db.rollback()
+                return _Opened(None, limit_reached=True)
+
+            retry_cutoff = db_now() - timedelta(hours=retry_hours)
+            claimed = db.query(Lead).filter(
+                Lead.id == job.lead_id,
+                or_(Lead.lastCallAt.is_(None), Lead.lastCallAt <= retry_cutoff)
+            ).update(
+                {Lead.tracker: func.coalesce(Lead.tracker, 0) + 1},
+                synchronize_session=False
+            )
+            if not claimed:
+                db.rollback()
+                return _Opened(None)
+
+            call = CallLog(
+                lead_id=job.lead_id,
+                campaign_id=campaign_id,
+                call_id=f"dialer_{uuid.uuid4().hex}",
+                status=CallStatus.INITIATED,
+                started_at=datetime.now()
+            )
+            db.add(call)
+            track_call_write(db, call)
+            db.commit()
+            return _Opened(call.call_id)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _close_call(self, call_id: str, result: DialResult):
+        db = self._session_factory()
+        try:
+            record_call_ended(db, call_id, result.duration, result.status)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to record end of call {call_id}: {e}")
+        finally:
+            db.close()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide dialer
+# ---------------------------------------------------------------------------
+
+_dialer: Optional[Dialer] = None
+
+
+def get_dialer() -> Optional[Dialer]:
+    return _dialer
+
+
+async def start_dialer():
+    global _dialer
+    if _dialer is not None:
+        return
+    backend = create_telephony_backend(settings.DIALER_BACKEND)
+    if backend is None:
+        return
+    _dialer = Dialer(backend)
+    await _dialer.start()
+
+
+async def stop_dialer():
+    global _dialer
+    if _dialer is not None:
+        await _dialer.close()
+        _dialer = None
+
+
+def wake_dialer():
+    if _dialer is not None:
+        _dialer.wake()
+
+
+def dialer_call_ended(call_id: str, duration: Optional[int], disposition: Optional[str]):
+    if _dialer is not None:
+        _dialer.backend.call_ended(call_id, duration, disposition)
@@ -0,0 +1,81 @@
+"""
+Fuzzy FAQ intent matcher for the no-LLM fast path.
+
+Questions like "CEO kaun hai?", "token amount kitna hai" or "refund
+milega?" have fixed answers in the KB. Matching them locally returns the
+canned answer (and its pre-rendered TTS audio) without an LLM round-trip.
+
+- Every intent has phrasings: the FAQ question plus optional aliases
+- Text is tokenized like the retrieval index (filler words dropped), and
+  tokens match fuzzily so Roman Hinglish spelling variants still count
+  ("maalik" / "malik", "kitne" / "kitna")
+- A phrasing's score is the Dice overlap between query and phrasing
+  tokens, so both extra and missing words lower it; an intent's
+  confidence is its best phrasing's score
+- Below the caller's threshold there is no match and the LLM answers
+"""
+
+from difflib import SequenceMatcher
+from typing import List, NamedTuple, Optional, Sequence
+
+from .kb_retrieval import tokenize
+
+# Tokens at least this long may match with small spelling differences
+_FUZZY_MIN_LEN = 4
+_FUZZY_RATIO = 0.8
+
+
+class Intent(NamedTuple):
+    id: str
+    answer: str
+    phrasings: Sequence[str]
+
+
+class IntentMatch(NamedTuple):
+    intent: Intent
+    confidence: float
+
+
+def _tokens_match(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    if len(a) < _FUZZY_MIN_LEN or len(b) < _FUZZY_MIN_LEN:
+        return False
+    return SequenceMatcher(None, a, b).ratio() >= _FUZZY_RATIO
+
+
+def _dice(query: List[str], phrasing: List[str]) -> float:
+    if not query or not phrasing:
+        return 0.0
+    unmatched = list(phrasing)
+    hits = 0
+    for token in query:
+        for i, candidate in enumerate(unmatched):
+            if _tokens_match(token, candidate):
+                hits += 1
+                del unmatched[i]
+                break
+    return 2 * hits / (len(query) + len(phrasing))
+
+
+class IntentMatcher:
+    """Matches a user message against a fixed set of intents."""
+
+    def __init__(self, intents: List[Intent]):
+        self._phrasings = [
+            (intent, tokens)
+            for intent in intents
+            for tokens in (tokenize(p) for p in intent.phrasings)
+            if tokens
+        ]
+
+    def match(self, text: str, threshold: float) -> Optional[IntentMatch]:
+        query = tokenize(text)
+        best: Optional[IntentMatch] = None
+        for intent, tokens in self._phrasings:
+            score = _dice(query, tokens)
+            if best is None or score > best.confidence:
+                best = IntentMatch(intent, score)
+        if best is None or best.confidence < threshold:
+            return None
+        return best
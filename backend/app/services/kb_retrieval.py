@@ -0,0 +1,107 @@
+"""
+BM25 retrieval over knowledge base entries.
+
+The sales chat used to paste every FAQ, custom data entry and objection
+into the system prompt, so prompt tokens grew with the KB. Instead the KB
+is indexed once per version and each message only carries the entries
+that match it, capped at `top_k` entries and a token budget.
+
+- Tokenization is script-agnostic (Roman Hinglish, English, Devanagari):
+  lowercase word characters, minus a short list of filler words
+- Scores are Okapi BM25 (k1=1.5, b=0.75)
+- Selected entries are returned in KB order, not score order, so the same
+  selection always renders the same text
+- Token counts are estimated at ~4 characters per token (no tokenizer
+  dependency); the budget is a soft bound, not an exact one
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+_K1 = 1.5
+_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Fillers that appear in almost every Hinglish / English question
+_STOPWORDS = frozenset(
+    """
+    a an and are be can do does for how i in is it me my of on or the to
+    this that what which who why you your
+    aap aapka aapke aapki hai hain ho hoga ka ke ki ko kya kaise kaun kab kahan
+    mein me mujhe se ye yeh wo woh aur bhi toh to na hi ji
+    batao bataiye bataye please sir madam
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        t for t in _TOKEN_RE.findall(text.lower())
+        if t not in _STOPWORDS and (len(t) > 1 or t.isdigit())
+    ]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class BM25Index:
+    """In-memory BM25 index over (text used for matching, text rendered into the prompt)."""
+
+    def __init__(self, entries: List[Tuple[str, str]]):
+        self.rendered = [rendered for _, rendered in entries]
+        self.costs = [estimate_tokens(r) for r in self.rendered]
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+
+        for doc_id, (match_text, _) in enumerate(entries):
+            counts = Counter(tokenize(match_text))
+            self._lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((doc_id, tf))
+
+        n = len(entries)
+        self._avg_len = (sum(self._lengths) / n) if n else 0.0
+        self._idf = {
+            term: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.rendered)
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """All entries matching any query term, best first."""
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for doc_id, tf in postings:
+                norm = _K1 * (1 - _B + _B * self._lengths[doc_id] / (self._avg_len or 1))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def select(self, query: str, top_k: int, token_budget: int) -> List[str]:
+        """Rendered text of the best entries for `query` within top_k / token_budget.
+
+        When the whole index fits the budget it is returned as-is, so small
+        knowledge bases keep their full context.
+        """
+        if sum(self.costs) <= token_budget and len(self) <= top_k:
+            return list(self.rendered)
+
+        chosen: List[int] = []
+        spent = 0
+        for doc_id, _ in self.search(query):
+            if len(chosen) >= top_k:
+                break
+            if spent + self.costs[doc_id] > token_budget:
+                continue
+            chosen.append(doc_id)
+            spent += self.costs[doc_id]
+        return [self.rendered[i] for i in sorted(chosen)]
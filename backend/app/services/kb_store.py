@@ -0,0 +1,332 @@
+"""
+Database-backed, versioned knowledge base store.
+
+The KB used to be a module-level dict, so every uvicorn worker had its own
+copy and a restart lost all edits. Now every edit is saved as a new
+KnowledgeBaseSnapshot row (the highest version is live), and each worker
+keeps the live snapshot in memory:
+
+- Reads never touch the database; they return the cached snapshot
+- Edits run as update(mutate): copy the cached KB, apply `mutate`, insert
+  version + 1. If another worker took that version first, the store
+  reloads and re-applies the edit (optimistic concurrency)
+- After an edit the version is published on a KBChangeBus; other workers
+  reload the new snapshot from the database when they hear about it
+- The first load seeds version 1 from the built-in default KB
+
+KBChangeBus is pluggable: InProcessKBChangeBus for a single worker and
+tests, RedisKBChangeBus (REDIS_URL) to share changes across workers.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from ..models.knowledge_base import KnowledgeBaseSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Called with the new version, or None when a worker may have missed changes
+ChangeCallback = Callable[[Optional[int]], None]
+
+_MAX_COMMIT_ATTEMPTS = 5
+_REDIS_RECONNECT_DELAY = 5.0
+
+
+# ---------------------------------------------------------------------------
+# Change notification
+# ---------------------------------------------------------------------------
+
+class KBChangeBus(ABC):
+    """Tells other KB store instances that a new version was committed."""
+
+    @abstractmethod
+    def subscribe(self, callback: ChangeCallback):
+        ...
+
+    @abstractmethod
+    def publish(self, version: int):
+        ...
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class InProcessKBChangeBus(KBChangeBus):
+    """Delivers changes synchronously to subscribers in this process."""
+
+    def __init__(self):
+        self._subscribers: List[ChangeCallback] = []
+
+    def subscribe(self, callback: ChangeCallback):
+        self._subscribers.append(callback)
+
+    def publish(self, version: int):
+        for callback in list(self._subscribers):
+            try:
+                callback(version)
+            except Exception as e:
+                logger.error(f"KB change subscriber failed: {e}")
+
+
+class RedisKBChangeBus(KBChangeBus):
+    """Redis pub/sub: publish from any thread, listen on the event loop.
+
+    Subscriber callbacks (which reload from the database) run in a worker
+    thread so the event loop never blocks on the query.
+    """
+
+    def __init__(self, url: str, channel: str):
+        self.url = url
+        self.channel = channel
+        self.origin = uuid.uuid4().hex  # skip our own messages
+        self._subscribers: List[ChangeCallback] = []
+        self._publisher = None
+        self._publisher_lock = threading.Lock()
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: ChangeCallback):
+        self._subscribers.append(callback)
+
+    def publish(self, version: int):
+        import redis
+
+        with self._publisher_lock:
+            if self._publisher is None:
+                self._publisher = redis.Redis.from_url(self.url)
+            publisher = self._publisher
+        try:
+            publisher.publish(self.channel, json.dumps({"version": version, "origin": self.origin}))
+        except Exception as e:
+            # Other workers catch up when their listener reconnects
+            logger.error(f"KB change publish failed: {e}")
+
+    async def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._publisher is not None:
+            self._publisher.close()
+            self._publisher = None
+
+    async def _notify(self, version: Optional[int]):
+        for callback in list(self._subscribers):
+            try:
+                await asyncio.to_thread(callback, version)
+            except Exception as e:
+                logger.error(f"KB change subscriber failed: {e}")
+
+    async def _listen(self):
+        import redis.asyncio as aioredis
+
+        while True:
+            client = aioredis.from_url(self.url)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Changes published while we were disconnected
+                await self._notify(None)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        payload = json.loads(message["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    if payload.get("origin") != self.origin:
+                        await self._notify(payload.get("version"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"KB change listener disconnected: {e}")
+                await asyncio.sleep(_REDIS_RECONNECT_DELAY)
+            finally:
+                try:
+                    await pubsub.close()
+                    await client.close()
+                except Exception:
+                    pass
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class KnowledgeBaseStore:
+    """Read-through cache over versioned KB snapshots in the database."""
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        defaults: Dict[str, Any],
+        bus: KBChangeBus,
+    ):
+        self._session_factory = session_factory
+        self._defaults = defaults
+        self._bus = bus
+        self._lock = threading.RLock()
+        self._state: Optional[Tuple[int, Dict[str, Any]]] = None
+        bus.subscribe(self._on_change)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """(version, data) of the live KB. `data` must not be mutated."""
+        state = self._state
+        if state is None:
+            state = self.refresh()
+        return state
+
+    @property
+    def version(self) -> int:
+        return self.snapshot()[0]
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return self.snapshot()[1]
+
+    def refresh(self) -> Tuple[int, Dict[str, Any]]:
+        """Load the latest snapshot from the database (seeding it if empty)."""
+        with self._lock:
+            db = self._session_factory()
+            try:
+                row = (
+                    db.query(KnowledgeBaseSnapshot)
+                    .order_by(KnowledgeBaseSnapshot.version.desc())
+                    .first()
+                )
+                if row is None:
+                    row = self._seed(db)
+                self._state = (row.version, row.data)
+            finally:
+                db.close()
+            return self._state
+
+    def _seed(self, db) -> KnowledgeBaseSnapshot:
+        row = KnowledgeBaseSnapshot(version=1, data=copy.deepcopy(self._defaults))
+        db.add(row)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker seeded first
+            db.rollback()
+            row = db.query(KnowledgeBaseSnapshot).filter(KnowledgeBaseSnapshot.version == 1).one()
+        else:
+            db.refresh(row)
+            logger.info("Knowledge base seeded (version 1)")
+        return row
+
+    def _on_change(self, version: Optional[int]):
+        state = self._state
+        if version is not None and state is not None and version <= state[0]:
+            return
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def update(self, mutate: Callable[[Dict[str, Any]], Any], user_id: Optional[int] = None) -> Any:
+        """Apply `mutate` to a copy of the live KB and save it as a new version.
+
+        Returns whatever `mutate` returns.
+        """
+        with self._lock:
+            for _ in range(_MAX_COMMIT_ATTEMPTS):
+                version, current = self.snapshot()
+                data = copy.deepcopy(current)
+                result = mutate(data)
+                data["updated_at"] = datetime.utcnow().isoformat()
+                if self._insert(version + 1, data, user_id):
+                    self._state = (version + 1, data)
+                    break
+                # Another worker committed this version first: retry on top of it
+                self.refresh()
+            else:
+                raise RuntimeError("Knowledge base is being edited concurrently; try again")
+
+        self._bus.publish(version + 1)
+        return result
+
+    def _insert(self, version: int, data: Dict[str, Any], user_id: Optional[int]) -> bool:
+        db = self._session_factory()
+        try:
+            db.add(KnowledgeBaseSnapshot(version=version, data=data, created_by=user_id))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def restore(self, version: int, user_id: Optional[int] = None) -> Optional[int]:
+        """Save an older snapshot's data as the new live version. None if it doesn't exist."""
+        db = self._session_factory()
+        try:
+            row = db.query(KnowledgeBaseSnapshot).filter(KnowledgeBaseSnapshot.version == version).first()
+            old_data = row.data if row else None
+        finally:
+            db.close()
+        if old_data is None:
+            return None
+
+        def replace(kb: Dict[str, Any]):
+            kb.clear()
+            kb.update(copy.deepcopy(old_data))
+
+        self.update(replace, user_id)
+        return self.version
+
+    def history(self, limit: int = 50) -> List[dict]:
+        """Most recent versions first (metadata only)."""
+        db = self._session_factory()
+        try:
+            rows = (
+                db.query(
+                    KnowledgeBaseSnapshot.version,
+                    KnowledgeBaseSnapshot.created_by,
+                    KnowledgeBaseSnapshot.created_at,
+                )
+                .order_by(KnowledgeBaseSnapshot.version.desc())
+                .limit(limit)
+                .all()
+            )
+        finally:
+            db.close()
+        return [
+            {"version": v, "created_by": created_by, "created_at": created_at}
+            for v, created_by, created_at in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        await asyncio.to_thread(self.refresh)
+        await self._bus.start()
+
+    async def close(self):
+        await self._bus.close()
@@ -0,0 +1,242 @@
+"""
+Pool of pre-connected OpenAI Realtime sessions.
+
+Opening a Realtime WebSocket and applying session.update takes the TLS +
+WebSocket handshake plus a round-trip before the welcome message can play.
+The pool keeps REALTIME_POOL_SIZE connections per language already open
+and configured with the current KB instructions, so a new call claims one
+immediately and only falls back to connecting itself when the pool is empty.
+
+- Idle connections are recycled after REALTIME_POOL_IDLE_TTL seconds
+- Each connection remembers a fingerprint of the session config it was
+  given; when the KB changes, idle connections get a fresh session.update
+  (REALTIME_POOL_REFRESH_ON_KB_CHANGE), and a claim always re-checks it
+- While idle, a reader task drains server events (session.created /
+  session.updated) and answers pings so the connection stays healthy
+
+The pool is transport-agnostic: the voice agent passes in how to connect
+and how to build the session config for a language.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# How often the maintainer checks TTLs, KB changes and pool size (seconds)
+_MAINTAIN_INTERVAL = 10.0
+# Back-off after a failed connect attempt (seconds)
+_CONNECT_RETRY_DELAY = 5.0
+
+
+def _config_fingerprint(session_config: dict) -> str:
+    blob = json.dumps(session_config, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class _PooledConnection:
+    """An idle, configured Realtime WebSocket waiting to be claimed."""
+
+    def __init__(self, ws: aiohttp.ClientWebSocketResponse, language: str, fingerprint: str):
+        self.ws = ws
+        self.language = language
+        self.fingerprint = fingerprint
+        self.created_at = time.monotonic()
+        self.reader_task = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        """Consume server events while idle (keeps pings answered)."""
+        try:
+            async for msg in self.ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    try:
+                        event = json.loads(msg.data)
+                    except json.JSONDecodeError:
+                        continue
+                    if event.get("type") == "error":
+                        logger.warning(f"Pooled Realtime connection error: {event.get('error')}")
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Pooled Realtime reader stopped: {e}")
+
+    def is_usable(self, idle_ttl: float) -> bool:
+        return (
+            not self.ws.closed
+            and not self.reader_task.done()
+            and time.monotonic() - self.created_at < idle_ttl
+        )
+
+    async def detach(self) -> aiohttp.ClientWebSocketResponse:
+        """Stop the idle reader and hand over the socket."""
+        self.reader_task.cancel()
+        try:
+            await self.reader_task
+        except asyncio.CancelledError:
+            pass
+        return self.ws
+
+    async def close(self):
+        await self.detach()
+        if not self.ws.closed:
+            try:
+                await self.ws.close()
+            except Exception:
+                pass
+
+
+class RealtimePool:
+    """Keeps pre-configured Realtime connections ready per language."""
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[aiohttp.ClientWebSocketResponse]],
+        session_config: Callable[[str], dict],
+        size: int,
+        idle_ttl: float,
+        refresh_on_kb_change: bool,
+        languages: List[str],
+    ):
+        self._connect = connect
+        self._session_config = session_config
+        self.size = size
+        self.idle_ttl = idle_ttl
+        self.refresh_on_kb_change = refresh_on_kb_change
+        self.languages = list(languages)
+        self._idle: Dict[str, List[_PooledConnection]] = {lang: [] for lang in self.languages}
+        self._wakeup = asyncio.Event()
+        self._maintainer: Optional[asyncio.Task] = None
+        self.claims = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._maintainer is None and self.size > 0:
+            self._maintainer = asyncio.create_task(self._maintain_loop())
+
+    async def close(self):
+        if self._maintainer:
+            self._maintainer.cancel()
+            try:
+                await self._maintainer
+            except asyncio.CancelledError:
+                pass
+            self._maintainer = None
+        for conns in self._idle.values():
+            for conn in conns:
+                await conn.close()
+            conns.clear()
+
+    # ------------------------------------------------------------------
+    # Claim
+    # ------------------------------------------------------------------
+
+    async def claim(self, language: str) -> Optional[aiohttp.ClientWebSocketResponse]:
+        """Take a ready connection for `language`, or None if none is idle.
+
+        The returned socket has session.update applied with the current
+        config; the caller owns it from here on (listen + close).
+        """
+        conns = self._idle.get(language, [])
+        while conns:
+            conn = conns.pop(0)
+            if not conn.is_usable(self.idle_ttl):
+                await conn.close()
+                continue
+
+            ws = await conn.detach()
+            session_config = self._session_config(language)
+            fingerprint = _config_fingerprint(session_config)
+            if fingerprint != conn.fingerprint:
+                # KB changed since this connection was configured
+                await ws.send_json({"type": "session.update", "session": session_config})
+
+            self.claims += 1
+            self._wakeup.set()  # replenish in the background
+            return ws
+
+        self.misses += 1
+        self._wakeup.set()
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "idle": {lang: len(conns) for lang, conns in self._idle.items()},
+            "claims": self.claims,
+            "misses": self.misses,
+        }
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    async def _maintain_loop(self):
+        while True:
+            # Cleared first so a claim made during maintenance triggers another pass
+            self._wakeup.clear()
+            try:
+                await self._maintain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Realtime pool maintenance error: {e}")
+                await asyncio.sleep(_CONNECT_RETRY_DELAY)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=_MAINTAIN_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _maintain_once(self):
+        for language in self.languages:
+            conns = self._idle[language]
+            session_config = self._session_config(language)
+            fingerprint = _config_fingerprint(session_config)
+
+            # Recycle dead / expired connections
+            for conn in [c for c in conns if not c.is_usable(self.idle_ttl)]:
+                conns.remove(conn)
+                await conn.close()
+
+            # Push KB changes to idle connections. Each one is taken out of the
+            # pool while it's updated so claim() can't hand it out mid-update;
+            # one claimed meanwhile is skipped (claim() applies the config itself).
+            if self.refresh_on_kb_change:
+                for conn in [c for c in conns if c.fingerprint != fingerprint]:
+                    if conn not in conns:
+                        continue
+                    conns.remove(conn)
+                    try:
+                        await conn.ws.send_json({"type": "session.update", "session": session_config})
+                    except Exception as e:
+                        logger.warning(f"Realtime pool refresh failed ({language}): {e}")
+                        await conn.close()
+                        continue
+                    conn.fingerprint = fingerprint
+                    conns.append(conn)
+
+            # Top up
+            while len(conns) < self.size:
+                ws = None
+                try:
+                    ws = await self._connect()
+                    await ws.send_json({"type": "session.update", "session": session_config})
+                except Exception as e:
+                    logger.warning(f"Realtime pool connect failed ({language}): {type(e).__name__}: {e}")
+                    if ws is not None and not ws.closed:
+                        await ws.close()
+                    await asyncio.sleep(_CONNECT_RETRY_DELAY)
+                    break
+                conns.append(_PooledConnection(ws, language, fingerprint))
+                logger.info(f"Realtime pool: {len(conns)}/{self.size} ready ({language})")
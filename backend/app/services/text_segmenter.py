@@ -0,0 +1,143 @@
+"""
+Streaming sentence segmenter for LLM text deltas.
+
+The Realtime API streams the agent reply as small `response.text.delta`
+fragments. Waiting for `response.text.done` before starting TTS makes the
+caller hear nothing until the whole reply is generated, so the voice agent
+feeds every delta through a SentenceSegmenter and sends each completed
+sentence (or long clause) to TTS while the model is still generating.
+
+Rules:
+- A sentence ends at . ? ! or the Devanagari danda, once the following
+  character is known to be whitespace (so "5.9" never splits)
+- Titles and currency ("Rs.", "Dr.", "Mr.", ...) followed by a digit or a
+  capital letter don't end a sentence ("Rs. 45 lakh", "Dr. Sharma")
+- Newlines are always a boundary
+- Sentences shorter than `min_chars` are held and merged with the next one
+  (avoids tiny TTS calls like "Haan ji..." that reset prosody)
+- A clause (, ; :) is emitted early once it carries `clause_min_words` words
+- Nothing longer than `max_words` words is ever held back
+"""
+
+import re
+from typing import List
+
+# End of sentence: terminal punctuation (plus closing quotes/brackets)
+# followed by whitespace. The whitespace must already be in the buffer.
+_SENTENCE_END_RE = re.compile(r"[.?!।]+[\"')\]]*(?=\s)|\n")
+
+# Abbreviations that are followed by an amount or a name, not a new sentence
+_ABBREVIATION_RE = re.compile(r"(?:^|(?<=[\s(\"']))(?:Rs|Dr|Mr|Mrs|Ms|Smt|Shri)\.$", re.IGNORECASE)
+
+# Clause boundary: comma / semicolon / colon followed by whitespace.
+_CLAUSE_END_RE = re.compile(r"[,;:](?=\s)")
+
+
+class SentenceSegmenter:
+    """Incrementally splits streamed text into speakable segments."""
+
+    def __init__(
+        self,
+        min_chars: int = 12,
+        clause_min_words: int = 10,
+        max_words: int = 20,
+    ):
+        self.min_chars = min_chars
+        self.clause_min_words = clause_min_words
+        self.max_words = max_words
+        self._buffer = ""
+
+    def reset(self):
+        """Drop any buffered text (used on barge-in / new response)."""
+        self._buffer = ""
+
+    @property
+    def pending(self) -> str:
+        return self._buffer
+
+    def feed(self, delta: str) -> List[str]:
+        """Add a text delta and return any segments that are now complete."""
+        if not delta:
+            return []
+        self._buffer += delta
+        return self._drain(final=False)
+
+    def flush(self) -> List[str]:
+        """Return whatever is left in the buffer as final segment(s)."""
+        segments = self._drain(final=True)
+        tail = self._buffer.strip()
+        self._buffer = ""
+        if tail:
+            segments.append(tail)
+        return segments
+
+    # ------------------------------------------------------------------
+
+    def _drain(self, final: bool) -> List[str]:
+        segments: List[str] = []
+        search_from = 0
+
+        while True:
+            cut = self._next_cut(search_from)
+            if cut is None:
+                break
+
+            candidate = self._buffer[:cut].strip()
+            if not candidate:
+                self._buffer = self._buffer[cut:]
+                search_from = 0
+                continue
+
+            if len(candidate) < self.min_chars and not final:
+                # Too short on its own — keep it and look for the next boundary
+                search_from = cut
+                continue
+
+            segments.append(candidate)
+            self._buffer = self._buffer[cut:].lstrip()
+            search_from = 0
+
+        return segments
+
+    def _next_cut(self, search_from: int):
+        """Find the end index of the next emittable segment, or None."""
+        buf = self._buffer
+
+        for match in _SENTENCE_END_RE.finditer(buf, search_from):
+            if not _ABBREVIATION_RE.search(buf, 0, match.end()):
+                return match.end()
+            following = buf[match.end():].lstrip()
+            if not following:
+                # Can't tell yet whether "Rs." starts an amount; wait for more text
+                break
+            if not (following[0].isdigit() or following[0].isupper()):
+                return match.end()
+
+        words = buf.split()
+        if len(words) < self.clause_min_words:
+            return None
+
+        # Long clause: cut at the first clause boundary that carries enough words
+        for clause in _CLAUSE_END_RE.finditer(buf, search_from):
+            if len(buf[:clause.end()].split()) >= self.clause_min_words:
+                return clause.end()
+
+        if len(words) <= self.max_words:
+            return None
+
+        # Too long: cut at the last clause boundary inside the word cap,
+        # otherwise hard cut after max_words complete words
+        count = 0
+        hard_cut = None
+        for word in re.finditer(r"\S+(?=\s)", buf):
+            count += 1
+            if count == self.max_words:
+                hard_cut = word.end()
+                break
+        if hard_cut is None:
+            return None
+
+        clause_cut = None
+        for clause in _CLAUSE_END_RE.finditer(buf, search_from, hard_cut + 1):
+            clause_cut = clause.end()
+        return clause_cut or hard_cut
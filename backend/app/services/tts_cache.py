@@ -0,0 +1,237 @@
+"""
+Content-addressed cache for synthesized TTS audio.
+
+The welcome message, objection responses and other canned answers are
+spoken on almost every call. Re-synthesizing them costs an ElevenLabs
+round-trip at the start of the call and character spend each time, so
+rendered PCM is cached by a hash of exactly what would be sent to
+ElevenLabs (normalized text, voice, model, voice settings, output format).
+
+Two tiers:
+- Memory: LRU of raw PCM bytes, bounded by TTS_CACHE_MEMORY_MB
+- Disk: one raw PCM file per entry under TTS_CACHE_DIR, served through
+  mmap so a hit never reads the whole file up front and the page cache is
+  shared between workers. Only warm-up phrases and phrases rendered a
+  second time are written, so one-off LLM sentences don't crowd out the
+  canned ones. A hit touches the file's mtime, and the least recently
+  used files are pruned past TTS_CACHE_DISK_MB.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PCMSource = Union[bytes, mmap.mmap]
+
+# Keys rendered once but not written to disk, remembered to spot repeats
+_RENDERED_ONCE_MAX = 4096
+
+
+def normalize_tts_text(text: str) -> str:
+    """Whitespace-normalize text so trivially different strings share an entry."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def tts_cache_key(url: str, payload: dict) -> str:
+    """Hash an ElevenLabs request (URL carries voice, format and latency mode)."""
+    blob = json.dumps({"url": url, "payload": payload}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Two-tier (memory LRU + mmap'd disk) PCM cache."""
+
+    def __init__(self, directory: str, memory_bytes: int, disk_bytes: int):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        self._disk_used: Optional[int] = None  # computed lazily on first write
+        self._disk_lock = threading.Lock()  # disk writes run in worker threads
+        self._rendered_once: "OrderedDict[str, None]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def lookup(self, key: str) -> Optional[PCMSource]:
+        """Return cached PCM as bytes (memory) or an mmap (disk), else None.
+
+        Disk access runs off the event loop. The caller must close() an mmap
+        result when done with it.
+        """
+        pcm = self._memory.get(key)
+        if pcm is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return pcm
+
+        mapped = await asyncio.to_thread(self._open_disk, key)
+        if mapped is not None:
+            self.hits += 1
+            return mapped
+
+        self.misses += 1
+        return None
+
+    def contains(self, key: str) -> bool:
+        return key in self._memory or os.path.exists(self._path(key))
+
+    async def promote(self, key: str) -> bool:
+        """Load a disk entry into the memory tier. Returns False if absent."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return True
+        pcm = await asyncio.to_thread(self._read_disk, key)
+        if pcm is None:
+            return False
+        self._remember(key, pcm)
+        return True
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    async def store(self, key: str, pcm: bytes, persist: bool = False):
+        """Add PCM to memory, and to disk if `persist` or it was rendered before.
+
+        The disk write runs off the event loop.
+        """
+        if not pcm:
+            return
+        self._remember(key, pcm)
+        if not persist and key not in self._rendered_once:
+            self._rendered_once[key] = None
+            if len(self._rendered_once) > _RENDERED_ONCE_MAX:
+                self._rendered_once.popitem(last=False)
+            return
+        self._rendered_once.pop(key, None)
+        try:
+            await asyncio.to_thread(self._write_disk, key, pcm)
+        except OSError as e:
+            logger.warning(f"TTS cache disk write failed for {key[:12]}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_used,
+        }
+
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pcm")
+
+    def _open_disk(self, key: str) -> Optional[mmap.mmap]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # mtime doubles as "last used" for pruning (atime is often disabled)
+            os.utime(path)
+            return mapped
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file (interrupted write) — treat as a miss
+            return None
+        except OSError as e:
+            logger.warning(f"TTS cache disk read failed for {key[:12]}: {e}")
+            return None
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        mapped = self._open_disk(key)
+        if mapped is None:
+            return None
+        try:
+            return mapped[:]
+        finally:
+            mapped.close()
+
+    def _remember(self, key: str, pcm: bytes):
+        if len(pcm) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= len(old)
+        self._memory[key] = pcm
+        self._memory_used += len(pcm)
+        while self._memory_used > self.memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+
+    def _write_disk(self, key: str, pcm: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pcm)
+
+        with self._disk_lock:
+            if self._disk_used is None:
+                self._disk_used = sum(
+                    entry.stat().st_size
+                    for entry in os.scandir(self.directory)
+                    if entry.name.endswith(".pcm")
+                )
+            existed = os.path.exists(path)
+            os.replace(tmp_path, path)
+            if not existed:
+                self._disk_used += len(pcm)
+
+            if self._disk_used > self.disk_bytes:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete least recently used files until under 90% of the budget.
+
+        Caller holds _disk_lock.
+        """
+        entries = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith(".pcm")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        target = int(self.disk_bytes * 0.9)
+        for entry in entries:
+            if self._disk_used <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._disk_used -= size
+            except OSError:
+                pass
+
+
+_tts_cache: Optional[TTSCache] = None
+
+
+def get_tts_cache() -> Optional[TTSCache]:
+    """Return the process-wide TTS cache, or None when disabled."""
+    global _tts_cache
+    if not settings.TTS_CACHE_ENABLED:
+        return None
+    if _tts_cache is None:
+        _tts_cache = TTSCache(
+            directory=settings.TTS_CACHE_DIR,
+            memory_bytes=settings.TTS_CACHE_MEMORY_MB * 1024 * 1024,
+            disk_bytes=settings.TTS_CACHE_DISK_MB * 1024 * 1024,
+        )
+    return _tts_cache
@@ -0,0 +1,139 @@
+"""
+Per-turn latency instrumentation for the voice pipeline.
+
+A turn starts when OpenAI VAD reports the user stopped speaking and ends
+when the browser has been sent the last audio of the reply (or the reply
+is cut off by barge-in). Along the way the session marks:
+
+    speech_stopped -> transcript -> first_delta -> first_sentence
+    -> tts_request -> tts_first_byte -> first_audio_sent -> text_done
+    -> audio_end
+
+Spans between marks (see SPANS) go into process-wide histograms and the
+session summary, so an SLA miss can be attributed to OpenAI (stt / llm),
+ElevenLabs (tts_ttfb), our own queueing, or the deliberate pauses
+(pre_speech covers the 500 ms response pause).
+"""
+
+import bisect
+import time
+from typing import Dict, List, Optional
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +inf)
+_BUCKETS_MS = [50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000]
+
+# name -> (from mark, to mark)
+SPANS = {
+    "stt": ("speech_stopped", "transcript"),
+    "llm_first_delta": ("speech_stopped", "first_delta"),
+    "llm_stream": ("first_delta", "text_done"),
+    "segmenter_wait": ("first_delta", "first_sentence"),
+    "tts_queue": ("first_sentence", "tts_request"),
+    "tts_ttfb": ("tts_request", "tts_first_byte"),
+    "pre_speech": ("tts_first_byte", "first_audio_sent"),
+    "first_audio": ("speech_stopped", "first_audio_sent"),
+    "audio_send": ("first_audio_sent", "audio_end"),
+    "turn_total": ("speech_stopped", "audio_end"),
+}
+
+
+class LatencyHistogram:
+    """Fixed-bucket millisecond histogram with count / sum / min / max."""
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (max for the +inf bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return float(_BUCKETS_MS[i]) if i < len(_BUCKETS_MS) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 1) if self.count else None,
+            "min_ms": round(self.min, 1) if self.min is not None else None,
+            "max_ms": round(self.max, 1) if self.max is not None else None,
+            "p50_ms": self.quantile(0.5),
+            "p90_ms": self.quantile(0.9),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {
+                **{f"le_{b}": c for b, c in zip(_BUCKETS_MS, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+
+
+def record_latency(name: str, ms: float):
+    hist = _histograms.get(name)
+    if hist is None:
+        hist = _histograms[name] = LatencyHistogram()
+    hist.observe(ms)
+
+
+def latency_snapshot() -> dict:
+    return {name: hist.snapshot() for name, hist in sorted(_histograms.items())}
+
+
+class TurnTimer:
+    """Marks for one user turn; only the first occurrence of each mark counts."""
+
+    def __init__(self, start_mark: str = "speech_stopped"):
+        self.marks: Dict[str, float] = {start_mark: time.monotonic()}
+        self.interrupted = False
+        self.finished = False
+
+    def mark(self, name: str):
+        if not self.finished and name not in self.marks:
+            self.marks[name] = time.monotonic()
+
+    def spans(self) -> Dict[str, float]:
+        result = {}
+        for span, (start, end) in SPANS.items():
+            if start in self.marks and end in self.marks:
+                result[span] = round((self.marks[end] - self.marks[start]) * 1000, 1)
+        return result
+
+    def finish(self, interrupted: bool = False) -> Optional[Dict[str, float]]:
+        """Close the turn and record its spans. Returns them (None if already closed)."""
+        if self.finished:
+            return None
+        self.interrupted = interrupted
+        if not interrupted:
+            self.mark("audio_end")
+        self.finished = True
+        spans = self.spans()
+        for name, ms in spans.items():
+            record_latency(name, ms)
+        return spans
+
+
+def summarize_turns(turns: List[Dict[str, float]]) -> dict:
+    """Per-session summary: median of each span across the session's turns."""
+    summary = {"turns": len(turns)}
+    for span in SPANS:
+        values = sorted(t[span] for t in turns if span in t)
+        if values:
+            summary[f"{span}_p50_ms"] = values[len(values) // 2]
+    return summary
@@ -6,6 +6,9 @@ CREATE DATABASE IF NOT EXISTS aria_crm CHARACTER SET utf8mb4 COLLATE utf8mb4_uni
 USE aria_crm;
 
 -- Drop existing tables if they exist (in reverse order of dependencies)
+DROP TABLE IF EXISTS call_hourly_stats;
+DROP TABLE IF EXISTS call_daily_stats;
+DROP TABLE IF EXISTS knowledge_base_snapshots;
 DROP TABLE IF EXISTS compliance_logs;
 DROP TABLE IF EXISTS call_logs;
 DROP TABLE IF EXISTS campaigns;
@@ -94,6 +97,10 @@ CREATE TABLE leads (
     tracker INT DEFAULT 0,
     interestStatus ENUM('interested', 'not interested'),
     other JSON DEFAULT (JSON_OBJECT()),
+    callCount INT NOT NULL DEFAULT 0,
+    lastCallAt DATETIME,
+    callClassification ENUM('cold', 'warm', 'hot'),
+    lastHotCallAt DATETIME,
 
     FOREIGN KEY (platformId) REFERENCES platforms(id),
     FOREIGN KEY (assignedTo) REFERENCES users(id),
@@ -103,7 +110,10 @@ CREATE TABLE leads (
 
     INDEX idx_campaign_query (leadStageId, city, interestStatus, tracker),
     INDEX idx_assignment (assignedTo, leadStatusId),
-    INDEX idx_platform (platformId, createdAt)
+    INDEX idx_platform (platformId, createdAt),
+    INDEX idx_call_classification (callClassification, lastCallAt),
+    INDEX idx_hot_queue (lastHotCallAt),
+    INDEX idx_lead_created (createdAt, id)
 );
 
 -- Create campaigns table
@@ -152,7 +162,9 @@ CREATE TABLE call_logs (
     FOREIGN KEY (lead_id) REFERENCES leads(id),
     FOREIGN KEY (campaign_id) REFERENCES campaigns(id),
     INDEX idx_lead_history (lead_id, created_at),
-    INDEX idx_campaign_stats (campaign_id, classification)
+    INDEX idx_campaign_stats (campaign_id, classification),
+    INDEX idx_call_created (created_at, id),
+    INDEX idx_campaign_created (campaign_id, created_at)
 );
 
 -- Create compliance_logs table
@@ -166,7 +178,47 @@ CREATE TABLE compliance_logs (
 
     FOREIGN KEY (lead_id) REFERENCES leads(id),
     INDEX idx_event_type (event_type, created_at),
-    INDEX idx_lead_compliance (lead_id)
+    INDEX idx_lead_compliance (lead_id),
+    INDEX idx_compliance_created (created_at, id)
+);
+
+-- Create knowledge_base_snapshots table (one row per KB version; highest is live,
+-- seeded by the app on first start)
+CREATE TABLE knowledge_base_snapshots (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    version INT NOT NULL UNIQUE,
+    data JSON NOT NULL,
+    created_by INT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (created_by) REFERENCES users(id)
+);
+
+-- Analytics rollups, maintained by the API on call writes
+-- (campaign_id 0 / '' = none; day is the business day the call was logged)
+CREATE TABLE call_daily_stats (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    day DATE NOT NULL,
+    campaign_id INT NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT '',
+    classification VARCHAR(10) NOT NULL DEFAULT '',
+    calls INT NOT NULL DEFAULT 0,
+    duration_total BIGINT NOT NULL DEFAULT 0,
+    duration_calls INT NOT NULL DEFAULT 0,
+
+    UNIQUE KEY uq_call_daily_bucket (day, campaign_id, status, classification),
+    INDEX idx_daily_campaign (campaign_id, day)
+);
+
+CREATE TABLE call_hourly_stats (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    day DATE NOT NULL,
+    day_of_week INT NOT NULL,
+    hour INT NOT NULL,
+    calls INT NOT NULL DEFAULT 0,
+    converted INT NOT NULL DEFAULT 0,
+
+    UNIQUE KEY uq_call_hourly_bucket (day, day_of_week, hour)
 );
 
 -- Insert sample data
@@ -236,6 +288,38 @@ INSERT INTO call_logs (lead_id, call_id, campaign_id, status, duration, classifi
 (4, 'call_003', 1, 'completed', 125, 'cold', 0.35, 'Not Interested', 'Already purchased property elsewhere. Marked as not interested.', '2026-01-25 11:30:00', '2026-01-25 11:32:05'),
 (5, 'call_004', 1, 'completed', 312, 'hot', 0.92, 'Meeting Scheduled', 'Very interested. Site visit scheduled for next week. Budget confirmed.', '2026-01-24 16:20:00', '2026-01-24 16:25:12');
 
+-- Denormalized lead call summary (kept in sync by the API afterwards)
+UPDATE leads l
+JOIN (
+    SELECT lead_id,
+           COUNT(*) AS call_count,
+           MAX(created_at) AS last_call,
+           MAX(classification) AS classification,
+           MAX(CASE WHEN classification = 'hot' THEN created_at END) AS last_hot_call
+    FROM call_logs
+    GROUP BY lead_id
+) s ON s.lead_id = l.id
+SET l.callCount = s.call_count,
+    l.lastCallAt = s.last_call,
+    l.callClassification = s.classification,
+    l.lastHotCallAt = s.last_hot_call,
+    l.updatedAt = l.updatedAt;
+
+-- Analytics rollups for the sample calls (assumes the MySQL session runs in IST;
+-- otherwise run rebuild_call_rollups.py instead)
+INSERT INTO call_daily_stats (day, campaign_id, status, classification, calls, duration_total, duration_calls)
+SELECT DATE(created_at), COALESCE(campaign_id, 0), COALESCE(status, ''), COALESCE(classification, ''),
+       COUNT(*), COALESCE(SUM(duration), 0), COUNT(duration)
+FROM call_logs
+GROUP BY DATE(created_at), COALESCE(campaign_id, 0), COALESCE(status, ''), COALESCE(classification, '');
+
+INSERT INTO call_hourly_stats (day, day_of_week, hour, calls, converted)
+SELECT DATE(created_at), DAYOFWEEK(started_at) - 1, HOUR(started_at),
+       COUNT(*), SUM(classification IN ('warm', 'hot'))
+FROM call_logs
+WHERE started_at IS NOT NULL
+GROUP BY DATE(created_at), DAYOFWEEK(started_at) - 1, HOUR(started_at);
+
 -- Sample Compliance Logs
 INSERT INTO compliance_logs (event_type, lead_id, call_id, details) VALUES
 ('consent_captured', 1, NULL, '{"source": "facebook_lead_form", "text": "I agree to be contacted for real estate information"}'),
@@ -0,0 +1,49 @@
+"""
+Rebuild the analytics rollup tables (call_daily_stats, call_hourly_stats)
+from call_logs.
+
+    python rebuild_call_rollups.py          # every day that has calls
+    python rebuild_call_rollups.py 30       # only the last 30 days
+
+Run this once after upgrading an existing database, or after bulk-editing
+call_logs. The server also recomputes the last ROLLUP_COMPACTION_DAYS days
+periodically on its own.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import timedelta
+from app.core.database import SessionLocal, engine, Base
+from app.core.date_ranges import local_today
+from app.models import CallDailyStat, CallHourlyStat
+from app.services.call_rollups import rebuild_all_call_rollups, rebuild_call_rollups
+
+
+def rebuild_rollups(days: int = None):
+    # Create the rollup tables if this database predates them
+    Base.metadata.create_all(bind=engine, tables=[CallDailyStat.__table__, CallHourlyStat.__table__])
+
+    db = SessionLocal()
+
+    try:
+        if days:
+            today = local_today()
+            print(f"Rebuilding analytics rollups for the last {days} days...")
+            counted = rebuild_call_rollups(db, today - timedelta(days=days - 1), today)
+        else:
+            print("Rebuilding analytics rollups for all call history...")
+            counted = rebuild_all_call_rollups(db)
+        print(f"\n✅ Rolled up {counted} calls")
+
+    except Exception as e:
+        print(f"Error rebuilding analytics rollups: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_rollups(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,42 @@
+"""
+Rebuild the denormalized call summary on every lead from call_logs.
+Run this after adding the summary columns to an existing database,
+after bulk-importing call logs, or after editing call_logs by hand.
+
+Existing MySQL databases need the columns first:
+
+    ALTER TABLE leads
+        ADD COLUMN callCount INT NOT NULL DEFAULT 0,
+        ADD COLUMN lastCallAt DATETIME,
+        ADD COLUMN callClassification ENUM('cold', 'warm', 'hot'),
+        ADD COLUMN lastHotCallAt DATETIME,
+        ADD INDEX idx_call_classification (callClassification, lastCallAt),
+        ADD INDEX idx_hot_queue (lastHotCallAt);
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.services.call_tracking import rebuild_lead_call_summaries
+
+
+def rebuild_lead_call_stats():
+    db = SessionLocal()
+
+    try:
+        print("Rebuilding lead call summaries...")
+        changed = rebuild_lead_call_summaries(db)
+        print(f"\n✅ Updated {changed} leads")
+
+    except Exception as e:
+        print(f"Error rebuilding lead call summaries: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_lead_call_stats()
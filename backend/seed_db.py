@@ -17,6 +17,8 @@ from app.models import (
 from app.models.campaign import CampaignStatus
 from app.models.call_log import CallStatus, Classification
 from app.models.compliance_log import ComplianceEventType
+from app.services.call_rollups import rebuild_all_call_rollups
+from app.services.call_tracking import rebuild_lead_call_summaries
 
 def hash_password(password: str) -> str:
     """Hash password using bcrypt directly"""
@@ -221,6 +223,12 @@ def seed_database():
         db.commit()
         print(f"Created {len(call_logs)} call logs")
 
+        rebuild_lead_call_summaries(db)
+        print("Updated lead call summaries")
+
+        rebuild_all_call_rollups(db)
+        print("Built analytics rollups")
+
         # Create Compliance Logs
         compliance_logs = [
             ComplianceLog(
@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers every table on Base)
+from app.core.database import Base
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """sessionmaker over a fresh SQLite file (shared between threads)."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
@@ -0,0 +1,339 @@
+import asyncio
+import time
+from datetime import datetime, time as dtime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.core.date_ranges import db_now
+from app.models import Campaign, CallLog, Lead
+from app.models.call_log import CallStatus
+from app.models.campaign import CampaignStatus
+from app.services import dialer
+from app.services.call_tracking import refresh_lead_call_summary
+from app.services.dialer import (
+    DialResult, Dialer, FakeTelephony, _CampaignState, _in_window, _Job, _Opened,
+)
+
+NOON = datetime(2026, 1, 25, 12, 0)
+
+
+@pytest.fixture(autouse=True)
+def calling_hours(monkeypatch):
+    """Open all day, with timestamps in UTC like SQLite's CURRENT_TIMESTAMP."""
+    monkeypatch.setattr(settings, "CALLING_HOURS_START", "00:00")
+    monkeypatch.setattr(settings, "CALLING_HOURS_END", "23:59")
+    monkeypatch.setattr(settings, "DB_TIMEZONE", "UTC")
+    set_clock(monkeypatch, NOON)
+
+
+def set_clock(monkeypatch, now: datetime):
+    monkeypatch.setattr(dialer, "local_now", lambda: now)
+
+
+def add_campaign(db, name, city, **fields):
+    campaign = Campaign(
+        name=name,
+        status=CampaignStatus.ACTIVE,
+        filters={"cities": [city]},
+        calling_hours_start=fields.pop("calling_hours_start", dtime(0, 0)),
+        calling_hours_end=fields.pop("calling_hours_end", dtime(23, 59)),
+        retry_interval_hours=fields.pop("retry_interval_hours", 0),
+        **fields,
+    )
+    db.add(campaign)
+    db.commit()
+    return campaign.id
+
+
+def add_leads(db, city, count):
+    leads = [Lead(name=f"{city}{i}", phone=f"{city}-{i}", city=city) for i in range(count)]
+    db.add_all(leads)
+    db.commit()
+    return [lead.id for lead in leads]
+
+
+def add_call(db, lead_id, campaign_id, status, hours_ago):
+    db.add(CallLog(
+        lead_id=lead_id,
+        campaign_id=campaign_id,
+        status=status,
+        created_at=db_now() - timedelta(hours=hours_ago),
+    ))
+    refresh_lead_call_summary(db, [lead_id])
+    db.commit()
+
+
+class GatedTelephony(FakeTelephony):
+    """Calls stay up until `release` is set; tracks the peak per campaign."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+        self.active = {}
+        self.peak = {}
+
+    async def dial(self, request):
+        self.dialed.append(request)
+        campaign_id = request.campaign_id
+        self.active[campaign_id] = self.active.get(campaign_id, 0) + 1
+        self.peak[campaign_id] = max(self.peak.get(campaign_id, 0), self.active[campaign_id])
+        try:
+            await self.release.wait()
+        finally:
+            self.active[campaign_id] -= 1
+        return DialResult(CallStatus.NO_ANSWER.value, 0)
+
+
+async def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def make_dialer(backend, session_factory, **limits):
+    params = dict(max_concurrent=4, max_per_campaign=4, dial_interval=0, poll_interval=0.1, queue_depth=10)
+    params.update(limits)
+    return Dialer(backend, session_factory=session_factory, **params)
+
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_higher_priority_campaign_dials_first(session_factory):
+    db = session_factory()
+    low = add_campaign(db, "low", "A", priority="low", max_attempts_per_lead=1)
+    high = add_campaign(db, "high", "B", priority="high", max_attempts_per_lead=1)
+    add_leads(db, "A", 3)
+    add_leads(db, "B", 3)
+    db.close()
+
+    backend = FakeTelephony(time_scale=0.0001, seed=1)
+    d = make_dialer(backend, session_factory, max_concurrent=1)
+    await d.start()
+    try:
+        await wait_for(lambda: len(backend.dialed) >= 6)
+    finally:
+        await d.close()
+
+    assert [r.campaign_id for r in backend.dialed] == [high] * 3 + [low] * 3
+
+
+@pytest.mark.asyncio
+async def test_max_per_campaign_caps_concurrent_calls(session_factory):
+    db = session_factory()
+    first = add_campaign(db, "first", "A", max_attempts_per_lead=1)
+    second = add_campaign(db, "second", "B", max_attempts_per_lead=1)
+    add_leads(db, "A", 6)
+    add_leads(db, "B", 6)
+    db.close()
+
+    backend = GatedTelephony()
+    d = make_dialer(backend, session_factory, max_concurrent=10, max_per_campaign=2)
+    await d.start()
+    try:
+        await wait_for(lambda: len(backend.dialed) >= 4)
+        await asyncio.sleep(0.3)  # a few more refill / dispatch rounds
+        assert len(backend.dialed) == 4
+        backend.release.set()
+        await wait_for(lambda: len(backend.dialed) == 12)
+    finally:
+        await d.close()
+
+    assert backend.peak == {first: 2, second: 2}
+
+
+def test_window_crossing_midnight():
+    night = (dtime(22, 0), dtime(6, 0))
+    assert _in_window(night, dtime(23, 30))
+    assert _in_window(night, dtime(0, 0))
+    assert _in_window(night, dtime(5, 59))
+    assert not _in_window(night, dtime(6, 0))
+    assert not _in_window(night, dtime(12, 0))
+    assert not _in_window(night, dtime(21, 59))
+
+
+@pytest.mark.asyncio
+async def test_night_campaign_only_dials_inside_its_window(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "CALLING_HOURS_START", "20:00")
+    monkeypatch.setattr(settings, "CALLING_HOURS_END", "08:00")
+    db = session_factory()
+    campaign_id = add_campaign(
+        db, "night", "A", calling_hours_start=dtime(22, 0), calling_hours_end=dtime(6, 0)
+    )
+    add_leads(db, "A", 2)
+    db.close()
+
+    d = make_dialer(FakeTelephony(), session_factory)
+    await d.refill()
+    state = d._campaigns[campaign_id]
+    assert not state.pending
+    assert d._next_job() == (None, d.poll_interval)
+
+    set_clock(monkeypatch, datetime(2026, 1, 25, 23, 30))
+    await d.refill()
+    assert len(state.pending) == 2
+    picked, _ = d._next_job()
+    assert picked[0] is state
+
+    # Past the window the queued lead waits for the next night
+    set_clock(monkeypatch, datetime(2026, 1, 26, 6, 30))
+    assert d._next_job() == (None, d.poll_interval)
+
+
+# ---------------------------------------------------------------------------
+# Lead eligibility
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_retry_interval_and_max_attempts(session_factory):
+    db = session_factory()
+    campaign_id = add_campaign(db, "retry", "A", max_attempts_per_lead=2, retry_interval_hours=4)
+    fresh, recent, exhausted, retry, connected = add_leads(db, "A", 5)
+    add_call(db, recent, campaign_id, CallStatus.NO_ANSWER, hours_ago=1)
+    add_call(db, exhausted, campaign_id, CallStatus.NO_ANSWER, hours_ago=30)
+    add_call(db, exhausted, campaign_id, CallStatus.BUSY, hours_ago=10)
+    add_call(db, retry, campaign_id, CallStatus.NO_ANSWER, hours_ago=5)
+    add_call(db, connected, campaign_id, CallStatus.COMPLETED, hours_ago=10)
+    db.close()
+
+    d = make_dialer(FakeTelephony(), session_factory)
+    await d.refill()
+
+    # Never-called leads first, then retries
+    assert [job.lead_id for job in d._campaigns[campaign_id].pending] == [fresh, retry]
+
+
+# ---------------------------------------------------------------------------
+# Daily limit bookkeeping
+# ---------------------------------------------------------------------------
+
+async def dispatch_one(d, campaign_id):
+    await d.refill()
+    state = d._campaigns[campaign_id]
+    remaining = state.remaining_today
+    await d._slots.acquire()
+    picked, _ = d._next_job()
+    assert picked is not None and picked[0] is state
+    assert state.remaining_today == remaining - 1
+    return state, picked[1], remaining
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_lead_gives_back_daily_slot(session_factory):
+    db = session_factory()
+    campaign_id = add_campaign(db, "claim", "A", daily_call_limit=5, retry_interval_hours=4)
+    lead_id, = add_leads(db, "A", 1)
+    db.close()
+
+    backend = FakeTelephony(time_scale=0.0001)
+    d = make_dialer(backend, session_factory)
+    state, job, remaining = await dispatch_one(d, campaign_id)
+
+    # Called from elsewhere after it was queued
+    db = session_factory()
+    db.query(Lead).filter(Lead.id == lead_id).update({Lead.lastCallAt: db_now()})
+    db.commit()
+    db.close()
+
+    await d._run_call(state, job)
+
+    assert not backend.dialed
+    assert state.remaining_today == remaining
+    assert (state.in_flight, state.opening) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_daily_limit_reached_while_opening(session_factory):
+    db = session_factory()
+    campaign_id = add_campaign(db, "limit", "A", daily_call_limit=1)
+    first, second = add_leads(db, "A", 2)
+    db.close()
+
+    backend = FakeTelephony(time_scale=0.0001)
+    d = make_dialer(backend, session_factory)
+    state, job, _ = await dispatch_one(d, campaign_id)
+    # Another process used today's only call in the meantime
+    db = session_factory()
+    add_call(db, second, campaign_id, CallStatus.COMPLETED, hours_ago=0)
+    db.close()
+
+    await d._run_call(state, job)
+
+    assert not backend.dialed
+    assert state.remaining_today == 0
+    db = session_factory()
+    assert db.query(CallLog).filter(CallLog.lead_id == first).count() == 0
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_cancel_before_attempt_is_logged_gives_back_daily_slot(session_factory, monkeypatch):
+    db = session_factory()
+    campaign_id = add_campaign(db, "cancel", "A", daily_call_limit=5)
+    add_leads(db, "A", 1)
+    db.close()
+
+    d = make_dialer(FakeTelephony(), session_factory)
+    state, job, remaining = await dispatch_one(d, campaign_id)
+
+    def slow_unclaimed_open(*args):
+        time.sleep(0.2)
+        return _Opened(None)
+
+    monkeypatch.setattr(d, "_open_call", slow_unclaimed_open)
+    task = asyncio.create_task(d._run_call(state, job))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert state.remaining_today == remaining
+    assert (state.in_flight, state.opening) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_cancel_while_opening_closes_the_logged_attempt(session_factory, monkeypatch):
+    db = session_factory()
+    campaign_id = add_campaign(db, "cancel", "A", daily_call_limit=5)
+    add_leads(db, "A", 1)
+    db.close()
+
+    backend = FakeTelephony()
+    d = make_dialer(backend, session_factory)
+    state, job, remaining = await dispatch_one(d, campaign_id)
+
+    open_call = d._open_call
+
+    def slow_open(*args):
+        time.sleep(0.2)
+        return open_call(*args)
+
+    monkeypatch.setattr(d, "_open_call", slow_open)
+    task = asyncio.create_task(d._run_call(state, job))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The attempt counts against today's limit, and isn't left "initiated"
+    assert not backend.dialed
+    assert state.remaining_today == remaining - 1
+    assert (state.in_flight, state.opening) == (0, 0)
+    db = session_factory()
+    assert [call.status for call in db.query(CallLog)] == [CallStatus.FAILED]
+    db.close()
+
+
+def test_next_job_respects_remaining_today():
+    d = Dialer(FakeTelephony(), max_concurrent=2, max_per_campaign=2, dial_interval=0, poll_interval=1)
+    state = _CampaignState(1, 0, ((dtime(0, 0), dtime(23, 59)),), 3, 0, remaining_today=1)
+    state.pending.extend([_Job(1, "1"), _Job(2, "2")])
+    d._campaigns[1] = state
+
+    picked, _ = d._next_job()
+    assert picked == (state, _Job(1, "1"))
+    assert d._next_job() == (None, 1)
@@ -0,0 +1,99 @@
+import threading
+
+from app.services.kb_store import InProcessKBChangeBus, KnowledgeBaseStore
+
+DEFAULTS = {"agent_name": "Chitti", "faqs": []}
+
+
+def make_store(session_factory, bus=None):
+    return KnowledgeBaseStore(session_factory, DEFAULTS, bus or InProcessKBChangeBus())
+
+
+def add_faq(question):
+    def mutate(kb):
+        kb["faqs"].append({"question": question})
+        return question
+    return mutate
+
+
+def test_first_load_seeds_version_1(session_factory):
+    store = make_store(session_factory)
+    version, data = store.snapshot()
+    assert version == 1
+    assert data == DEFAULTS
+    assert data is not DEFAULTS
+
+
+def test_update_saves_a_new_version(session_factory):
+    store = make_store(session_factory)
+    assert store.update(add_faq("Price?"), user_id=7) == "Price?"
+
+    assert store.version == 2
+    assert [faq["question"] for faq in store.data["faqs"]] == ["Price?"]
+    # A fresh store (another worker) reads it back from the database
+    assert make_store(session_factory).snapshot() == store.snapshot()
+
+
+def test_history_and_restore(session_factory):
+    store = make_store(session_factory)
+    store.update(add_faq("Price?"), user_id=7)
+    store.update(add_faq("Location?"))
+
+    history = store.history()
+    assert [entry["version"] for entry in history] == [3, 2, 1]
+    assert history[1]["created_by"] == 7
+    assert [entry["version"] for entry in store.history(limit=1)] == [3]
+
+    assert store.restore(2) == 4
+    assert [faq["question"] for faq in store.data["faqs"]] == ["Price?"]
+    assert store.restore(99) is None
+    assert store.version == 4
+
+
+def test_subscriber_sees_new_version(session_factory):
+    bus = InProcessKBChangeBus()
+    writer = make_store(session_factory, bus)
+    reader = make_store(session_factory, bus)
+    seen = []
+    bus.subscribe(seen.append)
+    assert reader.version == 1
+
+    writer.update(add_faq("Price?"))
+
+    assert seen == [2]
+    assert reader.version == 2
+    assert [faq["question"] for faq in reader.data["faqs"]] == ["Price?"]
+
+
+def test_concurrent_updates_retry_on_top_of_each_other(session_factory):
+    # Separate buses: neither worker hears about the other's edit, so both
+    # start from version 1 and one insert must lose and retry
+    first = make_store(session_factory)
+    second = make_store(session_factory)
+    assert first.version == second.version == 1
+
+    both_read = threading.Barrier(2, timeout=5)
+    calls = {"first": 0, "second": 0}
+
+    def edit(name):
+        def mutate(kb):
+            calls[name] += 1
+            if calls[name] == 1:
+                both_read.wait()
+            kb["faqs"].append({"question": name})
+        return mutate
+
+    threads = [
+        threading.Thread(target=first.update, args=(edit("first"),)),
+        threading.Thread(target=second.update, args=(edit("second"),)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls.values()) == [1, 2]  # the loser re-applied its edit
+    latest = make_store(session_factory).snapshot()
+    assert latest[0] == 3
+    assert sorted(faq["question"] for faq in latest[1]["faqs"]) == ["first", "second"]
+    assert [entry["version"] for entry in first.history()] == [3, 2, 1]
@@ -0,0 +1,36 @@
+from app.services.text_segmenter import SentenceSegmenter
+
+
+def segment(*deltas):
+    segmenter = SentenceSegmenter()
+    segments = []
+    for delta in deltas:
+        segments += segmenter.feed(delta)
+    return segments + segmenter.flush()
+
+
+def test_splits_sentences():
+    assert segment("The plot is in Dholera. ", "It is close to the airport. ") == [
+        "The plot is in Dholera.",
+        "It is close to the airport.",
+    ]
+
+
+def test_abbreviation_before_amount_or_name_does_not_split():
+    assert segment("The price is Rs. 45 lakh per plot. ", "Dr. Sharma bought one. ") == [
+        "The price is Rs. 45 lakh per plot.",
+        "Dr. Sharma bought one.",
+    ]
+
+
+def test_abbreviation_waits_for_next_word_when_streamed():
+    segmenter = SentenceSegmenter()
+    assert segmenter.feed("The total comes to Rs. ") == []
+    assert segmenter.feed("45 lakh only. ") == ["The total comes to Rs. 45 lakh only."]
+
+
+def test_abbreviation_at_end_of_sentence_still_splits():
+    assert segment("Please speak to our Dr. ", "he will call you back soon. ") == [
+        "Please speak to our Dr.",
+        "he will call you back soon.",
+    ]
@@ -41,6 +41,9 @@ interface UseVoiceAgentReturn {
 // Audio Processor - Convert to Linear16 PCM for Deepgram
 // ============================================================================
 
+// Mic capture rate — sent in the `start` event so the backend resamples to 24kHz
+const MIC_SAMPLE_RATE = 16000;
+
 class AudioProcessor {
   private audioContext: AudioContext | null = null;
   private mediaStream: MediaStream | null = null;
@@ -71,7 +74,7 @@ class AudioProcessor {
     this.mediaStream = await navigator.mediaDevices.getUserMedia({
       audio: {
         channelCount: 1,
-        sampleRate: 16000,
+        sampleRate: MIC_SAMPLE_RATE,
         echoCancellation: true,
         noiseSuppression: true,
         autoGainControl: true,
@@ -79,7 +82,7 @@ class AudioProcessor {
     });
 
     // Create audio context at 16kHz
-    this.audioContext = new AudioContext({ sampleRate: 16000 });
+    this.audioContext = new AudioContext({ sampleRate: MIC_SAMPLE_RATE });
     this.sourceNode = this.audioContext.createMediaStreamSource(this.mediaStream);
 
     // Analyser for frequency-based voice detection
@@ -536,6 +539,7 @@ export function useVoiceAgent(): UseVoiceAgentReturn {
       ws.send(JSON.stringify({
         event: 'start',
         language: languagePreference,
+        sample_rate: MIC_SAMPLE_RATE,
       }));
 
       // 4. Set call as active IMMEDIATELY